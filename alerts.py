@@ -0,0 +1,292 @@
+"""
+Alerte de stoc și expirare materializate în tabela alerts: calculate într-o
+singură interogare (toate medicamentele sau doar codurile atinse de o
+scriere); expirările se adună pe loturi (lots.py). Pragul de stoc:
+alert_thresholds (setat manual), altfel punctul de reaprovizionare din
+reorder_points, altfel pragul fix. Pagina Alerts și dashboard-ul doar
+citesc tabela; un thread de fundal o ține la zi.
+"""
+
+import threading
+import time
+from datetime import date
+from typing import NamedTuple
+
+from db_sqlite import connection, notify_write, on_write
+from query_cache import cached, cached_df
+
+# praguri implicite (medicamentele fără rând în alert_thresholds / reorder_points)
+LOW_STOCK_THRESHOLD = 20
+EXPIRY_DAYS = 30
+URGENT_DAYS = 7         # expirare în <= 7 zile -> prioritate high
+
+REFRESH_INTERVAL = 300  # secunde; recalculare completă (scrieri din alte procese)
+DEBOUNCE = 0.5          # secunde; scrierile apropiate se procesează împreună
+
+PRIORITIES = {"critical": 1, "high": 2, "medium": 3, "low": 4}
+ALERT_TYPES = {
+    "low_stock": "⚠️",
+    "expired": "❌",
+    "expiring": "⏰",
+}
+
+ALERT_COLUMNS = ("type, priority, Med_code, Med_name, Qty, MRP, Exp, threshold, reorder_qty, "
+                 "days_left, message, first_seen")
+
+# candidații: o trecere peste medicines_info, trei tipuri de alertă
+CANDIDATES_SQL = """
+    WITH m AS (
+        SELECT m.Med_code, m.Med_name, m.Qty, m.MRP, m.Exp,
+               COALESCE(t.low_stock, r.reorder_point, ?) AS low_stock,
+               COALESCE(r.order_up_to, 0) AS order_up_to,
+               COALESCE(t.expiry_days, ?) AS expiry_days,
+               CAST(julianday(m.Exp) - julianday(date('now')) AS INTEGER) AS days_left
+        FROM medicines_info m
+        LEFT JOIN alert_thresholds t ON t.Med_code = m.Med_code
+        LEFT JOIN reorder_points r ON r.Med_code = m.Med_code
+        {where}
+    )
+    SELECT 'low_stock' AS type, CASE WHEN Qty <= 0 THEN 'critical' ELSE 'high' END AS priority,
+           Med_code, Med_name, Qty, MRP, Exp, low_stock AS threshold,
+           MAX(order_up_to, low_stock) - Qty AS reorder_qty, days_left,
+           'Low stock: ' || Qty || '/' || low_stock AS message
+    FROM m WHERE Qty <= low_stock
+    UNION ALL
+    -- expirările se adună pe loturile cu stoc (FEFO): Qty = unitățile afectate
+    SELECT 'expired', 'critical',
+           m.Med_code, m.Med_name, SUM(l.Qty), m.MRP, MIN(l.Exp), m.expiry_days, NULL,
+           CAST(julianday(MIN(l.Exp)) - julianday(date('now')) AS INTEGER),
+           'Expired on ' || MIN(l.Exp) || ' (' || SUM(l.Qty) || ' units)'
+    FROM m JOIN lots l ON l.Med_code = m.Med_code
+    WHERE l.Qty > 0 AND l.Exp > '' AND l.Exp < date('now')
+    GROUP BY m.Med_code
+    UNION ALL
+    SELECT 'expiring',
+           CASE WHEN julianday(MIN(l.Exp)) - julianday(date('now')) <= ? THEN 'high' ELSE 'medium' END,
+           m.Med_code, m.Med_name, SUM(l.Qty), m.MRP, MIN(l.Exp), m.expiry_days, NULL,
+           CAST(julianday(MIN(l.Exp)) - julianday(date('now')) AS INTEGER),
+           'Expires in ' || CAST(julianday(MIN(l.Exp)) - julianday(date('now')) AS INTEGER) || ' days ('
+               || SUM(l.Qty) || ' units)'
+    FROM m JOIN lots l ON l.Med_code = m.Med_code
+    WHERE l.Qty > 0 AND l.Exp BETWEEN date('now') AND date('now', '+' || m.expiry_days || ' day')
+    GROUP BY m.Med_code
+"""
+
+# upsert: first_seen rămâne de la prima apariție (deduplicare pe tip + cod)
+UPSERT_SQL = f"""
+    INSERT INTO alerts (type, priority, rank, Med_code, Med_name, Qty, MRP, Exp,
+                        threshold, reorder_qty, days_left, message, refreshed)
+    SELECT type, priority,
+           CASE priority {" ".join(f"WHEN '{p}' THEN {r}" for p, r in PRIORITIES.items())} ELSE 5 END,
+           Med_code, Med_name, Qty, MRP, Exp, threshold, reorder_qty, days_left, message, ?
+    FROM ({{candidates}}) WHERE true
+    ON CONFLICT(type, Med_code) DO UPDATE SET
+        priority = excluded.priority,
+        rank = excluded.rank,
+        Med_name = excluded.Med_name,
+        Qty = excluded.Qty,
+        MRP = excluded.MRP,
+        Exp = excluded.Exp,
+        threshold = excluded.threshold,
+        reorder_qty = excluded.reorder_qty,
+        days_left = excluded.days_left,
+        message = excluded.message,
+        refreshed = excluded.refreshed
+"""
+
+
+class AlertCounts(NamedTuple):
+    low_stock: int = 0
+    expired: int = 0
+    expiring: int = 0
+    critical: int = 0
+    high: int = 0
+    medium: int = 0
+
+    @property
+    def total(self):
+        return self.low_stock + self.expired + self.expiring
+
+
+class AlertEngine:
+    # Scrierile pe medicines_info / alert_thresholds marchează codurile
+    # atinse (sau totul, dacă nu se știu); sync() le recalculează din
+    # thread-ul de fundal (sau explicit: snapshot, CLI, bench). Citirile nu
+    # scriu: get_alerts / alert_counts servesc tabela așa cum e.
+
+    def __init__(self, low_stock=LOW_STOCK_THRESHOLD, expiry_days=EXPIRY_DAYS, interval=REFRESH_INTERVAL):
+        self.low_stock = low_stock
+        self.expiry_days = expiry_days
+        self.interval = interval
+        self._pending = set()
+        self._full = True               # prima citire calculează tot
+        self._refreshed_on = None       # days_left se schimbă la miezul nopții
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()   # protejează _pending / _full
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stats = {"full": 0, "partial": 0, "codes": 0, "last_ms": 0.0, "errors": 0}
+        self.last_error = None
+
+    def invalidate(self, tables=None, codes=None):
+        if tables is not None and not tables & {"medicines_info", "lots", "alert_thresholds", "reorder_points"}:
+            return
+        with self._lock:
+            if tables is not None and codes:
+                self._pending.update(codes)
+            else:
+                self._full = True
+        self._wake.set()
+
+    def refresh(self, codes=None):
+        # codes=None -> toate medicamentele
+        params = [self.low_stock, self.expiry_days]
+        where, scope = "", ""
+        if codes is not None:
+            codes = list(codes)
+            if not codes:
+                return 0
+            marks = ",".join("?" * len(codes))
+            where = f"WHERE m.Med_code IN ({marks})"
+            scope = f"AND Med_code IN ({marks})"
+            params += codes
+        params.append(URGENT_DAYS)
+
+        stamp = time.time()
+        with connection() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(UPSERT_SQL.format(candidates=CANDIDATES_SQL.format(where=where)), [stamp] + params)
+                # alertele care nu mai sunt valabile (stoc refăcut, medicament șters...)
+                conn.execute(f"DELETE FROM alerts WHERE refreshed < ? {scope}", [stamp] + (codes or []))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            total = conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+        notify_write({"alerts"})
+        return total
+
+    def sync(self):
+        with self._sync_lock:
+            with self._lock:
+                full = (self._full or self._refreshed_on != date.today()
+                        or time.monotonic() - self._refreshed_at >= self.interval)
+                codes, self._pending, self._full = self._pending, set(), False
+            if not full and not codes:
+                return False
+
+            started = time.perf_counter()
+            try:
+                if full:
+                    self.refresh()
+                    self._refreshed_on = date.today()
+                    self._refreshed_at = time.monotonic()
+                    self._stats["full"] += 1
+                else:
+                    self.refresh(codes)
+                    self._stats["partial"] += 1
+                    self._stats["codes"] += len(codes)
+            except Exception:
+                # se reîncearcă la următorul sync
+                with self._lock:
+                    self._full = self._full or full
+                    self._pending |= codes
+                self._stats["errors"] += 1
+                raise
+            self._stats["last_ms"] = (time.perf_counter() - started) * 1000
+            return True
+
+    def _run(self):
+        while True:
+            if self._wake.wait(self.interval):
+                time.sleep(DEBOUNCE)
+            self._wake.clear()
+            try:
+                self.sync()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+
+    def start(self):
+        # idempotent: un singur thread per proces (Streamlit rulează main la fiecare rerun)
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name="alert-engine", daemon=True)
+            self._thread.start()
+        # primul calcul imediat, nu după REFRESH_INTERVAL
+        self._wake.set()
+        return True
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            s["pending"] = len(self._pending)
+            s["running"] = self._thread is not None and self._thread.is_alive()
+        return s
+
+
+alert_engine = AlertEngine()
+on_write(alert_engine.invalidate)
+
+
+def get_alerts(kind=None, ttl=None):
+    where, params = "", []
+    if kind:
+        where, params = "WHERE type = ?", [kind]
+    return cached_df(f"""
+        SELECT {ALERT_COLUMNS}
+        FROM alerts
+        {where}
+        ORDER BY rank, COALESCE(days_left, 0), Med_name
+    """, params, ttl)
+
+
+def low_stock_alerts(ttl=None):
+    # cu viteza vânzărilor (reorder_points) pentru lista de reaprovizionare
+    return cached_df("""
+        SELECT a.Med_code, a.Med_name, a.Qty, a.threshold AS reorder_point, a.reorder_qty,
+               ROUND(r.velocity, 2) AS daily_sales, a.MRP, a.Exp
+        FROM alerts a
+        LEFT JOIN reorder_points r ON r.Med_code = a.Med_code
+        WHERE a.type = 'low_stock'
+        ORDER BY a.Qty ASC
+    """, [], ttl)
+
+
+def _load_counts(sql, params):
+    with connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    counts = dict.fromkeys(AlertCounts._fields, 0)
+    for kind, priority, n in rows:
+        counts[kind] += n
+        counts[priority] = counts.get(priority, 0) + n
+    return AlertCounts(**{k: counts[k] for k in AlertCounts._fields})
+
+
+def alert_counts(ttl=None):
+    return cached(
+        "SELECT type, priority, COUNT(*) FROM alerts GROUP BY type, priority", [], _load_counts, ttl
+    )
+
+
+def set_threshold(code, low_stock=None, expiry_days=None):
+    # None pe ambele -> medicamentul revine la pragurile implicite
+    with connection() as conn:
+        try:
+            if low_stock is None and expiry_days is None:
+                conn.execute("DELETE FROM alert_thresholds WHERE Med_code = ?", [code])
+            else:
+                conn.execute("""
+                    INSERT INTO alert_thresholds (Med_code, low_stock, expiry_days) VALUES (?, ?, ?)
+                    ON CONFLICT(Med_code) DO UPDATE SET
+                        low_stock = excluded.low_stock,
+                        expiry_days = excluded.expiry_days
+                """, [code, low_stock, expiry_days])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    notify_write({"alert_thresholds"}, {code})
@@ -0,0 +1,248 @@
+"""
+Benchmark pentru căile SQL ale paginilor (Dashboard, Medicines, Sales,
+Reports, Alerts, Search): aceleași interogări ca în views/, rulate fără
+cache (ttl=0) de `repeat` ori fiecare. Rezultatele ies ca JSON și se pot
+compara cu o rulare anterioară (regresie = p50 mai mare decât baseline x
+toleranță) sau cu un plafon absolut pe p95.
+
+    python pharmacy_cli.py --db bench/medium.db bench -o bench/medium.json
+    python pharmacy_cli.py --db bench/medium.db bench --baseline bench/medium.json
+"""
+
+import json
+import platform
+import sqlite3
+import time
+from datetime import date, datetime
+from typing import Callable, NamedTuple
+
+import db_sqlite
+import perf
+from alerts import alert_engine, alert_counts, get_alerts, low_stock_alerts, LOW_STOCK_THRESHOLD
+from catalog import medicine_index, search_medicines, SEARCH_FIELDS, SEARCH_LIMIT
+from db_sqlite import init_db, query_one, query_scalar
+from kpi import get_kpis
+from lots import expiry_queue, medicine_lots
+from pagination import keyset_page
+from query_cache import cached_df
+from leaderboard import top_products, top_sellers, top_sql
+from reports import REPORTS, TOP_LIMIT, TOP_PERIODS, run_report
+from snapshot import build, STOCK_SQL, TREND_SQL, RECENT_SALES_SQL, RECENT_MEDICINES_SQL
+
+REPEAT = 20
+WARMUP = 2
+TOLERANCE = 1.5         # regresie: p50 > baseline * TOLERANCE ...
+MIN_DELTA_MS = 1.0      # ... și mai lent cu cel puțin 1 ms (zgomotul pe interogările rapide)
+PAGE_SIZE = 50
+
+
+class Case(NamedTuple):
+    section: str
+    name: str
+    run: Callable
+
+
+def _df(sql, params=None):
+    return lambda: cached_df(sql, params or [], ttl=0)
+
+
+def _sales_period(period):
+    # aceleași limite ca filtrul Period din Sales History
+    if period == "today":
+        today = str(date.today())
+        return "s.sale_date >= ? AND s.sale_date < date(?, '+1 day')", "date >= ? AND date < date(?, '+1 day')", \
+            [today, today]
+    if period == "month":
+        return "s.sale_date >= date('now','start of month')", "date >= date('now','start of month')", []
+    return "", "", []
+
+
+def _sample_terms():
+    # un medicament popular: codul lui și primul cuvânt din nume (căutarea tipică)
+    row = query_one("""
+        SELECT m.Med_code, m.Med_name
+        FROM medicines_info m
+        LEFT JOIN sales_monthly s ON s.medicine_code = m.Med_code
+        GROUP BY m.Med_code
+        ORDER BY COALESCE(SUM(s.qty), 0) DESC
+        LIMIT 1
+    """)
+    if row is None:
+        return "", "para"
+    return row["Med_code"], (row["Med_name"].split() or ["para"])[0][:4].lower()
+
+
+def cases():
+    code, term = _sample_terms()
+    out = [
+        # ---- Dashboard
+        Case("dashboard", "kpis", lambda: get_kpis(LOW_STOCK_THRESHOLD, ttl=0)),
+        Case("dashboard", "alert_counts", lambda: alert_counts(ttl=0)),
+        Case("dashboard", "stock_overview", _df(STOCK_SQL)),
+        Case("dashboard", "sales_trend_7d", _df(TREND_SQL)),
+        Case("dashboard", "recent_sales", _df(RECENT_SALES_SQL)),
+        Case("dashboard", "recent_medicines", _df(RECENT_MEDICINES_SQL)),
+        # tot ce construiește thread-ul de fundal; pagina doar citește rezultatul
+        Case("dashboard", "snapshot_build", lambda: build(LOW_STOCK_THRESHOLD).stock),
+
+        # ---- Medicines
+        Case("medicines", "summary", _df("""
+            SELECT COUNT(*) AS n,
+                   COALESCE(SUM(Qty * MRP), 0) AS total_value,
+                   COALESCE(AVG(MRP), 0) AS avg_price
+            FROM medicines_info
+        """)),
+        Case("medicines", "page_by_name", lambda: keyset_page(
+            "Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose", "medicines_info", "Med_name", "Med_code",
+            page_size=PAGE_SIZE, ttl=0).rows),
+        Case("medicines", "page_by_expiry", lambda: keyset_page(
+            "Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose", "medicines_info", "COALESCE(Exp, '')", "Med_code",
+            page_size=PAGE_SIZE, ttl=0).rows),
+        Case("medicines", "low_stock", lambda: low_stock_alerts(ttl=0)),
+        Case("medicines", "expiry_queue_30d", lambda: expiry_queue(30, ttl=0)),
+        Case("medicines", "medicine_lots", lambda: medicine_lots(code, ttl=0)),
+    ]
+
+    # ---- Sales History (rezumat + prima pagină + trend, pe perioade)
+    for period in ("today", "month", "all"):
+        where, daily_where, params = _sales_period(period)
+        out += [
+            Case("sales", f"summary_{period}", _df(f"""
+                SELECT COUNT(*) AS n,
+                       COALESCE(SUM(s.total), 0) AS total_sales,
+                       COALESCE(AVG(s.total), 0) AS avg_sale,
+                       COALESCE(SUM(s.quantity), 0) AS total_items
+                FROM sales s
+                {"WHERE " + where if where else ""}
+            """, params)),
+            Case("sales", f"page_{period}", lambda where=where, params=params: keyset_page(
+                "s.sale_id, s.sale_date, m.Med_name, s.quantity, s.sale_price, s.total",
+                "sales s LEFT JOIN medicines_info m ON s.medicine_code = m.Med_code",
+                "s.sale_date", "s.sale_id", where=where, params=params, descending=True,
+                page_size=PAGE_SIZE, ttl=0).rows),
+            Case("sales", f"trend_{period}", _df(f"""
+                SELECT date, SUM(revenue) AS total
+                FROM sales_daily
+                {"WHERE " + daily_where if daily_where else ""}
+                GROUP BY date
+                ORDER BY date
+            """, params)),
+        ]
+    out += [
+        Case("sales", "picker_search", lambda: medicine_index.search(term, 20)),
+        Case("sales", "picker_scan", lambda: medicine_index.get(code)),
+    ]
+
+    # ---- Reports (parametrii impliciți = ce arată pagina la deschidere)
+    out += [Case("reports", name, lambda name=name: run_report(name, ttl=0).table) for name in REPORTS]
+    # top din contoarele în memorie vs. GROUP BY peste sales, pe fiecare perioadă
+    for label, days in TOP_PERIODS.items():
+        suffix = f"{days}d" if days else "all"
+        out += [
+            Case("reports", f"top_{suffix}", lambda days=days: top_products(TOP_LIMIT, days)),
+            Case("reports", f"top_sql_{suffix}", lambda days=days: top_sql(TOP_LIMIT, days)),
+        ]
+
+    # ---- Alerts
+    out += [
+        Case("alerts", "all", lambda: get_alerts(ttl=0)),
+        Case("alerts", "refresh_full", lambda: alert_engine.refresh()),
+        Case("alerts", "thresholds", _df("""
+            SELECT t.Med_code, m.Med_name, m.Qty, t.low_stock, t.expiry_days
+            FROM alert_thresholds t
+            LEFT JOIN medicines_info m ON m.Med_code = t.Med_code
+            ORDER BY t.Med_code
+        """)),
+    ]
+
+    # ---- Search
+    out += [
+        Case("search", field.lower(), lambda field=field: search_medicines(
+            code if field == "Code" else term, field, SEARCH_LIMIT, ttl=0))
+        for field in SEARCH_FIELDS
+    ]
+    return out
+
+
+def _measure(case, repeat, warmup):
+    for _ in range(warmup):
+        case.run()
+    times, rows = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = case.run()
+        times.append((time.perf_counter() - started) * 1000)
+        rows = perf.row_count(result)
+    times.sort()
+    return {
+        "section": case.section,
+        "name": case.name,
+        "repeat": repeat,
+        "min_ms": round(times[0], 3),
+        "p50_ms": round(perf.percentile(times, 0.50), 3),
+        "p95_ms": round(perf.percentile(times, 0.95), 3),
+        "max_ms": round(times[-1], 3),
+        "rows": rows,
+    }
+
+
+def dataset():
+    return {
+        "db": str(db_sqlite.DB_PATH),
+        "medicines": query_scalar("SELECT COUNT(*) FROM medicines_info", default=0),
+        "lots": query_scalar("SELECT COUNT(*) FROM lots", default=0),
+        "sales": query_scalar("SELECT COUNT(*) FROM sales", default=0),
+    }
+
+
+def run(repeat=REPEAT, warmup=WARMUP, sections=None, progress=None):
+    # progress(rezultat) după fiecare caz, opțional
+    init_db()
+    alert_engine.sync()
+    top_sellers.sync()      # ca în aplicația web: contoarele încărcate o dată, înainte de măsurători
+    results = []
+    for case in cases():
+        if sections and case.section not in sections:
+            continue
+        results.append(_measure(case, repeat, warmup))
+        if progress:
+            progress(results[-1])
+    return result_set(results)
+
+
+def result_set(results):
+    # rezultatele + mediul în care au fost măsurate (pentru comparații corecte)
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "dataset": dataset(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=TOLERANCE, min_delta_ms=MIN_DELTA_MS, budget_ms=None):
+    # regresiile: (caz, motiv); cazurile noi / dispărute nu contează
+    base = {f"{r['section']}/{r['name']}": r for r in baseline["results"]} if baseline else {}
+    regressions = []
+    for r in current["results"]:
+        key = f"{r['section']}/{r['name']}"
+        old = base.get(key)
+        if old and r["p50_ms"] > old["p50_ms"] * tolerance and r["p50_ms"] - old["p50_ms"] >= min_delta_ms:
+            regressions.append((key, f"p50 {old['p50_ms']:.2f} -> {r['p50_ms']:.2f} ms "
+                                     f"(x{r['p50_ms'] / max(old['p50_ms'], 1e-9):.1f})"))
+        if budget_ms is not None and r["p95_ms"] > budget_ms:
+            regressions.append((key, f"p95 {r['p95_ms']:.2f} ms over budget {budget_ms:.0f} ms"))
+    return regressions
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
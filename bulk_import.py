@@ -0,0 +1,209 @@
+"""
+Import în masă pentru medicines_info (livrări de la distribuitori):
+citire pe bucăți (CSV/Excel), validare pe rând și upsert în tranzacții pe
+lot. Codurile existente primesc cantitatea adunată la stoc.
+"""
+
+import csv
+import io
+import math
+import time
+from datetime import date
+
+import pandas as pd
+
+from db_sqlite import connection, notify_write
+from lots import RECEIVE_SQL
+
+REQUIRED_COLUMNS = ["Med_code", "Med_name", "Qty", "MRP", "Exp"]
+OPTIONAL_COLUMNS = ["Mfg", "Purpose", "Batch"]
+CHUNK_SIZE = 5000
+MAX_QTY = 2 ** 63 - 1       # INTEGER în SQLite (int64); peste -> OverflowError la executemany
+MAX_REJECTS_KEPT = 10000    # câte rânduri respinse se păstrează în memorie
+
+UPSERT_SQL = """
+    INSERT INTO medicines_info (Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(Med_code) DO UPDATE SET
+        Qty = Qty + excluded.Qty,
+        MRP = excluded.MRP,
+        Mfg = COALESCE(excluded.Mfg, Mfg),
+        -- păstrăm cea mai apropiată expirare cât timp mai e stoc vechi pe raft
+        Exp = CASE
+            WHEN Qty > 0 AND Exp > '' THEN MIN(Exp, excluded.Exp)
+            ELSE excluded.Exp
+        END
+"""
+# Med_name / Purpose nu se rescriu la upsert (nici triggerul FTS nu se declanșează);
+# fiecare rând cu Qty > 0 devine și un lot, cu expirarea lui (FEFO)
+
+
+def parse_date(value):
+    # acceptă YYYY-MM-DD, YYYY/MM/DD, DD.MM.YYYY, DD/MM/YYYY (fără strptime: e lent la 1M rânduri)
+    value = (value or "").strip()[:10]
+    if not value:
+        return None
+    try:
+        parts = [int(p) for p in value.replace("/", "-").replace(".", "-").split("-")]
+        if len(parts) != 3:
+            raise ValueError
+        y, m, d = parts if parts[0] > 31 else parts[::-1]
+        return date(y, m, d).isoformat()
+    except ValueError:
+        raise ValueError(f"invalid date '{value}'")
+
+
+def validate_row(row):
+    # întoarce tuplul pentru UPSERT_SQL sau ridică ValueError cu motivul
+    code = (row.get("Med_code") or "").strip()
+    name = (row.get("Med_name") or "").strip()
+    if not code:
+        raise ValueError("missing Med_code")
+    if not name:
+        raise ValueError("missing Med_name")
+
+    # nan / inf / 1e400 / 2.7 / 1e19 ajung la respinse, nu opresc importul
+    raw = str(row.get("Qty") or "").strip()
+    try:
+        # întregii direct (exacți până la MAX_QTY), restul prin float ("5.0", "1e3")
+        try:
+            qty = int(raw)
+        except ValueError:
+            value = float(raw)
+            if not math.isfinite(value) or not value.is_integer():
+                raise ValueError
+            qty = int(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f"invalid Qty '{row.get('Qty')}'")
+    if qty < 0:
+        raise ValueError("Qty must be >= 0")
+    if qty > MAX_QTY:
+        raise ValueError(f"Qty must be <= {MAX_QTY}")
+
+    try:
+        mrp = float(str(row.get("MRP") or "").replace(",", "."))
+    except (ValueError, OverflowError):
+        raise ValueError(f"invalid MRP '{row.get('MRP')}'")
+    if not math.isfinite(mrp):
+        raise ValueError(f"invalid MRP '{row.get('MRP')}'")
+    if mrp <= 0:
+        raise ValueError("MRP must be > 0")
+
+    exp = parse_date(row.get("Exp"))
+    if exp is None:
+        raise ValueError("missing Exp")
+    mfg = parse_date(row.get("Mfg"))
+    if mfg and mfg > exp:
+        raise ValueError("Mfg is after Exp")
+
+    return (code, name, qty, mrp, mfg, exp, (row.get("Purpose") or "").strip())
+
+
+def _column_map(columns):
+    lookup = {c.lower(): c for c in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+    mapping = {c: lookup.get(str(c).strip().lower(), c) for c in columns}
+    missing = [c for c in REQUIRED_COLUMNS if c not in mapping.values()]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return mapping
+
+
+def read_chunks(source, chunk_size=CHUNK_SIZE, filename=None):
+    # source: cale sau fișier binar deschis (ex. upload Streamlit);
+    # produce liste de dict-uri cu valori text și chei normalizate
+    name = str(filename or getattr(source, "name", source)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        # Excel nu se poate citi incremental cu pandas; se împarte după citire
+        df = pd.read_excel(source, dtype=str, keep_default_na=False)
+        df = df.rename(columns=_column_map(df.columns))
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size].to_dict("records")
+        return
+
+    if isinstance(source, str) or hasattr(source, "__fspath__"):
+        text = open(source, newline="", encoding="utf-8-sig")
+    else:
+        text = io.TextIOWrapper(source, newline="", encoding="utf-8-sig")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        mapping = _column_map(header)
+        keys = [mapping[c] for c in header]
+        chunk = []
+        for values in reader:
+            chunk.append(dict(zip(keys, values)))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if isinstance(text, io.TextIOWrapper) and text.buffer is source:
+            text.detach()
+        else:
+            text.close()
+
+
+def import_medicines(source, chunk_size=CHUNK_SIZE, filename=None, progress=None, rejects_path=None):
+    # progress(rows_read, fraction|None) după fiecare lot
+    started = time.perf_counter()
+    result = {"rows_read": 0, "imported": 0, "rejected": 0, "rejects": [], "chunks": 0}
+    total_size = getattr(source, "size", None)
+
+    rejects_file = open(rejects_path, "w", newline="", encoding="utf-8") if rejects_path else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(["row", "Med_code", "reason"])
+
+    try:
+        for chunk in read_chunks(source, chunk_size, filename):
+            batch, received = [], []
+            for offset, row in enumerate(chunk):
+                line = result["rows_read"] + offset + 2     # +1 antet, +1 numerotare de la 1
+                try:
+                    valid = validate_row(row)
+                    batch.append(valid)
+                    if valid[2] > 0:
+                        code, _, qty, _, mfg, exp, _ = valid
+                        received.append((code, (row.get("Batch") or "").strip() or None, qty, mfg, exp))
+                except ValueError as e:
+                    result["rejected"] += 1
+                    reject = {"row": line, "Med_code": row.get("Med_code", ""), "reason": str(e)}
+                    if rejects_writer:
+                        rejects_writer.writerow(reject.values())
+                    if len(result["rejects"]) < MAX_REJECTS_KEPT:
+                        result["rejects"].append(reject)
+            result["rows_read"] += len(chunk)
+
+            if batch:
+                with connection() as conn:
+                    try:
+                        conn.execute("BEGIN IMMEDIATE")
+                        conn.executemany(UPSERT_SQL, batch)
+                        conn.executemany(RECEIVE_SQL, received)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                result["imported"] += len(batch)
+            result["chunks"] += 1
+
+            if progress:
+                fraction = None
+                if total_size and hasattr(source, "tell"):
+                    fraction = min(1.0, source.tell() / total_size)
+                progress(result["rows_read"], fraction)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+        if result["imported"]:
+            notify_write({"medicines_info", "lots"})
+
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+def rejects_csv(rejects):
+    return pd.DataFrame(rejects, columns=["row", "Med_code", "reason"]).to_csv(index=False)
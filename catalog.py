@@ -0,0 +1,266 @@
+"""
+Căutare în catalogul de medicamente: FTS5 (prefix, ordonat după relevanță)
+cu fallback pe LIKE dacă indexul full-text nu există, plus un index de
+prefixe în memorie (partajat de toate sesiunile) pentru selecția rapidă
+la casă.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+from typing import NamedTuple
+
+from db_sqlite import connection, has_search_index, on_write, query_rows
+from query_cache import cached_df
+
+SEARCH_FIELDS = {
+    "All": None,
+    "Name": "Med_name",
+    "Code": "Med_code",
+    "Purpose": "Purpose",
+}
+SEARCH_LIMIT = 50
+# relevanța (bm25) se calculează doar pe primele N potriviri: pentru prefixe
+# foarte scurte (zeci de mii de rezultate) ordonarea e aproximativă, dar
+# căutarea rămâne sub ~10 ms pe cataloage de 100k produse
+RANK_CANDIDATES = 1000
+
+MEDICINE_COLUMNS = "m.Med_code, m.Med_name, m.Qty, m.MRP, m.Mfg, m.Exp, m.Purpose"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(term, field=None):
+    # fiecare cuvânt devine un prefix între ghilimele ("para"* "500"*), deci
+    # caracterele speciale FTS din input nu pot produce erori de sintaxă
+    tokens = _TOKEN_RE.findall(term or "")
+    if not tokens:
+        return None
+    expr = " ".join(f'"{t}"*' for t in tokens)
+    column = SEARCH_FIELDS.get(field)
+    return f"{{{column}}} : ({expr})" if column else expr
+
+
+def search_medicines(term, field="All", limit=SEARCH_LIMIT, ttl=None):
+    with connection() as conn:
+        use_fts = has_search_index(conn)
+
+    if use_fts:
+        match = fts_query(term, field)
+        if match is None:
+            return cached_df(f"SELECT {MEDICINE_COLUMNS} FROM medicines_info m LIMIT 0", [], ttl)
+        return cached_df(f"""
+            SELECT {MEDICINE_COLUMNS}
+            FROM (
+                SELECT rowid, rank FROM medicines_fts
+                WHERE medicines_fts MATCH ?
+                LIMIT ?
+            ) f
+            JOIN medicines_info m ON m.rowid = f.rowid
+            ORDER BY f.rank
+            LIMIT ?
+        """, [match, max(RANK_CANDIDATES, int(limit)), int(limit)], ttl)
+
+    # fără FTS5: căutarea veche cu LIKE
+    columns = [SEARCH_FIELDS[field]] if SEARCH_FIELDS.get(field) else ["Med_name", "Med_code", "Purpose"]
+    where = " OR ".join(f"m.{c} LIKE ?" for c in columns)
+    return cached_df(f"""
+        SELECT {MEDICINE_COLUMNS}
+        FROM medicines_info m
+        WHERE {where}
+        ORDER BY m.Med_name
+        LIMIT ?
+    """, [f"%{term}%"] * len(columns) + [int(limit)], ttl)
+
+
+# ====================== INDEX DE PREFIXE ÎN MEMORIE ======================
+class MedicineEntry(NamedTuple):
+    code: str
+    name: str
+    price: float
+    qty: int
+
+
+def _words(text):
+    return [w.lower() for w in _TOKEN_RE.findall(text or "")]
+
+
+class MedicineIndex:
+    # _items: Med_code -> MedicineEntry
+    # _name_keys / _code_keys: liste sortate de (cuvânt, Med_code) pentru
+    #     cuvintele din nume, respectiv codul întreg; un prefix = un interval
+    #     găsit cu bisect
+    # Scrierile cu coduri cunoscute (vânzări) marchează doar acele coduri,
+    # restul marchează indexul ca vechi; ambele se reîncarcă la următoarea
+    # citire (notificarea rulează pe thread-ul care a scris: fără SQL acolo).
+    # Codurile marcate în timpul unei reîncărcări complete rămân marcate și se
+    # reaplică după ea, ca snapshot-ul mai vechi să nu le acopere.
+
+    MAX_AGE = 300   # secunde; reîncărcare periodică (scrieri din alte procese)
+
+    def __init__(self):
+        self._items = {}
+        self._words = {}
+        self._name_keys = []
+        self._code_keys = []
+        self._lock = threading.RLock()         # hărțile, _dirty, _generation
+        self._sync_lock = threading.Lock()     # o singură reîncărcare la un moment dat
+        self._loaded_at = None
+        self._dirty = set()
+        self._generation = 0                   # crește la fiecare invalidare completă
+
+    def _stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.MAX_AGE
+
+    def _load(self, generation):
+        rows = query_rows("SELECT Med_code, Med_name, MRP, Qty FROM medicines_info")
+        items = {r[0]: MedicineEntry(r[0], r[1], float(r[2]), int(r[3])) for r in rows}
+        words = {c: tuple(set(_words(e.name))) for c, e in items.items()}
+        name_keys = sorted((w, c) for c, ws in words.items() for w in ws)
+        code_keys = sorted((c.lower(), c) for c in items)
+        with self._lock:
+            self._items, self._words = items, words
+            self._name_keys, self._code_keys = name_keys, code_keys
+            # o invalidare completă în timpul citirii -> încă o reîncărcare la următoarea căutare
+            if generation == self._generation:
+                self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if not self._stale() and not self._dirty:
+                return
+        with self._sync_lock:
+            with self._lock:
+                full = self._stale()
+                generation = self._generation
+                if full:
+                    # scrierile notificate până acum sunt deja vizibile reîncărcării
+                    self._dirty = set()
+            if full:
+                self._load(generation)
+            with self._lock:
+                codes, self._dirty = self._dirty, set()
+            if codes:
+                try:
+                    self.refresh(codes)
+                except Exception:
+                    with self._lock:
+                        self._dirty |= codes
+                    raise
+
+    @staticmethod
+    def _drop(keys, key):
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    def _remove(self, code):
+        if self._items.pop(code, None) is None:
+            return
+        for w in self._words.pop(code, ()):
+            self._drop(self._name_keys, (w, code))
+        self._drop(self._code_keys, (code.lower(), code))
+
+    def _put(self, entry):
+        old = self._items.get(entry.code)
+        if old is not None and old.name == entry.name:
+            # doar stoc/preț: cheile rămân aceleași
+            self._items[entry.code] = entry
+            return
+        self._remove(entry.code)
+        self._items[entry.code] = entry
+        self._words[entry.code] = tuple(set(_words(entry.name)))
+        for w in self._words[entry.code]:
+            bisect.insort(self._name_keys, (w, entry.code))
+        bisect.insort(self._code_keys, (entry.code.lower(), entry.code))
+
+    def refresh(self, codes):
+        codes = list(codes)
+        if not codes:
+            return
+        marks = ",".join("?" * len(codes))
+        rows = query_rows(
+            f"SELECT Med_code, Med_name, MRP, Qty FROM medicines_info WHERE Med_code IN ({marks})", codes
+        )
+        found = {r[0]: MedicineEntry(r[0], r[1], float(r[2]), int(r[3])) for r in rows}
+        with self._lock:
+            for code in codes:
+                if code in found:
+                    self._put(found[code])
+                else:
+                    self._remove(code)
+
+    def invalidate(self, tables=None, codes=None):
+        if tables is not None and "medicines_info" not in tables:
+            return
+        with self._lock:
+            if tables is not None and codes:
+                self._dirty.update(codes)
+            else:
+                self._loaded_at = None
+                self._generation += 1
+
+    def get(self, code):
+        # căutare O(1) după Med_code exact (ex. cod scanat); altfel fără
+        # diferență între litere mari/mici
+        self._ensure_loaded()
+        code = (code or "").strip()
+        entry = self._items.get(code)
+        if entry is None and code:
+            key = code.lower()
+            with self._lock:
+                i = bisect.bisect_left(self._code_keys, (key, ""))
+                if i < len(self._code_keys) and self._code_keys[i][0] == key:
+                    entry = self._items.get(self._code_keys[i][1])
+        return entry
+
+    @staticmethod
+    def _prefix(keys, prefix):
+        start = bisect.bisect_left(keys, (prefix, ""))
+        codes = set()
+        for word, code in keys[start:]:
+            if not word.startswith(prefix):
+                break
+            codes.add(code)
+        return codes
+
+    def search(self, text, limit=20, in_stock=True):
+        raw = (text or "").strip().lower()
+        if not raw:
+            return []
+        self._ensure_loaded()
+        words = _words(raw)
+        with self._lock:
+            # textul întreg ca prefix de cod (ex. "pcm-00") ...
+            codes = self._prefix(self._code_keys, raw)
+            # ... sau fiecare cuvânt ca prefix al unui cuvânt din nume
+            if words:
+                by_name = self._prefix(self._name_keys, words[0])
+                for w in words[1:]:
+                    by_name = {c for c in by_name if any(x.startswith(w) for x in self._words[c])}
+                codes |= by_name
+            pool = [self._items[c] for c in codes]
+            if in_stock:
+                pool = [e for e in pool if e.qty > 0]
+
+            # cod exact, apoi nume care încep cu textul, apoi alfabetic
+            return heapq.nsmallest(limit, pool, key=lambda e: (
+                e.code.lower() != raw,
+                not e.name.lower().startswith(raw),
+                e.name.lower(),
+            ))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "keys": len(self._name_keys) + len(self._code_keys),
+                "loaded": self._loaded_at is not None,
+                "dirty": len(self._dirty),
+            }
+
+
+medicine_index = MedicineIndex()
+on_write(medicine_index.invalidate)
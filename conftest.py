@@ -0,0 +1,15 @@
+import pytest
+
+import db_sqlite
+
+
+@pytest.fixture
+def db(tmp_path):
+    # bază nouă, migrată până la ultima versiune; pool-ul revine la final la baza inițială
+    original = db_sqlite.DB_PATH
+    db_sqlite.configure(tmp_path / "pharmacy.db")
+    db_sqlite.init_db()
+    try:
+        yield db_sqlite
+    finally:
+        db_sqlite.configure(original)
@@ -0,0 +1,200 @@
+"""
+Generator de baze de date sintetice pentru benchmark-uri: medicamente cu
+loturi (expirări răspândite, câteva deja expirate), vânzări istorice cu
+sezonalitate (vârf iarna, weekend mai slab, creștere în timp) și popularitate
+Zipf (câteva produse vând mult, coada lungă rar). Cu același seed rezultă
+aceeași bază de date.
+
+    python pharmacy_cli.py --db bench/medium.db generate-data --scale medium
+"""
+
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from db_sqlite import connection, init_db, notify_write
+from lots import RECEIVE_SQL
+
+# nume -> (medicamente, vânzări)
+SCALES = {
+    "tiny": (200, 10_000),
+    "small": (1_000, 100_000),
+    "medium": (50_000, 5_000_000),
+    "large": (500_000, 50_000_000),
+}
+HISTORY_DAYS = 730
+SEED = 42
+CHUNK_SIZE = 50_000     # rânduri per executemany / commit
+
+CODE_PREFIX = "GEN"
+STEMS = ["Amoxi", "Parace", "Ibupro", "Cetiri", "Lorata", "Omepra", "Panto", "Metfor", "Atorva", "Simva",
+         "Amlodi", "Lisino", "Losar", "Clopi", "Azithro", "Cipro", "Doxy", "Fluco", "Salbu", "Montelu",
+         "Predni", "Diclo", "Napro", "Trama", "Sertra", "Escita", "Levo", "Ranit", "Dompe", "Loper"]
+SUFFIXES = ["cillin", "tamol", "fen", "zine", "dine", "zole", "prazole", "min", "statin", "pine",
+            "pril", "sartan", "grel", "mycin", "floxacin", "cycline", "conazole", "tamol", "kast", "sone"]
+FORMS = ["Tablets", "Capsules", "Syrup", "Suspension", "Cream", "Drops"]
+STRENGTHS = [5, 10, 20, 25, 50, 100, 200, 250, 400, 500, 1000]
+PURPOSES = ["Pain Relief", "Antibiotic", "Allergy", "Cold & Flu", "Diabetes", "Cardiology", "Gastro",
+            "Respiratory", "Dermatology", "Vitamins", "Antifungal", "Mental Health", ""]
+
+ZIPF_S = 1.1            # exponentul popularității
+WEEKDAY_FACTOR = [1.0, 1.0, 1.0, 1.0, 1.05, 0.8, 0.5]      # luni .. duminică
+WINTER_PEAK = 0.3       # +30% în ianuarie, -30% în iulie
+GROWTH = 0.2            # +20% vânzări de la începutul la sfârșitul istoricului
+OPEN_SECONDS = (8 * 3600, 21 * 3600)
+
+
+def day_weights(days, end=None):
+    # ponderea fiecărei zile din istoric (cea mai veche prima)
+    end = end or date.today()
+    start = end - timedelta(days=days - 1)
+    doy = np.array([(start + timedelta(d)).timetuple().tm_yday for d in range(days)])
+    weekday = np.array([(start + timedelta(d)).weekday() for d in range(days)])
+    season = 1 + WINTER_PEAK * np.cos(2 * np.pi * (doy - 15) / 365.25)
+    trend = 1 + GROWTH * np.arange(days) / max(days - 1, 1)
+    weights = season * trend * np.take(WEEKDAY_FACTOR, weekday)
+    return start, weights / weights.sum()
+
+
+def _check_empty(conn):
+    for table in ("medicines_info", "sales"):
+        if conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]:
+            raise ValueError(f"Table {table} is not empty; generate into a fresh database (--db).")
+
+
+def _medicines(rng, n):
+    today = date.today()
+    codes = np.array([f"{CODE_PREFIX}{i:07d}" for i in range(1, n + 1)])
+    names = [
+        f"{STEMS[a]}{SUFFIXES[b]} {STRENGTHS[c]}mg {FORMS[d]}"
+        for a, b, c, d in zip(rng.integers(len(STEMS), size=n), rng.integers(len(SUFFIXES), size=n),
+                              rng.integers(len(STRENGTHS), size=n), rng.integers(len(FORMS), size=n))
+    ]
+    mrp = np.round(rng.lognormal(np.log(12), 0.8, size=n), 2).clip(0.5, 900)
+    purpose = rng.choice(PURPOSES, size=n)
+
+    # stoc: majoritatea 20-500, ~7% sub prag, ~1% epuizat
+    qty = rng.integers(20, 500, size=n)
+    low = rng.random(n)
+    qty[low < 0.07] = rng.integers(1, 20, size=int((low < 0.07).sum()))
+    qty[low < 0.01] = 0
+
+    # 1-3 loturi per medicament cu stoc; expirări între -60 și +900 zile
+    lots_per = np.where(qty > 0, rng.integers(1, 4, size=n), 0)
+    lot_med = np.repeat(np.arange(n), lots_per)
+    lot_exp_days = rng.integers(-60, 900, size=len(lot_med))
+    # cantitatea medicamentului împărțită între loturi (ultimul ia restul)
+    share = rng.random(len(lot_med)) + 0.1
+    totals = np.bincount(lot_med, weights=share, minlength=n)
+    lot_qty = np.floor(qty[lot_med] * share / totals[lot_med]).astype(np.int64)
+    last = np.cumsum(lots_per) - 1
+    last = last[lots_per > 0]
+    lot_qty[last] += qty[lots_per > 0] - np.bincount(lot_med, weights=lot_qty, minlength=n)[lots_per > 0].astype(np.int64)
+
+    exp = [str(today + timedelta(int(d))) for d in lot_exp_days]
+    mfg = [str(today + timedelta(int(d) - 730)) for d in lot_exp_days]
+    # medicines_info.Mfg / Exp = ale lotului care expiră primul (ca triggerele din lots)
+    first = {}
+    for i, m in enumerate(lot_med.tolist()):
+        if m not in first or exp[i] < exp[first[m]]:
+            first[m] = i
+
+    medicines = [
+        (codes[i], names[i], int(qty[i]), float(mrp[i]),
+         mfg[first[i]] if i in first else None, exp[first[i]] if i in first else None, purpose[i])
+        for i in range(n)
+    ]
+    lots = [
+        (codes[m], f"B{i + 1:08d}", int(lot_qty[i]), mfg[i], exp[i])
+        for i, m in enumerate(lot_med.tolist()) if lot_qty[i] > 0
+    ]
+    return codes, mrp, medicines, lots
+
+
+def _sales_chunks(rng, codes, mrp, n_sales, days, chunk_size, cashiers):
+    # vânzările în ordine cronologică, în bucăți de ~chunk_size rânduri
+    start, weights = day_weights(days)
+    per_day = rng.multinomial(n_sales, weights)
+    popularity = 1 / np.arange(1, len(codes) + 1) ** ZIPF_S
+    popularity /= popularity.sum()
+    # rangul de popularitate nu urmează ordinea codurilor
+    ranked = rng.permutation(len(codes))
+    base = np.datetime64(start, "s")
+
+    day, ndays = 0, len(per_day)
+    while day < ndays:
+        end, size = day, 0
+        while end < ndays and (size == 0 or size + per_day[end] <= chunk_size):
+            size += per_day[end]
+            end += 1
+        if size:
+            sale_day = np.repeat(np.arange(day, end), per_day[day:end])
+            seconds = rng.integers(*OPEN_SECONDS, size=size)
+            order = np.lexsort((seconds, sale_day))
+            stamps = base + (sale_day[order] * 86400 + seconds[order]).astype("timedelta64[s]")
+            when = np.char.replace(np.datetime_as_string(stamps, unit="s"), "T", " ")
+
+            med = ranked[rng.choice(len(codes), size=size, p=popularity)]
+            quantity = rng.geometric(0.6, size=size)
+            price = mrp[med]
+            yield list(zip(
+                codes[med].tolist(),
+                quantity.tolist(),
+                price.tolist(),
+                np.round(price * quantity, 2).tolist(),
+                when.tolist(),
+                rng.choice(cashiers, size=size).tolist(),
+            ))
+        day = end
+
+
+def generate(medicines=1_000, sales=100_000, days=HISTORY_DAYS, seed=SEED, chunk_size=CHUNK_SIZE, progress=None):
+    # progress(tabel, rânduri scrise) după fiecare commit, opțional
+    init_db()
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    codes, mrp, med_rows, lot_rows = _medicines(rng, int(medicines))
+
+    with connection() as conn:
+        _check_empty(conn)
+        cashiers = [r[0] for r in conn.execute("SELECT id FROM users")] or [None]
+
+        def insert(table, sql, rows):
+            for i in range(0, len(rows), chunk_size):
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(sql, rows[i:i + chunk_size])
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                if progress:
+                    progress(table, min(i + chunk_size, len(rows)))
+
+        insert("medicines_info", """
+            INSERT INTO medicines_info (Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, med_rows)
+        insert("lots", RECEIVE_SQL, lot_rows)
+
+        written = 0
+        for rows in _sales_chunks(rng, codes, mrp, int(sales), int(days), chunk_size, cashiers):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("""
+                    INSERT INTO sales (medicine_code, quantity, sale_price, total, sale_date, cashier_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            written += len(rows)
+            if progress:
+                progress("sales", written)
+        conn.execute("ANALYZE")
+
+    notify_write(None)
+    return {"medicines": len(med_rows), "lots": len(lot_rows), "sales": written,
+            "days": int(days), "seed": seed, "elapsed": time.perf_counter() - started}
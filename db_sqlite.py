@@ -1,82 +1,662 @@
+import logging
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 import pandas as pd
 from pathlib import Path
 
+import perf
+
 DB_PATH = Path(__file__).parent / "pharmacy.db"
 
-def get_conn():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+log = logging.getLogger(__name__)
+
+# PRAGMA-uri aplicate pe fiecare conexiune nouă (WAL + setări pentru multe sesiuni)
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,       # ~20 MB (valoare negativă = KiB)
+    "mmap_size": 268435456,     # 256 MB
+    "busy_timeout": 5000,       # ms
+    "temp_store": "MEMORY",
+}
+
+POOL_SIZE = 16
+
+
+def get_conn(db_path=None, pragmas=None):
+    conn = sqlite3.connect(db_path or DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for name, value in (PRAGMAS if pragmas is None else pragmas).items():
+        conn.execute(f"PRAGMA {name} = {value}")
     return conn
 
-def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
 
-    # STRICT: schema ta originală (DOAR 7 coloane)
+# Pool de conexiuni: un thread își păstrează conexiunea cât timp o ține
+# (apelurile imbricate o refolosesc), iar la eliberare ea revine în pool
+# în loc să fie închisă.
+class ConnectionPool:
+    def __init__(self, db_path=None, size=POOL_SIZE, pragmas=None):
+        self.db_path = db_path or DB_PATH
+        self.size = size
+        self.pragmas = dict(PRAGMAS if pragmas is None else pragmas)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._local = threading.local()
+        self._stats = {"hits": 0, "misses": 0, "waits": 0, "wait_time": 0.0, "max_wait": 0.0}
+
+    @contextmanager
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # același thread, apel imbricat -> aceeași conexiune
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._release(conn)
+
+    def _acquire(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            self._slots.acquire()
+            waited = time.perf_counter() - start
+            with self._lock:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += waited
+                self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self._stats["hits" if conn is not None else "misses"] += 1
+
+        if conn is None:
+            try:
+                conn = get_conn(self.db_path, self.pragmas)
+            except Exception:
+                self._slots.release()
+                raise
+        return conn
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._idle.append(conn)
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            s["idle"] = len(self._idle)
+        total = s["hits"] + s["misses"]
+        s["size"] = self.size
+        s["hit_rate"] = s["hits"] / total if total else 0.0
+        s["wait_time_ms"] = s.pop("wait_time") * 1000
+        s["max_wait_ms"] = s.pop("max_wait") * 1000
+        return s
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pool = ConnectionPool()
+
+
+def configure(db_path=None, size=None, **pragmas):
+    # recreează pool-ul (ex. altă bază de date sau alte PRAGMA-uri)
+    global _pool, DB_PATH
+    if db_path is not None:
+        DB_PATH = Path(db_path)
+    PRAGMAS.update(pragmas)
+    old = _pool
+    _pool = ConnectionPool(DB_PATH, size or old.size, PRAGMAS)
+    old.close_all()
+    notify_write(None)
+    return _pool
+
+
+def connection():
+    return _pool.connection()
+
+
+def pool_stats():
+    return _pool.stats()
+
+
+# ====================== NOTIFICĂRI LA SCRIERE ======================
+# Componentele care țin date în memorie (cache, indexuri) se înregistrează cu
+# on_write și primesc setul de tabele modificate (None = tot, ex. altă bază)
+# plus, când se știu, codurile Med_code atinse (None = necunoscute).
+# Tabelele derivate (ținute de triggere) sunt incluse automat.
+TABLE_DEPENDENTS = {
+    "sales": {"sales_daily", "sales_monthly"},
+    "medicines_info": {"medicines_fts", "lots"},
+    "lots": {"medicines_info"},
+}
+
+_write_listeners = []
+
+_WRITE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"\[`]?(\w+)",
+    re.IGNORECASE
+)
+
+
+def on_write(callback):
+    _write_listeners.append(callback)
+    return callback
+
+
+def written_table(sql):
+    m = _WRITE_RE.match(sql)
+    return m.group(1) if m else None
+
+
+def notify_write(tables=None, codes=None):
+    # rulează după commit: eroarea unui listener se loghează, nu ajunge la
+    # apelant (scrierea e deja salvată, iar un "eșuat" ar duce la reîncercare)
+    if tables is not None:
+        tables = set(tables)
+        for t in list(tables):
+            tables |= TABLE_DEPENDENTS.get(t, set())
+    for callback in list(_write_listeners):
+        try:
+            callback(tables, codes)
+        except Exception:
+            log.exception("write listener %r failed", callback)
+
+
+# ====================== MIGRĂRI ======================
+# Versiunea schemei e ținută în PRAGMA user_version. Fiecare migrare are un
+# număr, o descriere și o listă de pași (SQL sau funcții care primesc cursorul);
+# migrările noi se adaugă DOAR la finalul listei.
+def _columns(cur, table):
+    return {r["name"] for r in cur.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_receipts(cur):
+    # antet bon (o vânzare cu mai multe produse); liniile rămân în sales
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS receipts (
+        receipt_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        receipt_date TEXT DEFAULT (datetime('now')),
+        cashier_id INTEGER,
+        customer_name TEXT,
+        payment_method TEXT,
+        subtotal REAL NOT NULL,
+        discount REAL NOT NULL DEFAULT 0,
+        total REAL NOT NULL
+    )
+    """)
+    if "receipt_id" not in _columns(cur, "sales"):
+        cur.execute("ALTER TABLE sales ADD COLUMN receipt_id INTEGER")
+
+
+# ====================== ROLLUP-URI VÂNZĂRI ======================
+# sales_daily / sales_monthly sunt ținute la zi de triggere pe sales, deci
+# orice cale de scriere (vânzare, coș, import, corecții) le actualizează.
+def _rollup_trigger(event, sign, row):
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sales_rollup_{event.lower()}_{row.lower()}
+    AFTER {event} ON sales
+    BEGIN
+        INSERT INTO sales_daily (date, medicine_code, qty, revenue, tx_count)
+        VALUES (date({row}.sale_date), {row}.medicine_code, {sign}{row}.quantity, {sign}{row}.total, {sign}1)
+        ON CONFLICT(date, medicine_code) DO UPDATE SET
+            qty = qty + excluded.qty,
+            revenue = revenue + excluded.revenue,
+            tx_count = tx_count + excluded.tx_count;
+        INSERT INTO sales_monthly (month, medicine_code, qty, revenue, tx_count)
+        VALUES (strftime('%Y-%m', {row}.sale_date), {row}.medicine_code, {sign}{row}.quantity, {sign}{row}.total, {sign}1)
+        ON CONFLICT(month, medicine_code) DO UPDATE SET
+            qty = qty + excluded.qty,
+            revenue = revenue + excluded.revenue,
+            tx_count = tx_count + excluded.tx_count;
+    END
+    """
+
+
+def _add_rollups(cur):
     cur.execute("""
-    CREATE TABLE IF NOT EXISTS medicines_info (
+    CREATE TABLE IF NOT EXISTS sales_daily (
+        date TEXT NOT NULL,
+        medicine_code TEXT NOT NULL,
+        qty INTEGER NOT NULL DEFAULT 0,
+        revenue REAL NOT NULL DEFAULT 0,
+        tx_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (date, medicine_code)
+    ) WITHOUT ROWID
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS sales_monthly (
+        month TEXT NOT NULL,
+        medicine_code TEXT NOT NULL,
+        qty INTEGER NOT NULL DEFAULT 0,
+        revenue REAL NOT NULL DEFAULT 0,
+        tx_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (month, medicine_code)
+    ) WITHOUT ROWID
+    """)
+    cur.execute(_rollup_trigger("INSERT", "", "NEW"))
+    cur.execute(_rollup_trigger("DELETE", "-", "OLD"))
+    cur.execute(_rollup_trigger("UPDATE", "-", "OLD"))
+    cur.execute(_rollup_trigger("UPDATE", "", "NEW"))
+    _fill_rollups(cur)
+
+
+def _fill_rollups(cur):
+    cur.execute("DELETE FROM sales_daily")
+    cur.execute("DELETE FROM sales_monthly")
+    cur.execute("""
+        INSERT INTO sales_daily (date, medicine_code, qty, revenue, tx_count)
+        SELECT date(sale_date), medicine_code, SUM(quantity), SUM(total), COUNT(*)
+        FROM sales
+        GROUP BY date(sale_date), medicine_code
+    """)
+    cur.execute("""
+        INSERT INTO sales_monthly (month, medicine_code, qty, revenue, tx_count)
+        SELECT substr(date, 1, 7), medicine_code, SUM(qty), SUM(revenue), SUM(tx_count)
+        FROM sales_daily
+        GROUP BY substr(date, 1, 7), medicine_code
+    """)
+
+
+def rebuild_rollups():
+    # recalculează rollup-urile din sales (backfill / reparare)
+    with connection() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            _fill_rollups(conn.cursor())
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        rows = conn.execute("SELECT COUNT(*) FROM sales_daily").fetchone()[0]
+    notify_write(TABLE_DEPENDENTS["sales"])
+    return rows
+
+
+# ====================== CĂUTARE FULL-TEXT (FTS5) ======================
+# medicines_fts e un index FTS5 "external content" peste medicines_info
+# (legat prin rowid), ținut la zi de triggere. Triggerul de UPDATE se
+# declanșează doar pe coloanele indexate, deci scăderea stocului nu-l atinge.
+# Dacă SQLite-ul nu are FTS5, tabela nu se creează și căutarea folosește LIKE.
+# După un VACUUM rowid-urile pot fi renumerotate -> rebuild_search_index().
+def _add_medicines_fts(cur):
+    try:
+        cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS medicines_fts USING fts5(
+            Med_code, Med_name, Purpose,
+            content='medicines_info', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e):
+            return
+        raise
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_medicines_fts_insert AFTER INSERT ON medicines_info
+    BEGIN
+        INSERT INTO medicines_fts (rowid, Med_code, Med_name, Purpose)
+        VALUES (NEW.rowid, NEW.Med_code, NEW.Med_name, NEW.Purpose);
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_medicines_fts_delete AFTER DELETE ON medicines_info
+    BEGIN
+        INSERT INTO medicines_fts (medicines_fts, rowid, Med_code, Med_name, Purpose)
+        VALUES ('delete', OLD.rowid, OLD.Med_code, OLD.Med_name, OLD.Purpose);
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_medicines_fts_update
+    AFTER UPDATE OF Med_code, Med_name, Purpose ON medicines_info
+    BEGIN
+        INSERT INTO medicines_fts (medicines_fts, rowid, Med_code, Med_name, Purpose)
+        VALUES ('delete', OLD.rowid, OLD.Med_code, OLD.Med_name, OLD.Purpose);
+        INSERT INTO medicines_fts (rowid, Med_code, Med_name, Purpose)
+        VALUES (NEW.rowid, NEW.Med_code, NEW.Med_name, NEW.Purpose);
+    END
+    """)
+    cur.execute("INSERT INTO medicines_fts (medicines_fts) VALUES ('rebuild')")
+
+
+def has_search_index(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'medicines_fts'"
+    ).fetchone() is not None
+
+
+def rebuild_search_index():
+    with connection() as conn:
+        if not has_search_index(conn):
+            return False
+        conn.execute("INSERT INTO medicines_fts (medicines_fts) VALUES ('rebuild')")
+        conn.commit()
+    notify_write({"medicines_fts"})
+    return True
+
+
+# ====================== ALERTE ======================
+# alerts e materializată de alerts.AlertEngine (o linie per tip + medicament,
+# deci fără duplicate); alert_thresholds ține pragurile per medicament, fără
+# a atinge schema medicines_info.
+def _add_alerts(cur):
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS alert_thresholds (
         Med_code TEXT PRIMARY KEY,
-        Med_name TEXT NOT NULL,
-        Qty INTEGER NOT NULL,
-        MRP REAL NOT NULL,
-        Mfg TEXT,
+        low_stock INTEGER,
+        expiry_days INTEGER
+    ) WITHOUT ROWID
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS alerts (
+        type TEXT NOT NULL,
+        Med_code TEXT NOT NULL,
+        priority TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        Med_name TEXT,
+        Qty INTEGER,
+        MRP REAL,
         Exp TEXT,
-        Purpose TEXT
-    )
+        threshold INTEGER,
+        days_left INTEGER,
+        message TEXT,
+        first_seen TEXT NOT NULL DEFAULT (datetime('now')),
+        refreshed REAL NOT NULL,
+        PRIMARY KEY (type, Med_code)
+    ) WITHOUT ROWID
     """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_alerts_rank ON alerts(rank, days_left)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_alerts_code ON alerts(Med_code)")
+
 
+def _add_reorder_points(cur):
+    # calculată de reorder.compute_reorder_points din viteza vânzărilor
     cur.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        role TEXT NOT NULL,
-        full_name TEXT,
-        email TEXT,
-        created_at TEXT DEFAULT (datetime('now'))
-    )
+    CREATE TABLE IF NOT EXISTS reorder_points (
+        Med_code TEXT PRIMARY KEY,
+        velocity REAL NOT NULL,
+        velocity_std REAL NOT NULL,
+        days INTEGER NOT NULL,
+        reorder_point INTEGER NOT NULL,
+        order_up_to INTEGER NOT NULL,
+        computed_at TEXT NOT NULL DEFAULT (datetime('now'))
+    ) WITHOUT ROWID
     """)
+    if "reorder_qty" not in _columns(cur, "alerts"):
+        cur.execute("ALTER TABLE alerts ADD COLUMN reorder_qty INTEGER")
 
+
+# ====================== LOTURI (FEFO) ======================
+# lots ține stocul pe loturi (cantitate + expirare proprie); medicines_info.Qty
+# rămâne totalul. Orice scădere de Qty în medicines_info (vânzare, coș,
+# corecție) consumă loturile în ordinea expirării (first-expiry-first-out),
+# în aceeași tranzacție, prin trigger; loturile fără dată de expirare ies
+# ultimele. medicines_info.Exp urmează cea mai apropiată expirare rămasă
+# (NULL când niciun lot cu stoc nu are dată de expirare).
+# Intrările de stoc adaugă loturi explicit (lots.RECEIVE_SQL).
+def _add_lots(cur):
     cur.execute("""
-    CREATE TABLE IF NOT EXISTS sales (
-        sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        medicine_code TEXT NOT NULL,
-        quantity INTEGER NOT NULL,
-        sale_price REAL NOT NULL,
-        total REAL NOT NULL,
-        sale_date TEXT DEFAULT (datetime('now')),
-        cashier_id INTEGER
+    CREATE TABLE IF NOT EXISTS lots (
+        lot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        Med_code TEXT NOT NULL,
+        batch TEXT,
+        Qty INTEGER NOT NULL,
+        Mfg TEXT,
+        Exp TEXT,
+        received_at TEXT NOT NULL DEFAULT (datetime('now'))
     )
     """)
+    # parțiale: loturile golite ies din indexuri, cozile rămân scurte
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_lots_fefo ON lots(Med_code, Exp) WHERE Qty > 0")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_lots_exp ON lots(Exp) WHERE Qty > 0")
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_lots_fefo
+    AFTER UPDATE OF Qty ON medicines_info WHEN NEW.Qty < OLD.Qty
+    BEGIN
+        UPDATE lots SET Qty = lots.Qty - f.take
+        FROM (
+            SELECT lot_id, MIN(Qty, (OLD.Qty - NEW.Qty) - (running - Qty)) AS take
+            FROM (
+                SELECT lot_id, Qty,
+                       SUM(Qty) OVER (ORDER BY COALESCE(Exp, '') = '', Exp, lot_id) AS running
+                FROM lots
+                WHERE Med_code = NEW.Med_code AND Qty > 0
+            )
+            WHERE running - Qty < OLD.Qty - NEW.Qty
+        ) AS f
+        WHERE lots.lot_id = f.lot_id;
+    END
+    """)
+    for event, row in (("INSERT", "NEW"), ("UPDATE OF Qty, Exp", "NEW"), ("DELETE", "OLD")):
+        cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_lots_exp_{event.split()[0].lower()}
+        AFTER {event} ON lots
+        BEGIN
+            UPDATE medicines_info
+            SET Exp = (SELECT MIN(Exp) FROM lots WHERE Med_code = {row}.Med_code AND Qty > 0 AND Exp > '')
+            WHERE Med_code = {row}.Med_code;
+        END
+        """)
+    # stocul existent devine câte un lot per medicament
+    if not cur.execute("SELECT 1 FROM lots LIMIT 1").fetchone():
+        cur.execute("""
+            INSERT INTO lots (Med_code, batch, Qty, Mfg, Exp)
+            SELECT Med_code, 'initial', Qty, Mfg, Exp FROM medicines_info WHERE Qty > 0
+        """)
+
+
+MIGRATIONS = [
+    (1, "receipts header + sales.receipt_id", [_add_receipts]),
+    (2, "indexes for report/alert queries", [
+        "CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)",
+        "CREATE INDEX IF NOT EXISTS idx_sales_medicine ON sales(medicine_code)",
+        "CREATE INDEX IF NOT EXISTS idx_sales_receipt ON sales(receipt_id)",
+        "CREATE INDEX IF NOT EXISTS idx_medicines_exp ON medicines_info(Exp)",
+        "CREATE INDEX IF NOT EXISTS idx_medicines_qty ON medicines_info(Qty)",
+    ]),
+    # rapoartele pe zile citesc din rollup-uri, nu dintr-o coloană/index pe sales
+    (3, "sales_daily/sales_monthly rollups + triggers", [_add_rollups]),
+    (4, "medicines_fts full-text index + triggers", [_add_medicines_fts]),
+    (5, "alerts + alert_thresholds", [_add_alerts]),
+    (6, "reorder_points + alerts.reorder_qty", [_add_reorder_points]),
+    (7, "lots (FEFO) + triggers", [_add_lots]),
+    # paginarea keyset din Medicines: (sort, Med_code) din index, fără sortare temporară
+    (8, "medicines_info keyset indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_medicines_name ON medicines_info(Med_name, Med_code)",
+        "CREATE INDEX IF NOT EXISTS idx_medicines_price ON medicines_info(MRP, Med_code)",
+        "CREATE INDEX IF NOT EXISTS idx_medicines_exp_key ON medicines_info(COALESCE(Exp, ''), Med_code)",
+        # (Qty, Med_code) servește și filtrele low-stock ale vechiului idx_medicines_qty
+        "CREATE INDEX IF NOT EXISTS idx_medicines_qty_key ON medicines_info(Qty, Med_code)",
+        "DROP INDEX IF EXISTS idx_medicines_qty",
+    ]),
+]
+
+_initialized = set()
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn=None):
+    if conn is None:
+        with connection() as conn:
+            return migrate(conn)
+
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # alt proces poate fi aplicat-o între timp
+            if version <= schema_version(conn):
+                conn.rollback()
+                continue
+            cur = conn.cursor()
+            for step in steps:
+                if callable(step):
+                    step(cur)
+                else:
+                    cur.execute(step)
+            cur.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((version, description))
+    if applied:
+        notify_write(None)
+    return applied
+
+
+def query_plan(sql, params=None):
+    # detaliile din EXPLAIN QUERY PLAN (ex. "SEARCH sales USING INDEX idx_sales_date ...")
+    with connection() as conn:
+        return [r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or [])]
+
+
+def init_db():
+    # main() rulează la fiecare rerun Streamlit; schema se verifică o singură
+    # dată per proces și bază de date
+    if str(DB_PATH) in _initialized:
+        return
+    with connection() as conn:
+        cur = conn.cursor()
+
+        # STRICT: schema ta originală (DOAR 7 coloane)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS medicines_info (
+            Med_code TEXT PRIMARY KEY,
+            Med_name TEXT NOT NULL,
+            Qty INTEGER NOT NULL,
+            MRP REAL NOT NULL,
+            Mfg TEXT,
+            Exp TEXT,
+            Purpose TEXT
+        )
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL,
+            full_name TEXT,
+            email TEXT,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS sales (
+            sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            medicine_code TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            sale_price REAL NOT NULL,
+            total REAL NOT NULL,
+            sale_date TEXT DEFAULT (datetime('now')),
+            cashier_id INTEGER
+        )
+        """)
+
+        # utilizatori demo dacă nu există
+        cur.execute("SELECT COUNT(*) AS c FROM users")
+        if cur.fetchone()[0] == 0:
+            cur.executemany("""
+                INSERT INTO users (username, password, role, full_name, email)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                ("admin", "admin123", "admin", "Administrator", "admin@pharmacy.com"),
+                ("pharmacist", "pharma123", "pharmacist", "John Pharmacist", "pharma@pharmacy.com"),
+                ("cashier", "cash123", "cashier", "Alice Cashier", "cashier@pharmacy.com"),
+                ("manager", "manager123", "manager", "Bob Manager", "manager@pharmacy.com"),
+            ])
+
+        conn.commit()
+
+        migrate(conn)
+    _initialized.add(str(DB_PATH))
 
-    # utilizatori demo dacă nu există
-    cur.execute("SELECT COUNT(*) AS c FROM users")
-    if cur.fetchone()[0] == 0:
-        cur.executemany("""
-            INSERT INTO users (username, password, role, full_name, email)
-            VALUES (?, ?, ?, ?, ?)
-        """, [
-            ("admin", "admin123", "admin", "Administrator", "admin@pharmacy.com"),
-            ("pharmacist", "pharma123", "pharmacist", "John Pharmacist", "pharma@pharmacy.com"),
-            ("cashier", "cash123", "cashier", "Alice Cashier", "cashier@pharmacy.com"),
-            ("manager", "manager123", "manager", "Bob Manager", "manager@pharmacy.com"),
-        ])
-
-    conn.commit()
-    conn.close()
 
 def query_df(sql, params=None):
-    conn = get_conn()
-    df = pd.read_sql_query(sql, conn, params=params or [])
-    conn.close()
+    # timp SQL (execute + fetch) și timp de construire a DataFrame-ului, separat
+    started = time.perf_counter()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None      # tupluri simple: DataFrame-ul se construiește direct din ele
+        rows = cur.execute(sql, params or []).fetchall()
+        columns = [d[0] for d in cur.description or []]
+    fetched = time.perf_counter()
+    df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    perf.record("query", perf.sql_name(sql), (fetched - started) * 1000, len(rows),
+                df_ms=round((time.perf_counter() - fetched) * 1000, 3))
     return df
 
-def exec_sql(sql, params=None):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(sql, params or [])
-    conn.commit()
-    rc = cur.rowcount
-    conn.close()
-    return rc
+
+# Interogări punctuale fără pandas: tupluri / sqlite3.Row
+def query_rows(sql, params=None):
+    started = time.perf_counter()
+    with connection() as conn:
+        rows = conn.execute(sql, params or []).fetchall()
+    perf.record("query", perf.sql_name(sql), (time.perf_counter() - started) * 1000, len(rows))
+    return rows
+
+
+def query_one(sql, params=None):
+    started = time.perf_counter()
+    with connection() as conn:
+        cur = conn.execute(sql, params or [])
+        try:
+            row = cur.fetchone()
+        finally:
+            # eliberează statement-ul, altfel conexiunea din pool ține snapshot-ul de citire
+            cur.close()
+    perf.record("query", perf.sql_name(sql), (time.perf_counter() - started) * 1000, row is not None)
+    return row
+
+
+def query_scalar(sql, params=None, default=None):
+    row = query_one(sql, params)
+    return default if row is None or row[0] is None else row[0]
+
+
+def exec_sql(sql, params=None, codes=None):
+    started = time.perf_counter()
+    with connection() as conn:
+        try:
+            cur = conn.cursor()
+            cur.execute(sql, params or [])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    perf.record("write", perf.sql_name(sql), (time.perf_counter() - started) * 1000, cur.rowcount)
+    # codes: Med_code-urile modificate, dacă apelantul le știe
+    table = written_table(sql)
+    notify_write({table} if table else None, codes)
+    return cur.rowcount
@@ -0,0 +1,183 @@
+"""
+Export pe bucăți din SQLite în CSV, CSV comprimat (gzip) sau Parquet.
+Rândurile se citesc cu fetchmany și se scriu imediat, deci memoria folosită
+nu depinde de mărimea tabelului. Parquet necesită pyarrow (opțional).
+"""
+
+import csv
+import gzip
+import io
+import os
+import time
+from pathlib import Path
+
+from db_sqlite import connection
+
+CHUNK_SIZE = 10000
+
+# format -> (extensie, mime)
+FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+# ordinea urmează un index existent, ca SQLite să nu sorteze tot tabelul în memorie
+DATASETS = {
+    "medicines": {
+        "columns": [
+            ("Med_code", "str"), ("Med_name", "str"), ("Qty", "int"), ("MRP", "float"),
+            ("Mfg", "str"), ("Exp", "str"), ("Purpose", "str"),
+        ],
+        "select": "Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose",
+        "from": "medicines_info",
+        "order": "Med_code",
+        "date_column": None,
+    },
+    "sales": {
+        "columns": [
+            ("sale_id", "int"), ("sale_date", "str"), ("receipt_id", "int"), ("medicine_code", "str"),
+            ("Med_name", "str"), ("quantity", "int"), ("sale_price", "float"), ("total", "float"),
+            ("cashier_id", "int"),
+        ],
+        "select": "s.sale_id, s.sale_date, s.receipt_id, s.medicine_code, m.Med_name, "
+                  "s.quantity, s.sale_price, s.total, s.cashier_id",
+        "from": "sales s LEFT JOIN medicines_info m ON m.Med_code = s.medicine_code",
+        "order": "s.sale_date, s.sale_id",
+        "date_column": "s.sale_date",
+    },
+}
+
+
+def has_parquet():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    return [f for f in FORMATS if f != "parquet" or has_parquet()]
+
+
+def format_for(path):
+    name = str(path).lower()
+    for fmt, (ext, _) in sorted(FORMATS.items(), key=lambda f: -len(f[1][0])):
+        if name.endswith(ext):
+            return fmt
+    raise ValueError(f"Unknown export format for '{path}' (use .csv, .csv.gz or .parquet)")
+
+
+def export_query(dataset, start=None, end=None):
+    # start / end: 'YYYY-MM-DD', ambele incluse; filtre sargabile pe sale_date
+    spec = DATASETS[dataset]
+    conds, params = [], []
+    if (start or end) and not spec["date_column"]:
+        raise ValueError(f"Dataset '{dataset}' has no date filter")
+    if start:
+        conds.append(f"{spec['date_column']} >= ?")
+        params.append(str(start))
+    if end:
+        conds.append(f"{spec['date_column']} < date(?, '+1 day')")
+        params.append(str(end))
+    where = f"WHERE {' AND '.join(conds)}" if conds else ""
+    sql = f"SELECT {spec['select']} FROM {spec['from']} {where} ORDER BY {spec['order']}"
+    return sql, params
+
+
+def iter_chunks(sql, params=None, chunk_size=CHUNK_SIZE):
+    with connection() as conn:
+        cur = conn.execute(sql, params or [])
+        try:
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cur.close()
+
+
+def _write_csv(chunks, columns, out, progress):
+    writer = csv.writer(out)
+    writer.writerow([name for name, _ in columns])
+    rows = 0
+    for chunk in chunks:
+        writer.writerows(chunk)
+        rows += len(chunk)
+        if progress:
+            progress(rows)
+    return rows
+
+
+def _write_parquet(chunks, columns, out, progress):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    rows = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunks:
+            values = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values[i], type=schema.field(i).type) for i in range(len(columns))],
+                schema=schema,
+            ))
+            rows += len(chunk)
+            if progress:
+                progress(rows)
+    return rows
+
+
+def _write(fmt, chunks, columns, out, progress):
+    # out: fișier binar deschis
+    if fmt == "parquet":
+        if not has_parquet():
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+        return _write_parquet(chunks, columns, out, progress)
+
+    if fmt == "csv.gz":
+        out = gzip.GzipFile(fileobj=out, mode="wb")
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    try:
+        return _write_csv(chunks, columns, text, progress)
+    finally:
+        text.flush()
+        text.detach()
+        if fmt == "csv.gz":
+            out.close()     # scrie trailer-ul gzip, fișierul de dedesubt rămâne deschis
+
+
+def export(dataset, dest, fmt=None, start=None, end=None, chunk_size=CHUNK_SIZE, progress=None):
+    # dest: cale (scriere atomică prin fișier .tmp) sau fișier binar deschis
+    started = time.perf_counter()
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}' (choose from {', '.join(DATASETS)})")
+    fmt = fmt or format_for(dest)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+
+    sql, params = export_query(dataset, start, end)
+    chunks = iter_chunks(sql, params, chunk_size)
+    columns = DATASETS[dataset]["columns"]
+
+    try:
+        if hasattr(dest, "write"):
+            rows = _write(fmt, chunks, columns, dest, progress)
+        else:
+            dest = Path(dest)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(dest.name + ".tmp")
+            try:
+                with open(tmp, "wb") as out:
+                    rows = _write(fmt, chunks, columns, out, progress)
+                os.replace(tmp, dest)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+    finally:
+        chunks.close()      # eliberează cursorul și conexiunea și la întrerupere
+
+    return {"rows": rows, "format": fmt, "elapsed": time.perf_counter() - started}
@@ -0,0 +1,52 @@
+"""
+Indicatorii principali (dashboard + Financial Summary) calculați într-o
+singură interogare, fără DataFrame-uri.
+"""
+
+from typing import NamedTuple
+
+from db_sqlite import query_one
+from query_cache import cached
+
+KPI_SQL = """
+    SELECT
+        m.total_medicines,
+        m.low_stock,
+        (SELECT COUNT(DISTINCT Med_code) FROM lots
+         WHERE Qty > 0 AND Exp BETWEEN date('now') AND date('now','+30 day')) AS expiring_soon,
+        m.inventory_value,
+        (SELECT COALESCE(SUM(revenue), 0) FROM sales_daily WHERE date = date('now')) AS today_sales,
+        (SELECT COALESCE(SUM(revenue), 0) FROM sales_monthly) AS total_sales
+    FROM (
+        SELECT
+            COUNT(*) AS total_medicines,
+            COALESCE(SUM(Qty <= ?), 0) AS low_stock,
+            COALESCE(SUM(Qty * MRP), 0) AS inventory_value
+        FROM medicines_info
+    ) m
+"""
+
+
+class Kpis(NamedTuple):
+    total_medicines: int = 0
+    low_stock: int = 0
+    expiring_soon: int = 0
+    inventory_value: float = 0.0
+    today_sales: float = 0.0
+    total_sales: float = 0.0
+
+
+def _load(sql, params):
+    row = query_one(sql, params)
+    return Kpis(
+        int(row["total_medicines"]),
+        int(row["low_stock"]),
+        int(row["expiring_soon"]),
+        float(row["inventory_value"]),
+        float(row["today_sales"]),
+        float(row["total_sales"]),
+    )
+
+
+def get_kpis(low_stock_threshold, ttl=None):
+    return cached(KPI_SQL, [int(low_stock_threshold)], _load, ttl)
@@ -0,0 +1,352 @@
+"""
+Top produse vândute fără GROUP BY peste sales: contoare pe zile per
+medicament (cantitate, venit, vânzări, prețuri) ținute în memorie și
+actualizate incremental din vânzările noi (sale_id > ultimul văzut).
+Ferestrele uzuale (7 / 30 / 90 de zile și tot istoricul) au totalurile gata
+adunate și alunecă la schimbarea zilei (se scad zilele ieșite din fereastră);
+orice altă fereastră se adună din zilele ei. Corecțiile pe vânzări (UPDATE /
+DELETE, importuri) duc la o reîncărcare completă.
+"""
+
+import bisect
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from db_sqlite import connection, on_write, query_rows
+
+WINDOWS = (7, 30, 90)   # zilele din TOP_PERIODS (reports.py), ținute gata adunate
+RANKINGS = ("revenue", "quantity")
+TOLERANCE = 1e-6        # la verificare: sume de float adunate în altă ordine decât în SQLite
+
+# coloanele contoarelor
+QTY, REVENUE, TX, PRICE, PRICED = range(5)
+WIDTH = 5
+
+# ziua = primele 10 caractere din sale_date: exact limita din `sale_date >= date(...)`
+# și mult mai ieftin decât date(sale_date) pe fiecare rând
+LOAD_SQL = """
+    SELECT COALESCE(substr(sale_date, 1, 10), ''), medicine_code,
+           COALESCE(SUM(quantity), 0), COALESCE(SUM(total), 0), COUNT(*),
+           COALESCE(SUM(sale_price), 0), COUNT(sale_price)
+    FROM sales
+    WHERE sale_id <= ?
+    GROUP BY 1, medicine_code
+    ORDER BY 1
+"""
+
+DELTA_SQL = """
+    SELECT sale_id, COALESCE(substr(sale_date, 1, 10), ''), medicine_code,
+           COALESCE(quantity, 0), COALESCE(total, 0), 1,
+           COALESCE(sale_price, 0), sale_price IS NOT NULL
+    FROM sales
+    WHERE sale_id > ?
+    ORDER BY sale_id
+"""
+
+
+def window_start(days):
+    # aceeași limită ca date('now', '-N day') în SQL (UTC)
+    return str(datetime.now(timezone.utc).date() - timedelta(days=int(days)))
+
+
+class _Day:
+    # contoarele unei zile: coloane numpy (încărcarea) + un dict pentru vânzările noi
+    __slots__ = ("idx", "vals", "extra")
+
+    def __init__(self, idx, vals):
+        self.idx = idx
+        self.vals = vals
+        self.extra = {}
+
+    def add(self, i, row):
+        acc = self.extra.get(i)
+        if acc is None:
+            self.extra[i] = list(row)
+        else:
+            for k, v in enumerate(row):
+                acc[k] += v
+
+    def merge_into(self, dense, sign=1):
+        if len(self.idx):
+            dense[self.idx] += self.vals if sign > 0 else -self.vals
+        for i, row in self.extra.items():
+            dense[i] += row if sign > 0 else [-v for v in row]
+
+
+class TopSellers:
+    # Toate citirile trec prin sync(): o interogare pe sale_id > ultimul văzut
+    # (câteva rânduri sau niciunul, prin cheia primară), deci vânzările din
+    # alte procese se văd și fără notificare.
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = tuple(windows)
+        self._lock = threading.Lock()       # protejează _full / _thread (scurt: îl iau și scrierile)
+        self._sync_lock = threading.Lock()  # contoarele
+        self._full = True
+        self._thread = None
+        self._reset()
+        self.last_error = None
+        self._stats = {"loads": 0, "deltas": 0, "sales": 0, "slides": 0, "merges": 0, "last_load_ms": 0.0}
+
+    def _reset(self):
+        self._last_id = 0
+        self._codes = []                # index -> Med_code
+        self._index = {}                # Med_code -> index
+        self._days = {}                 # 'YYYY-MM-DD' ('' = fără dată) -> _Day
+        self._day_keys = []             # cheile din _days, sortate
+        self._all = np.zeros((0, WIDTH))
+        self._window = {}               # zile -> [prima zi, totaluri]
+
+    def invalidate(self, tables=None, codes=None):
+        # vânzările noi (cu coduri) vin prin delta; restul scrierilor pe sales = reîncărcare
+        if tables is None or ("sales" in tables and not codes):
+            with self._lock:
+                self._full = True
+
+    # ---- contoare
+    def _slot(self, code):
+        i = self._index.get(code)
+        if i is None:
+            i = self._index[code] = len(self._codes)
+            self._codes.append(code)
+            if i >= len(self._all):
+                self._grow(max(64, 2 * len(self._all)))
+        return i
+
+    def _grow(self, size):
+        def grown(dense):
+            out = np.zeros((size, WIDTH))
+            out[:len(dense)] = dense
+            return out
+        self._all = grown(self._all)
+        for w in self._window.values():
+            w[1] = grown(w[1])
+
+    def _merge(self, start, dense=None):
+        # totalurile zilelor >= start (fereastra e deschisă la dreapta, ca în SQL)
+        dense = np.zeros((len(self._all), WIDTH)) if dense is None else dense
+        for key in self._day_keys[bisect.bisect_left(self._day_keys, start):]:
+            self._days[key].merge_into(dense)
+        return dense
+
+    def _load(self, conn):
+        started = time.perf_counter()
+        self._reset()
+        last = conn.execute("SELECT COALESCE(MAX(sale_id), 0) FROM sales").fetchone()[0]
+        cur = conn.cursor()
+        cur.row_factory = None
+        day, idx, vals = None, [], []
+
+        def close():
+            if idx:
+                self._days[day] = _Day(np.array(idx, dtype=np.int64), np.array(vals, dtype=float))
+                self._day_keys.append(day)
+
+        for row in cur.execute(LOAD_SQL, [last]):
+            if row[0] != day:
+                close()
+                day, idx, vals = row[0], [], []
+            idx.append(self._slot(row[1]))
+            vals.append(row[2:])
+        close()
+        self._day_keys.sort()
+        self._last_id = last
+
+        self._all = self._merge("", np.zeros((len(self._all), WIDTH)))
+        for days in self.windows:
+            start = window_start(days)
+            self._window[days] = [start, self._merge(start)]
+        self._stats["loads"] += 1
+        self._stats["last_load_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    def _apply(self, conn):
+        cur = conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(DELTA_SQL, [self._last_id]).fetchall()
+        if not rows:
+            return
+        for sale_id, day, code, *row in rows:
+            i = self._slot(code)
+            bucket = self._days.get(day)
+            if bucket is None:
+                bucket = self._days[day] = _Day(np.zeros(0, dtype=np.int64), np.zeros((0, WIDTH)))
+                bisect.insort(self._day_keys, day)
+            bucket.add(i, row)
+            self._all[i] += row
+            for start, dense in self._window.values():
+                if day >= start:
+                    dense[i] += row
+        self._last_id = rows[-1][0]
+        self._stats["deltas"] += 1
+        self._stats["sales"] += len(rows)
+
+    def _slide(self):
+        # la schimbarea zilei: zilele ieșite din fereastră se scad
+        for days, w in self._window.items():
+            start = window_start(days)
+            if start == w[0]:
+                continue
+            if start > w[0]:
+                lo = bisect.bisect_left(self._day_keys, w[0])
+                hi = bisect.bisect_left(self._day_keys, start)
+                for key in self._day_keys[lo:hi]:
+                    self._days[key].merge_into(w[1], -1)
+            else:
+                w[1] = self._merge(start)
+            w[0] = start
+            self._stats["slides"] += 1
+
+    def sync(self):
+        with self._sync_lock:
+            with self._lock:
+                full, self._full = self._full, False
+            with connection() as conn:
+                if full:
+                    try:
+                        self._load(conn)
+                    except Exception:
+                        with self._lock:
+                            self._full = True
+                        raise
+                else:
+                    self._apply(conn)
+            self._slide()
+
+    def _warm(self):
+        try:
+            self.sync()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+
+    def start(self):
+        # încărcarea inițială în fundal, ca primul raport să nu o aștepte; o dată per proces
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._warm, name="top-sellers", daemon=True)
+            self._thread.start()
+        return True
+
+    @property
+    def active(self):
+        # contoarele sunt (sau vor fi) încărcate în procesul ăsta
+        return self._thread is not None or self._stats["loads"] > 0
+
+    # ---- citire
+    def totals(self, days=None):
+        # (coduri, totaluri) pentru fereastră; days=None -> tot istoricul
+        self.sync()
+        with self._sync_lock:
+            n = len(self._codes)
+            if not days:
+                dense = self._all[:n].copy()
+            elif int(days) in self._window:
+                dense = self._window[int(days)][1][:n].copy()
+            else:
+                dense = self._merge(window_start(days))[:n]
+                self._stats["merges"] += 1
+            return list(self._codes), dense
+
+    def top(self, limit=10, days=None, by="revenue"):
+        # [(Med_code, Med_name, vânzări, cantitate, venit, preț mediu)], ca interogarea din top_sql
+        if by not in RANKINGS:
+            raise ValueError(f"Unknown ranking '{by}' (choose from {', '.join(RANKINGS)})")
+        codes, dense = self.totals(days)
+        column = dense[:, REVENUE if by == "revenue" else QTY]
+        sold = np.flatnonzero(dense[:, TX] > 0)
+        order = sold[np.argsort(-column[sold], kind="stable")]
+
+        # doar medicamentele care mai există (JOIN cu medicines_info în SQL)
+        out, pos, limit = [], 0, int(limit)
+        while len(out) < limit and pos < len(order):
+            chunk = order[pos:pos + 2 * limit]
+            pos += len(chunk)
+            marks = ",".join("?" * len(chunk))
+            names = {r["Med_code"]: r["Med_name"] for r in query_rows(
+                f"SELECT Med_code, Med_name FROM medicines_info WHERE Med_code IN ({marks})",
+                [codes[i] for i in chunk])}
+            for i in chunk:
+                if codes[i] in names and len(out) < limit:
+                    qty, revenue, tx, price, priced = dense[i]
+                    out.append((codes[i], names[codes[i]], int(tx), int(qty), float(revenue),
+                                float(price / priced) if priced else None))
+        return out
+
+    def stats(self):
+        with self._sync_lock:
+            s = dict(self._stats)
+            s["medicines"] = len(self._codes)
+            s["days"] = len(self._days)
+            s["last_sale_id"] = self._last_id
+        return s
+
+
+top_sellers = TopSellers()
+on_write(top_sellers.invalidate)
+
+COLUMNS = ["Med_name", "times_sold", "total_quantity", "total_revenue", "avg_price"]
+
+
+def top_products(limit=10, days=None, by="revenue"):
+    # DataFrame-ul raportului Top Selling Products. Contoarele doar în procesele
+    # care le țin (aplicația web pornește top_sellers.start()); un apel izolat
+    # (CLI, cron) ar plăti încărcarea completă pentru un singur raport.
+    rows = top_sellers.top(limit, days, by) if top_sellers.active else top_sql(limit, days, by)
+    return pd.DataFrame([r[1:] for r in rows], columns=COLUMNS)
+
+
+def top_sql(limit=10, days=None, by="revenue"):
+    # calculul clasic peste sales (referința pentru verify)
+    where, params = "", []
+    if days:
+        where = "WHERE s.sale_date >= date('now', ?)"
+        params.append(f"-{int(days)} day")
+    order = "total_revenue" if by == "revenue" else "total_quantity"
+    rows = query_rows(f"""
+        SELECT
+            m.Med_code,
+            m.Med_name,
+            COUNT(DISTINCT s.sale_id) as times_sold,
+            SUM(s.quantity) as total_quantity,
+            SUM(s.total) as total_revenue,
+            AVG(s.sale_price) as avg_price
+        FROM sales s
+        JOIN medicines_info m ON s.medicine_code = m.Med_code
+        {where}
+        GROUP BY m.Med_code, m.Med_name
+        ORDER BY {order} DESC
+        LIMIT ?
+    """, params + [int(limit)])
+    return [tuple(r) for r in rows]
+
+
+def _close(a, b, tolerance=TOLERANCE):
+    if a is None or b is None:
+        return a is b
+    return math.isclose(a, b, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def verify(limit=10, days=None, by="revenue", tolerance=TOLERANCE):
+    # diferențele față de SQL (listă goală = identic); la egalitate de scor ordinea poate diferi
+    got, want = top_sellers.top(limit, days, by), top_sql(limit, days, by)
+    key = 4 if by == "revenue" else 3
+    problems = []
+    if len(got) != len(want):
+        problems.append(f"{len(got)} rows, SQL has {len(want)}")
+    mine = {r[0]: r for r in got}
+    for pos, row in enumerate(want):
+        other = mine.get(row[0])
+        if other is None:
+            # alt medicament cu același scor pe ultimele locuri
+            if pos >= len(got) or not _close(got[pos][key], row[key], tolerance):
+                problems.append(f"#{pos + 1} {row[0]}: missing")
+            continue
+        if other[2:4] != row[2:4] or not all(_close(a, b, tolerance) for a, b in zip(other[4:], row[4:])):
+            problems.append(f"#{pos + 1} {row[0]}: {other[2:]} != SQL {row[2:]}")
+    return problems
@@ -0,0 +1,111 @@
+"""
+Loturi de medicamente (FEFO): intrări de stoc pe lot, coada de expirare și
+reconcilierea cu medicines_info.Qty. Scăderea la vânzare se face prin
+triggerul trg_lots_fefo (vezi db_sqlite), în tranzacția vânzării.
+"""
+
+from db_sqlite import connection, notify_write, query_rows
+from query_cache import cached_df
+
+RECEIVE_SQL = """
+    INSERT INTO lots (Med_code, batch, Qty, Mfg, Exp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+LOT_COLUMNS = "l.lot_id, l.Med_code, m.Med_name, l.batch, l.Qty, l.Mfg, l.Exp, l.received_at"
+
+
+def add_medicine(code, name, qty, mrp, mfg=None, exp=None, purpose="", batch=None):
+    # medicament nou + primul lot, într-o tranzacție
+    with connection() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""
+                INSERT INTO medicines_info (Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [code, name, int(qty), float(mrp), mfg, exp, purpose])
+            if int(qty) > 0:
+                conn.execute(RECEIVE_SQL, [code, batch, int(qty), mfg, exp])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    notify_write({"medicines_info", "lots"}, {code})
+
+
+def receive(code, qty, exp, mfg=None, batch=None):
+    # livrare pentru un medicament existent: stocul total crește, lotul nou
+    # își păstrează expirarea (fără să o suprascrie pe a stocului vechi)
+    qty = int(qty)
+    if qty <= 0:
+        raise ValueError("Quantity must be greater than 0!")
+    with connection() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cur = conn.execute("UPDATE medicines_info SET Qty = Qty + ? WHERE Med_code = ?", [qty, code])
+            if cur.rowcount == 0:
+                raise ValueError("Medicine not found!")
+            conn.execute(RECEIVE_SQL, [code, batch, qty, mfg, exp])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    notify_write({"medicines_info", "lots"}, {code})
+
+
+def medicine_lots(code, ttl=None):
+    # loturile cu stoc, în ordinea în care vor fi vândute
+    return cached_df(f"""
+        SELECT {LOT_COLUMNS}
+        FROM lots l
+        JOIN medicines_info m ON m.Med_code = l.Med_code
+        WHERE l.Med_code = ? AND l.Qty > 0
+        ORDER BY COALESCE(l.Exp, '') = '', l.Exp, l.lot_id
+    """, [code], ttl)
+
+
+def expiry_queue(days=30, include_expired=True, ttl=None):
+    # loturile cu stoc care expiră în următoarele `days` zile (prin idx_lots_exp)
+    lower = "l.Exp > ''" if include_expired else "l.Exp >= date('now')"
+    return cached_df(f"""
+        SELECT {LOT_COLUMNS},
+               CAST(julianday(l.Exp) - julianday(date('now')) AS INTEGER) AS days_left,
+               l.Qty * m.MRP AS value
+        FROM lots l
+        JOIN medicines_info m ON m.Med_code = l.Med_code
+        WHERE l.Qty > 0 AND {lower} AND l.Exp <= date('now', ?)
+        ORDER BY l.Exp, l.lot_id
+    """, [f"+{int(days)} day"], ttl)
+
+
+def reconcile_lots():
+    # aliniază SUM(lots.Qty) cu medicines_info.Qty (ex. după corecții făcute
+    # direct în baza de date): lipsa devine un lot nou cu Exp-ul curent,
+    # surplusul se scoate FEFO, ca la o vânzare
+    rows = query_rows("""
+        SELECT m.Med_code, m.Qty, m.Mfg, m.Exp, COALESCE(SUM(l.Qty), 0) AS in_lots
+        FROM medicines_info m
+        LEFT JOIN lots l ON l.Med_code = m.Med_code AND l.Qty > 0
+        GROUP BY m.Med_code
+        HAVING m.Qty != in_lots
+    """)
+    if not rows:
+        return 0
+
+    missing = [(r["Med_code"], "reconciled", r["Qty"] - r["in_lots"], r["Mfg"], r["Exp"])
+               for r in rows if r["Qty"] > r["in_lots"]]
+    extra = [(r["in_lots"] - max(r["Qty"], 0), r["Med_code"]) for r in rows if r["Qty"] < r["in_lots"]]
+    with connection() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(RECEIVE_SQL, missing)
+            # creștere + scădere cu aceeași cantitate -> triggerul FEFO consumă surplusul
+            for qty, code in extra:
+                conn.execute("UPDATE medicines_info SET Qty = Qty + ? WHERE Med_code = ?", [qty, code])
+                conn.execute("UPDATE medicines_info SET Qty = Qty - ? WHERE Med_code = ?", [qty, code])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    notify_write({"lots"}, {r["Med_code"] for r in rows})
+    return len(rows)
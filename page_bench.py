@@ -0,0 +1,167 @@
+"""
+Benchmark pe pagini întregi: pharmacy_web rulat headless prin AppTest din
+Streamlit, logat pe rând cu fiecare rol din Config.ROLES și trecut prin
+toate intrările din meniul rolului; pornirea la rece (importuri + prima
+pagină) se măsoară separat, în procese noi. Pentru fiecare rerun se măsoară timpul
+total, interogările făcute (din perf) și memoria maximă alocată (tracemalloc,
+într-o rulare separată, ca să nu încetinească măsurătorile de timp).
+Rezultatele au forma celor din bench.py (section = rol, name = pagina), deci
+se salvează și se compară cu aceleași funcții.
+
+    python pharmacy_cli.py --db bench/medium.db bench-pages -o bench/pages.json
+"""
+
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import db_sqlite
+import perf
+from bench import result_set
+from db_sqlite import init_db, query_one
+from query_cache import invalidate
+
+APP = Path(__file__).parent / "pharmacy_web.py"
+REPEAT = 3
+COLD_STARTS = 3         # procese noi per rol pentru pornirea la rece
+TIMEOUT = 120           # secunde per rerun (AppTest implicit: 3)
+
+# pornirea la rece: primul run al aplicației (importuri + prima pagină a
+# rolului) într-un interpretor nou; streamlit și baza sunt deja încărcate
+_COLD_START = """
+import json, sys, time
+import db_sqlite, perf
+from page_bench import _login, _quiet, APP
+from streamlit.testing.v1 import AppTest
+db_sqlite.configure(sys.argv[2])
+_quiet()
+at = AppTest.from_file(str(APP), default_timeout=float(sys.argv[3]))
+_login(at, sys.argv[1])
+started = time.perf_counter()
+at.run()
+print(json.dumps({"ms": (time.perf_counter() - started) * 1000,
+                  "queries": perf.recorder.totals().get("query", (0,))[0],
+                  "exceptions": [e.message for e in at.exception]}))
+"""
+
+
+def _login(at, role):
+    # direct în session_state, ca după un login reușit (fără formularul din sidebar)
+    user = query_one("SELECT id, full_name FROM users WHERE role = ? ORDER BY id LIMIT 1", [role])
+    at.session_state["logged_in"] = True
+    at.session_state["user_id"] = int(user["id"]) if user else 0
+    at.session_state["user_name"] = user["full_name"] if user else role.title()
+    at.session_state["user_role"] = role
+
+
+def _menu(at):
+    return next(s for s in at.sidebar.selectbox if s.label == "Go to")
+
+
+def _rerun(at):
+    # un rerun: timp total, interogări și timpul lor (din contoarele perf)
+    before = perf.recorder.totals().get("query", (0, 0.0))
+    started = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - started) * 1000
+    after = perf.recorder.totals().get("query", (0, 0.0))
+    return ms, after[0] - before[0], round(after[1] - before[1], 3)
+
+
+def _peak_kb(at):
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        at.run()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _quiet():
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+
+
+def _timings(times):
+    times = sorted(times)
+    return {
+        "repeat": len(times),
+        "min_ms": round(times[0], 3),
+        "p50_ms": round(perf.percentile(times, 0.50), 3),
+        "p95_ms": round(perf.percentile(times, 0.95), 3),
+        "max_ms": round(times[-1], 3),
+    }
+
+
+def cold_start(role, runs=COLD_STARTS, timeout=TIMEOUT):
+    runs_out = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_START, role, str(db_sqlite.DB_PATH), str(timeout)],
+            cwd=APP.parent, capture_output=True, text=True, check=True,
+        )
+        runs_out.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "section": role,
+        "name": "cold start",
+        **_timings([r["ms"] for r in runs_out]),
+        "first_ms": round(runs_out[0]["ms"], 3),
+        "first_queries": runs_out[0]["queries"],
+        "queries": runs_out[-1]["queries"],
+        "query_ms": None,
+        "peak_kb": None,
+        "exceptions": runs_out[-1]["exceptions"],
+    }
+
+
+def bench_role(role, repeat=REPEAT, memory=True, timeout=TIMEOUT, progress=None):
+    from streamlit.testing.v1 import AppTest
+
+    _quiet()
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    _login(at, role)
+    at.run()
+    results = []
+    for option in _menu(at).options:
+        # navigarea: primul rerun pe pagină, cu cache-ul de interogări golit
+        # (costul "la rece"), apoi reruns ca la o interacțiune pe aceeași pagină
+        _menu(at).select(option)
+        invalidate()
+        first_ms, first_queries, _ = _rerun(at)
+        times, queries, query_ms = [], 0, 0.0
+        for _ in range(repeat):
+            ms, queries, query_ms = _rerun(at)
+            times.append(ms)
+        result = {
+            "section": role,
+            "name": option.split(" ", 1)[-1],
+            **_timings(times),
+            "first_ms": round(first_ms, 3),
+            "first_queries": first_queries,
+            "queries": queries,
+            "query_ms": query_ms,
+            "peak_kb": _peak_kb(at) if memory else None,
+            "exceptions": [e.message for e in at.exception],
+        }
+        results.append(result)
+        if progress:
+            progress(result)
+    return results
+
+
+def run(roles=None, repeat=REPEAT, memory=True, cold_starts=COLD_STARTS, timeout=TIMEOUT, progress=None):
+    from views.common import Config
+
+    init_db()
+    results = []
+    for role in roles or Config.ROLES:
+        if cold_starts:
+            results.append(cold_start(role, cold_starts, timeout))
+            if progress:
+                progress(results[-1])
+        results += bench_role(role, repeat, memory, timeout, progress)
+    return result_set(results)
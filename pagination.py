@@ -0,0 +1,52 @@
+"""
+Paginare keyset (server-side) pentru liste mari: sortarea și limita se fac
+în SQL, iar pagina următoare pornește de la cheia ultimului rând afișat
+(fără OFFSET, deci costul nu crește cu numărul paginii).
+"""
+
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from query_cache import cached_df
+
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+class Page(NamedTuple):
+    rows: pd.DataFrame
+    next_cursor: Optional[list]
+
+
+def _py(value):
+    # scalar numpy -> tip Python, ca să poată fi legat ca parametru sqlite3
+    return value.item() if hasattr(value, "item") else value
+
+
+def keyset_page(columns, from_sql, sort, key, where="", params=None,
+                descending=False, after=None, page_size=50, ttl=None):
+    # sort/key sunt expresii SQL din liste fixe (nu input de la utilizator);
+    # cursorul e perechea (sort, key) a ultimului rând din pagina anterioară
+    conds = [where] if where else []
+    args = list(params or [])
+    if after is not None:
+        conds.append(f"({sort}, {key}) {'<' if descending else '>'} (?, ?)")
+        args += list(after)
+
+    direction = "DESC" if descending else "ASC"
+    # sortare după cheie (ex. "Code"): un termen dublat în ORDER BY cere o sortare temporară
+    order = f"{sort} {direction}" if sort == key else f"{sort} {direction}, {key} {direction}"
+    sql = f"""
+        SELECT {columns}, {sort} AS _sort, {key} AS _key
+        FROM {from_sql}
+        {"WHERE " + " AND ".join(conds) if conds else ""}
+        ORDER BY {order}
+        LIMIT ?
+    """
+    df = cached_df(sql, args + [int(page_size) + 1], ttl)
+
+    next_cursor = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        next_cursor = [_py(df["_sort"].iloc[-1]), _py(df["_key"].iloc[-1])]
+    return Page(df.drop(columns=["_sort", "_key"]), next_cursor)
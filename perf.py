@@ -0,0 +1,205 @@
+"""
+Instrumentare pentru căile fierbinți: fiecare interogare (timp SQL, rânduri,
+timp de construire a DataFrame-ului), fiecare apel DatabaseHelper și fiecare
+randare de secțiune / rerun Streamlit ajung ca evenimente într-un buffer
+circular (partajat de toate sesiunile). Opțional, evenimentele se scriu și
+într-un fișier JSON-lines.
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+BUFFER_SIZE = 5000
+NAME_MAX = 160
+
+_WS_RE = re.compile(r"\s+")
+
+
+class PerfRecorder:
+    def __init__(self, size=BUFFER_SIZE):
+        self._events = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._local = threading.local()     # randarea curentă (totaluri per render)
+        self._log = None
+        self._totals = {}                   # kind -> [evenimente, ms]; nu se pierd odată cu buffer-ul
+        self.enabled = True
+
+    def record(self, kind, name, ms, rows=None, **extra):
+        if not self.enabled:
+            return
+        event = {"ts": time.time(), "kind": kind, "name": name, "ms": round(ms, 3)}
+        if rows is not None:
+            event["rows"] = int(rows)
+        event.update(extra)
+
+        frame = getattr(self._local, "render", None)
+        if frame is not None and kind == "query":
+            frame["queries"] += 1
+            frame["query_ms"] += ms
+
+        with self._lock:
+            self._events.append(event)
+            total = self._totals.setdefault(kind, [0, 0.0])
+            total[0] += 1
+            total[1] += ms
+            if self._log is not None:
+                self._log.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    @contextmanager
+    def timer(self, kind, name, **extra):
+        # pentru "render" / "rerun": adună și interogările făcute în interior
+        outer = getattr(self._local, "render", None)
+        frame = {"queries": 0, "query_ms": 0.0}
+        if kind in ("render", "rerun"):
+            self._local.render = frame
+        started = time.perf_counter()
+        error = None
+        try:
+            yield frame
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            if kind in ("render", "rerun"):
+                self._local.render = outer
+                if outer is not None:
+                    outer["queries"] += frame["queries"]
+                    outer["query_ms"] += frame["query_ms"]
+                extra = dict(extra, queries=frame["queries"], query_ms=round(frame["query_ms"], 3))
+            # RerunException / StopException din Streamlit nu sunt erori reale
+            if error and not error.endswith(("RerunException", "StopException")):
+                extra["error"] = error
+            self.record(kind, name, ms, **extra)
+
+    def events(self, kind=None):
+        with self._lock:
+            events = list(self._events)
+        return [e for e in events if e["kind"] == kind] if kind else events
+
+    def totals(self):
+        # contoare cumulate de la pornire (diferența a două citiri = ce s-a întâmplat între ele)
+        with self._lock:
+            return {kind: tuple(t) for kind, t in self._totals.items()}
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def start_log(self, path):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+            self._log = open(path, "a", encoding="utf-8", buffering=1)
+
+    def stop_log(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    @property
+    def log_path(self):
+        return self._log.name if self._log is not None else None
+
+
+recorder = PerfRecorder()
+
+
+def sql_name(sql):
+    # SQL pe un singur rând, scurtat (cheia de grupare în rapoarte)
+    name = _WS_RE.sub(" ", sql).strip()
+    return name if len(name) <= NAME_MAX else name[:NAME_MAX - 1] + "…"
+
+
+def record(kind, name, ms, rows=None, **extra):
+    recorder.record(kind, name, ms, rows, **extra)
+
+
+def timer(kind, name, **extra):
+    return recorder.timer(kind, name, **extra)
+
+
+def row_count(result):
+    # DataFrame / listă -> numărul de rânduri; restul (scalari, NamedTuple) -> None
+    if hasattr(result, "shape"):
+        return result.shape[0]
+    return len(result) if isinstance(result, list) else None
+
+
+def call(kind, name, fn, *args, **kwargs):
+    # rulează fn și înregistrează durata, rândurile rezultatului și eroarea
+    started = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        recorder.record(kind, name, (time.perf_counter() - started) * 1000, error=type(e).__name__)
+        raise
+    recorder.record(kind, name, (time.perf_counter() - started) * 1000, row_count(result))
+    return result
+
+
+def instrumented(kind, name=None):
+    # decorator: @instrumented("render") în jurul secțiunilor display_*
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with recorder.timer(kind, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def percentile(values, q):
+    # values sortate; nearest-rank
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def summary(kind=None):
+    # un rând per (kind, name): count, p50/p95/p99/max, total, rânduri medii
+    groups = {}
+    for e in recorder.events(kind):
+        groups.setdefault((e["kind"], e["name"]), []).append(e)
+
+    out = []
+    for (k, name), events in groups.items():
+        ms = sorted(e["ms"] for e in events)
+        rows = [e["rows"] for e in events if "rows" in e]
+        out.append({
+            "kind": k,
+            "name": name,
+            "count": len(ms),
+            "p50_ms": percentile(ms, 0.50),
+            "p95_ms": percentile(ms, 0.95),
+            "p99_ms": percentile(ms, 0.99),
+            "max_ms": ms[-1],
+            "total_ms": round(sum(ms), 3),
+            "avg_rows": round(sum(rows) / len(rows), 1) if rows else None,
+            "errors": sum(1 for e in events if "error" in e),
+        })
+    out.sort(key=lambda r: r["total_ms"], reverse=True)
+    return out
+
+
+def slowest(n=20, kind=None):
+    return sorted(recorder.events(kind), key=lambda e: e["ms"], reverse=True)[:n]
+
+
+def to_jsonl(events=None):
+    events = recorder.events() if events is None else events
+    return "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+
+
+def event_time(event):
+    return datetime.fromtimestamp(event["ts"]).strftime("%H:%M:%S.%f")[:-3]
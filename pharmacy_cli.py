@@ -0,0 +1,455 @@
+"""
+PHARMACY MANAGEMENT SYSTEM - comenzi de linie (fără Streamlit)
+
+    python pharmacy_cli.py migrate
+    python pharmacy_cli.py rebuild-rollups
+    python pharmacy_cli.py rebuild-search
+    python pharmacy_cli.py refresh-alerts
+    python pharmacy_cli.py reconcile-lots
+    python pharmacy_cli.py compute-reorder [--days 90] [--lead-time 7] [--review-days 14]
+    python pharmacy_cli.py import-medicines livrare.csv [--rejects respinse.csv]
+    python pharmacy_cli.py export sales dumps/sales_{date}.csv.gz [--from 2024-01-01] [--to 2024-01-31]
+    python pharmacy_cli.py report daily --date 2024-01-31 --format html -o reports/{report}_{date}.html
+    python pharmacy_cli.py report all --format json -o reports/{report}_{date}.json
+    python pharmacy_cli.py check-top [--limit 10]
+    python pharmacy_cli.py bench-lookups [-n 2000]
+    python pharmacy_cli.py bench-sales [--tills 8] [--sales 250] [--synchronous FULL]
+    python pharmacy_cli.py --db bench/medium.db generate-data --scale medium [--seed 42]
+    python pharmacy_cli.py --db bench/medium.db bench -o bench/medium.json [--baseline bench/old.json]
+    python pharmacy_cli.py --db bench/medium.db bench-pages [--role cashier] -o bench/pages.json
+"""
+
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import alerts
+import bench
+import bulk_import
+import datagen
+import db_sqlite
+import export
+import leaderboard
+import lots
+import page_bench
+import reorder
+import reports
+import sales
+import write_queue
+
+
+def cmd_migrate(args):
+    db_sqlite.init_db()
+    with db_sqlite.connection() as conn:
+        print(f"Schema version: {db_sqlite.schema_version(conn)}")
+
+
+def cmd_rebuild_rollups(args):
+    db_sqlite.init_db()
+    rows = db_sqlite.rebuild_rollups()
+    print(f"Rollups rebuilt: {rows} daily rows")
+
+
+def cmd_rebuild_search(args):
+    db_sqlite.init_db()
+    if db_sqlite.rebuild_search_index():
+        print("Search index rebuilt")
+    else:
+        print("FTS5 not available in this SQLite build; search uses LIKE")
+
+
+def cmd_refresh_alerts(args):
+    db_sqlite.init_db()
+    start = time.perf_counter()
+    total = alerts.alert_engine.refresh()
+    print(f"Alerts refreshed: {total} active in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def cmd_reconcile_lots(args):
+    db_sqlite.init_db()
+    fixed = lots.reconcile_lots()
+    print(f"Lots reconciled: {fixed} medicines adjusted")
+
+
+def cmd_compute_reorder(args):
+    db_sqlite.init_db()
+    result = reorder.compute_reorder_points(args.days, args.lead_time, args.review_days, args.z)
+    print(f"Reorder points: {result['medicines']:,} medicines in {result['elapsed']:.2f}s")
+    alerts.alert_engine.refresh()
+
+
+def cmd_import_medicines(args):
+    db_sqlite.init_db()
+
+    def progress(rows, fraction):
+        print(f"\r{rows:,} rows read", end="", flush=True)
+
+    result = bulk_import.import_medicines(
+        args.path, chunk_size=args.chunk_size, progress=progress, rejects_path=args.rejects
+    )
+    print()
+    print(f"Imported: {result['imported']:,} | Rejected: {result['rejected']:,} | "
+          f"Time: {result['elapsed']:.1f}s")
+    if result["rejected"] and not args.rejects:
+        for r in result["rejects"][:20]:
+            print(f"  row {r['row']}: {r['Med_code']} - {r['reason']}")
+
+
+def cmd_export(args):
+    # {date} în cale -> data curentă, pentru dump-uri nocturne din cron
+    db_sqlite.init_db()
+    path = args.path.replace("{date}", date.today().isoformat())
+
+    def progress(rows):
+        print(f"\r{rows:,} rows written", end="", flush=True)
+
+    result = export.export(
+        args.dataset, path, fmt=args.format, start=args.date_from, end=args.date_to,
+        chunk_size=args.chunk_size, progress=progress,
+    )
+    print()
+    print(f"Exported {result['rows']:,} rows to {path} ({result['format']}) in {result['elapsed']:.1f}s")
+
+
+def cmd_report(args):
+    # {report} / {date} în calea de ieșire; fără -o, rapoartele se scriu la stdout
+    db_sqlite.init_db()
+    names = list(reports.REPORTS) if "all" in args.names else args.names
+    if args.output and len(names) > 1 and "{report}" not in args.output:
+        raise SystemExit("--output needs a '{report}' placeholder when writing several reports")
+
+    params = {
+        "daily": {"day": args.date},
+        "monthly": {"month": args.month},
+        "top": {"days": args.days, "limit": args.limit, "by": args.top_by},
+        "expiry": {"days": args.expiry_days},
+        "financial": {"low_stock_threshold": args.low_stock_threshold},
+    }
+    for name in names:
+        report = reports.run_report(name, **params.get(name, {}))
+        started = time.perf_counter()
+        text = reports.render(report, args.format)
+        rendered = time.perf_counter() - started
+
+        if args.output:
+            path = Path(args.output.replace("{report}", name)
+                        .replace("{date}", report.params.get("date") or date.today().isoformat()))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+            where = str(path)
+        else:
+            sys.stdout.write(text)
+            where = "stdout"
+        # timpii merg pe stderr, ca stdout să rămână doar raportul
+        print(f"{name:<10} query {report.elapsed * 1000:8.1f} ms | render {rendered * 1000:6.1f} ms "
+              f"| {len(report.table):,} rows -> {where}", file=sys.stderr)
+
+
+def cmd_check_top(args):
+    # top produse din contoarele în memorie vs. GROUP BY peste sales, pe fiecare perioadă
+    db_sqlite.init_db()
+    started = time.perf_counter()
+    leaderboard.top_sellers.sync()
+    print(f"counters loaded in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+
+    failed = 0
+    for label, days in reports.TOP_PERIODS.items():
+        for by in leaderboard.RANKINGS:
+            started = time.perf_counter()
+            leaderboard.top_sellers.top(args.limit, days, by)
+            mem_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            leaderboard.top_sql(args.limit, days, by)
+            sql_ms = (time.perf_counter() - started) * 1000
+            problems = leaderboard.verify(args.limit, days, by)
+            failed += bool(problems)
+            print(f"{label:<14} {by:<9} counters {mem_ms:7.2f} ms | SQL {sql_ms:8.2f} ms | "
+                  f"{'MISMATCH' if problems else 'ok'}")
+            for problem in problems:
+                print(f"    {problem}")
+    if failed:
+        sys.exit(1)
+
+
+def cmd_bench_lookups(args):
+    # cost per apel: DataFrame (query_df) vs. rânduri simple (query_one / query_scalar)
+    db_sqlite.init_db()
+    sql = "SELECT id, full_name, role FROM users WHERE username = ? LIMIT 1"
+    cases = [
+        ("query_df", lambda: db_sqlite.query_df(sql, ["admin"])),
+        ("query_one", lambda: db_sqlite.query_one(sql, ["admin"])),
+        ("query_scalar", lambda: db_sqlite.query_scalar("SELECT COUNT(*) FROM medicines_info")),
+        ("query_df COUNT(*)", lambda: db_sqlite.query_df("SELECT COUNT(*) AS c FROM medicines_info")),
+    ]
+    for name, fn in cases:
+        fn()
+        start = time.perf_counter()
+        for _ in range(args.n):
+            fn()
+        per_call = (time.perf_counter() - start) / args.n * 1e6
+        print(f"{name:<20} {per_call:10.1f} µs/call")
+
+
+def cmd_bench_sales(args):
+    # vânzări/s de la mai multe case simultan: commit per vânzare (process_sale)
+    # vs. coada de scriere cu group commit (submit_sale). Rulează mereu pe o
+    # copie temporară (a bazei din --db, dacă e dată), ștearsă la final.
+    original = db_sqlite.DB_PATH
+    tmp = tempfile.mkdtemp(prefix="pharmacy-bench-")
+    try:
+        scratch = Path(tmp) / "bench.db"
+        if args.db:
+            # backup API: copie consistentă și cu WAL activ; originalul nu se atinge:
+            # conexiune read-only, nu din pool (fără PRAGMA journal_mode=WAL și fără
+            # migrări: init_db rulează pe copie)
+            source = sqlite3.connect(f"{Path(args.db).resolve().as_uri()}?mode=ro", uri=True)
+            target = sqlite3.connect(scratch)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+        db_sqlite.configure(scratch, **({"synchronous": args.synchronous} if args.synchronous else {}))
+        _bench_sales(args)
+    finally:
+        db_sqlite.configure(original)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _bench_sales(args):
+    db_sqlite.init_db()
+
+    codes = [f"BENCH-{i:05d}" for i in range(args.medicines)]
+    stock = args.tills * args.sales * 2
+    with db_sqlite.connection() as conn:
+        # upsert, nu REPLACE: REPLACE șterge rândul fără triggerele de DELETE (lots, FTS)
+        conn.executemany("""
+            INSERT INTO medicines_info (Med_code, Med_name, Qty, MRP, Exp)
+            VALUES (?, ?, ?, 1.0, date('now', '+1 year'))
+            ON CONFLICT(Med_code) DO UPDATE SET Qty = Qty + excluded.Qty
+        """, [(c, f"Bench {c}", stock) for c in codes])
+        conn.executemany(lots.RECEIVE_SQL, [(c, "bench", stock, None, None) for c in codes])
+        conn.commit()
+
+    def run(mode):
+        latencies, errors = [], []
+
+        def till(n):
+            for i in range(args.sales):
+                code = codes[(n * args.sales + i) % len(codes)]
+                start = time.perf_counter()
+                try:
+                    if mode == "direct":
+                        sales.process_sale(code, 1, cashier_id=n)
+                    else:
+                        sales.submit_sale(code, 1, cashier_id=n).result()
+                except Exception as e:
+                    errors.append(type(e).__name__ + ": " + str(e))
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        threads = [threading.Thread(target=till, args=(n,)) for n in range(args.tills)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        ok = len(latencies) - len(errors)
+        print(f"{mode:<8} {ok / elapsed:10.0f} sales/s | p50 {latencies[len(latencies) // 2]:7.2f} ms "
+              f"| p95 {latencies[int(len(latencies) * 0.95)]:7.2f} ms | errors {len(errors)}")
+        for e in sorted(set(errors))[:3]:
+            print(f"         {e}")
+
+    print(f"{args.tills} tills x {args.sales} sales, synchronous={args.synchronous or 'NORMAL'}")
+    run("direct")
+    run("queued")
+    q = write_queue.write_queue.stats()
+    print(f"queue: {q['batches']} commits, avg batch {q['avg_batch']:.1f}, max depth {q['max_depth']}, "
+          f"commit {q['commit_ms']:.2f} ms")
+
+
+def cmd_generate_data(args):
+    medicines, n_sales = datagen.SCALES[args.scale]
+    medicines = args.medicines or medicines
+    n_sales = args.sales if args.sales is not None else n_sales
+
+    def progress(table, rows):
+        print(f"\r{table:<15} {rows:>12,} rows", end="", file=sys.stderr, flush=True)
+
+    result = datagen.generate(medicines, n_sales, args.days, args.seed, progress=progress)
+    print(file=sys.stderr)
+    print(f"{result['medicines']:,} medicines, {result['lots']:,} lots, {result['sales']:,} sales "
+          f"over {result['days']} days in {result['elapsed']:.1f}s (seed {result['seed']})")
+    if not args.no_reorder:
+        print(f"reorder points: {reorder.compute_reorder_points()['medicines']:,} medicines")
+
+
+def cmd_bench(args):
+    def progress(r):
+        rows = "" if r["rows"] is None else f"{r['rows']:>8,} rows"
+        print(f"{r['section'] + '/' + r['name']:<32} p50 {r['p50_ms']:9.2f} ms | p95 {r['p95_ms']:9.2f} ms "
+              f"| max {r['max_ms']:9.2f} ms {rows}", file=sys.stderr)
+
+    results = bench.run(args.repeat, args.warmup, args.section, progress=progress)
+    _finish_bench(args, results)
+
+
+def cmd_bench_pages(args):
+    def progress(r):
+        memory = "" if r["peak_kb"] is None else f" | peak {r['peak_kb'] / 1024:7.1f} MB"
+        query_ms = "" if r["query_ms"] is None else f" {r['query_ms']:7.1f} ms"
+        print(f"{r['section'] + '/' + r['name']:<24} first {r['first_ms']:8.1f} ms ({r['first_queries']:3} queries) "
+              f"| p50 {r['p50_ms']:8.1f} ms | max {r['max_ms']:8.1f} ms "
+              f"| {r['queries']:3} queries{query_ms}{memory}", file=sys.stderr)
+        for message in r["exceptions"]:
+            print(f"    exception: {message}", file=sys.stderr)
+
+    results = page_bench.run(args.role, args.repeat, not args.no_memory, args.cold_starts, progress=progress)
+    _finish_bench(args, results)
+
+
+def _finish_bench(args, results):
+    # comun pentru bench / bench-pages: rezumat, JSON, comparație cu baseline
+    d = results["dataset"]
+    print(f"{d['medicines']:,} medicines, {d['lots']:,} lots, {d['sales']:,} sales", file=sys.stderr)
+    if args.output:
+        bench.save(results, args.output)
+        print(f"results -> {args.output}", file=sys.stderr)
+
+    baseline = bench.load(args.baseline) if args.baseline else None
+    regressions = bench.compare(results, baseline, args.tolerance, args.min_delta, args.budget_ms)
+    for key, reason in regressions:
+        print(f"REGRESSION {key}: {reason}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pharmacy_cli", description="Pharmacy Management System CLI")
+    parser.add_argument("--db", help="SQLite database path (default: pharmacy.db next to the app)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("migrate", help="create tables and apply pending schema migrations")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("rebuild-rollups", help="recompute sales_daily/sales_monthly from sales")
+    p.set_defaults(func=cmd_rebuild_rollups)
+
+    p = sub.add_parser("rebuild-search", help="rebuild the medicines_fts full-text index (e.g. after VACUUM)")
+    p.set_defaults(func=cmd_rebuild_search)
+
+    p = sub.add_parser("refresh-alerts", help="recompute the alerts table (low stock, expired, expiring)")
+    p.set_defaults(func=cmd_refresh_alerts)
+
+    p = sub.add_parser("reconcile-lots", help="match per-batch stock (lots) to medicines_info.Qty")
+    p.set_defaults(func=cmd_reconcile_lots)
+
+    p = sub.add_parser("compute-reorder", help="recompute per-medicine reorder points from sales velocity")
+    p.add_argument("--days", type=int, default=reorder.WINDOW_DAYS, help="sales history window")
+    p.add_argument("--lead-time", type=int, default=reorder.LEAD_TIME_DAYS, help="days until a delivery arrives")
+    p.add_argument("--review-days", type=int, default=reorder.REVIEW_DAYS, help="days of stock one order covers")
+    p.add_argument("--z", type=float, default=reorder.SERVICE_Z, help="safety factor (1.65 ~ 95%% service level)")
+    p.set_defaults(func=cmd_compute_reorder)
+
+    p = sub.add_parser("import-medicines", help="bulk upsert medicines from a CSV/Excel delivery file")
+    p.add_argument("path")
+    p.add_argument("--chunk-size", type=int, default=bulk_import.CHUNK_SIZE)
+    p.add_argument("--rejects", help="write rejected rows to this CSV file")
+    p.set_defaults(func=cmd_import_medicines)
+
+    p = sub.add_parser("export", help="stream medicines or sales to CSV, gzip-CSV or Parquet")
+    p.add_argument("dataset", choices=list(export.DATASETS))
+    p.add_argument("path", help="output file; '{date}' is replaced with today's date")
+    p.add_argument("--format", choices=list(export.FORMATS), help="default: from the file extension")
+    p.add_argument("--from", dest="date_from", help="first sale day, YYYY-MM-DD (sales only)")
+    p.add_argument("--to", dest="date_to", help="last sale day, YYYY-MM-DD (sales only)")
+    p.add_argument("--chunk-size", type=int, default=export.CHUNK_SIZE)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("report", help="compute reports without the UI and write them as CSV, JSON or HTML")
+    p.add_argument("names", nargs="+", choices=list(reports.REPORTS) + ["all"], metavar="report",
+                   help=f"one or more of: {', '.join(reports.REPORTS)}, all")
+    p.add_argument("--date", help="day for the daily report, YYYY-MM-DD (default: today)")
+    p.add_argument("--month", help="month for the monthly report, YYYY-MM (default: this month)")
+    p.add_argument("--days", type=int, default=30, help="top products window in days (0 = all time)")
+    p.add_argument("--limit", type=int, default=reports.TOP_LIMIT, help="top products to list")
+    p.add_argument("--top-by", choices=leaderboard.RANKINGS, default="revenue", help="top products ranking")
+    p.add_argument("--expiry-days", type=int, default=90, help="expiry report horizon in days")
+    p.add_argument("--low-stock-threshold", type=int, default=20)
+    p.add_argument("--format", choices=reports.RENDER_FORMATS, default="csv")
+    p.add_argument("-o", "--output", help="output file; '{report}' and '{date}' are substituted")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("check-top", help="compare the in-memory top sellers with the SQL GROUP BY result")
+    p.add_argument("--limit", type=int, default=reports.TOP_LIMIT)
+    p.set_defaults(func=cmd_check_top)
+
+    p = sub.add_parser("bench-lookups", help="time point lookups with and without pandas")
+    p.add_argument("-n", type=int, default=2000, help="calls per case")
+    p.set_defaults(func=cmd_bench_lookups)
+
+    p = sub.add_parser("bench-sales", help="sales/sec from concurrent tills: per-call commit vs. write queue")
+    p.add_argument("--tills", type=int, default=8, help="concurrent threads")
+    p.add_argument("--sales", type=int, default=250, help="sales per till")
+    p.add_argument("--medicines", type=int, default=200)
+    p.add_argument("--synchronous", choices=["OFF", "NORMAL", "FULL"],
+                   help="PRAGMA synchronous for the run (FULL = fsync on every commit)")
+    p.set_defaults(func=cmd_bench_sales)
+
+    p = sub.add_parser("generate-data", help="fill an empty database with synthetic medicines, lots and sales")
+    p.add_argument("--scale", choices=list(datagen.SCALES), default="small",
+                   help=", ".join(f"{k}: {m:,} medicines / {s:,} sales" for k, (m, s) in datagen.SCALES.items()))
+    p.add_argument("--medicines", type=int, help="override the scale's medicine count")
+    p.add_argument("--sales", type=int, help="override the scale's sales count")
+    p.add_argument("--days", type=int, default=datagen.HISTORY_DAYS, help="days of sales history")
+    p.add_argument("--seed", type=int, default=datagen.SEED)
+    p.add_argument("--no-reorder", action="store_true", help="skip computing reorder points afterwards")
+    p.set_defaults(func=cmd_generate_data)
+
+    p = sub.add_parser("bench", help="time the SQL behind every page; JSON results and regression checks")
+    p.add_argument("--repeat", type=int, default=bench.REPEAT, help="timed runs per case")
+    p.add_argument("--warmup", type=int, default=bench.WARMUP)
+    p.add_argument("--section", action="append",
+                   choices=["dashboard", "medicines", "sales", "reports", "alerts", "search"],
+                   help="only these sections (repeatable)")
+    p.add_argument("-o", "--output", help="write results as JSON")
+    p.add_argument("--baseline", help="earlier results JSON; exit 1 if a case got slower")
+    p.add_argument("--tolerance", type=float, default=bench.TOLERANCE, help="allowed p50 ratio over the baseline")
+    p.add_argument("--min-delta", type=float, default=bench.MIN_DELTA_MS,
+                   help="ignore slowdowns smaller than this many ms")
+    p.add_argument("--budget-ms", type=float, help="exit 1 if any case's p95 exceeds this")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("bench-pages", help="render every page per role headlessly (Streamlit AppTest) and time it")
+    p.add_argument("--role", action="append", help="only these roles (repeatable; default: all)")
+    p.add_argument("--repeat", type=int, default=page_bench.REPEAT, help="timed reruns per page")
+    p.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    p.add_argument("--cold-starts", type=int, default=page_bench.COLD_STARTS,
+                   help="fresh processes per role to time startup (0 = skip)")
+    p.add_argument("-o", "--output", help="write results as JSON")
+    p.add_argument("--baseline", help="earlier results JSON; exit 1 if a page got slower")
+    p.add_argument("--tolerance", type=float, default=bench.TOLERANCE, help="allowed p50 ratio over the baseline")
+    p.add_argument("--min-delta", type=float, default=10.0, help="ignore slowdowns smaller than this many ms")
+    p.add_argument("--budget-ms", type=float, help="exit 1 if any page's p95 exceeds this")
+    p.set_defaults(func=cmd_bench_pages)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.db:
+        db_sqlite.configure(args.db)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Cache partajat (la nivel de proces, deci între toate sesiunile Streamlit)
+pentru rezultatele interogărilor de citire: TTL per interogare, LRU limitat
+ca număr de intrări și invalidare pe tabel la fiecare scriere.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from db_sqlite import on_write, query_df
+
+DEFAULT_TTL = 60        # secunde
+MAX_ENTRIES = 256
+
+_TABLES_RE = re.compile(r"\b(?:FROM|JOIN)\s+[\"\[`]?(\w+)", re.IGNORECASE)
+
+
+def tables_read(sql):
+    return {t.lower() for t in _TABLES_RE.findall(sql)}
+
+
+class QueryCache:
+    def __init__(self, max_entries=MAX_ENTRIES, default_ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()   # cheie -> (expiră_la, tabele, valoare)
+        self._lock = threading.Lock()
+        self._generation = 0            # crește la fiecare invalidare
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, sql, params, loader, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return loader(sql, params)
+
+        key = (sql, tuple(params))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[2]
+                del self._entries[key]
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        value = loader(sql, params)
+
+        with self._lock:
+            # o scriere în timpul citirii: rezultatul poate fi deja vechi
+            if generation != self._generation:
+                return value
+            self._entries[key] = (now + ttl, tables_read(sql), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return value
+
+    def invalidate(self, tables=None, codes=None):
+        with self._lock:
+            if tables is None:
+                dropped = list(self._entries)
+            else:
+                tables = {t.lower() for t in tables}
+                dropped = [k for k, e in self._entries.items() if e[1] & tables]
+            for key in dropped:
+                del self._entries[key]
+            self._generation += 1
+            self._stats["invalidations"] += len(dropped)
+        return len(dropped)
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            s["entries"] = len(self._entries)
+        lookups = s["hits"] + s["misses"]
+        s["hit_rate"] = s["hits"] / lookups if lookups else 0.0
+        return s
+
+
+_cache = QueryCache()
+on_write(_cache.invalidate)
+
+
+def cached(sql, params, loader, ttl=None):
+    # pentru rezultate imuabile (tupluri, NamedTuple) care nu trebuie copiate
+    return _cache.get(sql, list(params or []), loader, ttl)
+
+
+def cached_df(sql, params=None, ttl=None):
+    # DataFrame-ul din cache e partajat; fiecare apelant primește o copie
+    df = _cache.get(sql, list(params or []), lambda q, p: query_df(q, p), ttl)
+    return df.copy()
+
+
+def invalidate(tables=None):
+    return _cache.invalidate(tables)
+
+
+def cache_stats():
+    return _cache.stats()
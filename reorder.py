@@ -0,0 +1,91 @@
+"""
+Puncte de reaprovizionare per medicament calculate din viteza vânzărilor
+(în loc de pragul fix LOW_STOCK_THRESHOLD). SQLite agregă sales_daily pe
+cod (sumă, sumă de pătrate, prima zi cu vânzări), iar statisticile pentru
+toate produsele se calculează vectorial cu NumPy; rezultatul merge în
+tabela reorder_points, citită de alerte (low stock) și de dashboard.
+"""
+
+import time
+
+import numpy as np
+
+from db_sqlite import connection, notify_write, query_df
+
+WINDOW_DAYS = 90        # istoricul folosit pentru viteză / variație
+LEAD_TIME_DAYS = 7      # zile de la comandă până la livrare
+REVIEW_DAYS = 14        # cât stoc acoperă o comandă (ciclul de comandă)
+SERVICE_Z = 1.65        # ~95% șanse să nu rămânem fără stoc în lead time
+
+STATS_SQL = """
+    SELECT medicine_code AS Med_code,
+           SUM(qty) AS total,
+           SUM(qty * qty) AS total_sq,
+           MIN(date) AS first_day
+    FROM sales_daily
+    WHERE date >= date('now', ?) AND date < date('now', '+1 day')
+    GROUP BY medicine_code
+    HAVING SUM(qty) > 0
+"""
+
+
+def reorder_stats(stats, window_days=WINDOW_DAYS, lead_time=LEAD_TIME_DAYS,
+                  review_days=REVIEW_DAYS, z=SERVICE_Z, today=None):
+    # stats: Med_code, total, total_sq, first_day (un rând per medicament).
+    # Zilele fără vânzări contează ca cerere 0; produsele noi se raportează
+    # doar la zilele de la prima vânzare.
+    today = np.datetime64(today or np.datetime64("today", "D"), "D")
+    first = stats["first_day"].to_numpy(dtype="datetime64[D]")
+    days = np.clip((today - first).astype(np.int64) + 1, 1, window_days).astype(np.float64)
+
+    total = stats["total"].to_numpy(dtype=np.float64)
+    total_sq = stats["total_sq"].to_numpy(dtype=np.float64)
+    velocity = total / days
+    # varianța de eșantion a cererii zilnice (n-1), din sume
+    variance = np.where(days > 1, (total_sq - days * velocity ** 2) / np.maximum(days - 1, 1), 0.0)
+    std = np.sqrt(np.clip(variance, 0.0, None))
+
+    safety = z * std * np.sqrt(lead_time)
+    reorder_point = np.ceil(velocity * lead_time + safety)
+    order_up_to = np.ceil(velocity * (lead_time + review_days) + safety)
+
+    out = stats[["Med_code"]].copy()
+    out["velocity"] = velocity
+    out["velocity_std"] = std
+    out["days"] = days.astype(np.int64)
+    out["reorder_point"] = np.maximum(reorder_point, 1).astype(np.int64)
+    out["order_up_to"] = np.maximum(order_up_to, reorder_point + 1).astype(np.int64)
+    return out
+
+
+def compute_reorder_points(window_days=WINDOW_DAYS, lead_time=LEAD_TIME_DAYS,
+                           review_days=REVIEW_DAYS, z=SERVICE_Z):
+    # recalcul complet; medicamentele fără vânzări în fereastră nu primesc
+    # rând și rămân pe pragul fix
+    started = time.perf_counter()
+    stats = query_df(STATS_SQL, [f"-{int(window_days) - 1} day"])
+    points = reorder_stats(stats, window_days, lead_time, review_days, z)
+    rows = list(zip(
+        points["Med_code"],
+        points["velocity"].round(4).tolist(),
+        points["velocity_std"].round(4).tolist(),
+        points["days"].tolist(),
+        points["reorder_point"].tolist(),
+        points["order_up_to"].tolist(),
+    ))
+
+    with connection() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM reorder_points")
+            conn.executemany("""
+                INSERT INTO reorder_points
+                    (Med_code, velocity, velocity_std, days, reorder_point, order_up_to)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    notify_write({"reorder_points"})
+    return {"medicines": len(rows), "elapsed": time.perf_counter() - started}
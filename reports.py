@@ -0,0 +1,254 @@
+"""
+Rapoartele (zilnic, lunar, inventar, top produse, expirări, financiar)
+calculate fără Streamlit: aceleași funcții servesc pagina Reports și comanda
+`report` din pharmacy_cli, care le poate scrie în CSV / JSON / HTML (ex. din
+cron, la sfârșitul zilei).
+"""
+
+import html
+import json
+import time
+from datetime import date, datetime
+from typing import NamedTuple
+
+import pandas as pd
+
+from kpi import get_kpis
+from leaderboard import top_products
+from query_cache import cached_df
+
+# perioade pentru Top Selling Products: etichetă -> zile (None = tot istoricul)
+TOP_PERIODS = {
+    "Last 7 Days": 7,
+    "Last 30 Days": 30,
+    "Last 90 Days": 90,
+    "All Time": None,
+}
+TOP_LIMIT = 10
+
+RENDER_FORMATS = ["csv", "json", "html"]
+
+
+class Report(NamedTuple):
+    name: str
+    title: str
+    params: dict
+    metrics: dict       # etichetă -> valoare (int / float)
+    tables: dict        # nume -> DataFrame; primul e tabelul principal
+    elapsed: float
+
+    @property
+    def table(self):
+        return next(iter(self.tables.values()), pd.DataFrame())
+
+    @property
+    def empty(self):
+        return self.table.empty
+
+
+def _total(df, column):
+    return float(df[column].sum()) if not df.empty else 0.0
+
+
+def _mean(df, column):
+    return float(df[column].mean()) if not df.empty else 0.0
+
+
+def daily_report(day=None, ttl=None):
+    day = str(day or date.today())
+    df = cached_df("""
+        SELECT s.sale_date, m.Med_name, s.quantity, s.sale_price, s.total
+        FROM sales s
+        JOIN medicines_info m ON s.medicine_code = m.Med_code
+        WHERE s.sale_date >= ? AND s.sale_date < date(?, '+1 day')
+        ORDER BY s.sale_date
+    """, [day, day], ttl)
+
+    top = (df.groupby("Med_name", as_index=False)["quantity"].sum()
+             .nlargest(5, "quantity")) if not df.empty else pd.DataFrame(columns=["Med_name", "quantity"])
+    metrics = {
+        "Total Sales": _total(df, "total"),
+        "Items Sold": int(_total(df, "quantity")),
+        "Average Sale": _mean(df, "total"),
+    }
+    return {"title": f"Daily Sales Report - {day}", "params": {"date": day},
+            "metrics": metrics, "tables": {"sales": df, "top_products": top}}
+
+
+def monthly_report(month=None, ttl=None):
+    month = month or date.today().strftime("%Y-%m")
+    df = cached_df("""
+        SELECT
+            date,
+            SUM(tx_count) as transactions,
+            SUM(qty) as items_sold,
+            SUM(revenue) as daily_total
+        FROM sales_daily
+        WHERE date >= ? || '-01' AND date < date(? || '-01', '+1 month')
+        GROUP BY date
+        ORDER BY date
+    """, [month, month], ttl)
+
+    metrics = {
+        "Total Revenue": _total(df, "daily_total"),
+        "Transactions": int(_total(df, "transactions")),
+        "Items Sold": int(_total(df, "items_sold")),
+        "Avg Daily": _mean(df, "daily_total"),
+    }
+    return {"title": f"Monthly Report - {month}", "params": {"month": month},
+            "metrics": metrics, "tables": {"days": df}}
+
+
+def inventory_report(ttl=300):
+    df = cached_df("""
+        SELECT
+            CASE WHEN Purpose IS NULL OR Purpose='' THEN 'Unspecified' ELSE Purpose END as GroupKey,
+            COUNT(*) as count,
+            SUM(Qty) as total_qty,
+            AVG(MRP) as avg_price,
+            SUM(Qty * MRP) as total_value
+        FROM medicines_info
+        GROUP BY GroupKey
+        ORDER BY total_value DESC
+    """, [], ttl)
+
+    metrics = {
+        "Total Inventory Value": _total(df, "total_value"),
+        "Total Items in Stock": int(_total(df, "total_qty")),
+    }
+    return {"title": "Inventory Overview (grouped by Purpose)", "params": {},
+            "metrics": metrics, "tables": {"purposes": df}}
+
+
+def top_products_report(days=30, limit=TOP_LIMIT, by="revenue", ttl=None):
+    # din contoarele incrementale (leaderboard.py), fără GROUP BY peste sales;
+    # ttl e acceptat ca la celelalte rapoarte, dar contoarele sunt mereu la zi
+    df = top_products(limit, days or None, by)
+
+    period = f"Last {int(days)} Days" if days else "All Time"
+    metrics = {
+        "Revenue": _total(df, "total_revenue"),
+        "Items Sold": int(_total(df, "total_quantity")),
+    }
+    ranked = "" if by == "revenue" else f" by {by.title()}"
+    return {"title": f"Top {int(limit)} Products{ranked} - {period}",
+            "params": {"days": days, "limit": int(limit), "by": by},
+            "metrics": metrics, "tables": {"products": df}}
+
+
+def expiry_report(days=90, ttl=None):
+    # pe loturi: stocul vechi nu mai e ascuns de expirarea livrării noi
+    df = cached_df("""
+        SELECT l.Exp, l.Med_code, m.Med_name, l.batch, l.Qty,
+               CAST(julianday(l.Exp) - julianday(date('now')) AS INTEGER) AS days_left,
+               l.Qty * m.MRP AS value
+        FROM lots l
+        JOIN medicines_info m ON m.Med_code = l.Med_code
+        WHERE l.Qty > 0 AND l.Exp > '' AND l.Exp <= date('now', ?)
+        ORDER BY l.Exp, l.lot_id
+    """, [f"+{int(days)} day"], ttl)
+
+    expired = df[df["days_left"] < 0] if not df.empty else df
+    metrics = {
+        "Expired Units": int(_total(expired, "Qty")),
+        "Expired Value": _total(expired, "value"),
+        "Expiring Units": int(_total(df, "Qty")) - int(_total(expired, "Qty")),
+        "Expiring Value": _total(df, "value") - _total(expired, "value"),
+    }
+    return {"title": f"Expiry Report - next {int(days)} days", "params": {"days": int(days)},
+            "metrics": metrics, "tables": {"lots": df}}
+
+
+def financial_report(low_stock_threshold=20, ttl=None):
+    kpis = get_kpis(low_stock_threshold, ttl)
+    df = cached_df("""
+        SELECT month,
+               SUM(revenue) as monthly_sales,
+               SUM(tx_count) as transactions
+        FROM sales_monthly
+        WHERE month >= strftime('%Y-%m', 'now', 'start of month', '-5 month')
+        GROUP BY month
+        ORDER BY month DESC
+        LIMIT 6
+    """, [], ttl)
+
+    metrics = {
+        "Total Sales (All Time)": kpis.total_sales,
+        "Today's Sales": kpis.today_sales,
+        "Inventory Value": kpis.inventory_value,
+        "Products in Stock": kpis.total_medicines,
+    }
+    return {"title": "Financial Summary", "params": {},
+            "metrics": metrics, "tables": {"months": df}}
+
+
+REPORTS = {
+    "daily": daily_report,
+    "monthly": monthly_report,
+    "inventory": inventory_report,
+    "top": top_products_report,
+    "expiry": expiry_report,
+    "financial": financial_report,
+}
+
+
+def run_report(name, **params):
+    # parametrii None sunt lăsați pe valorile implicite ale raportului
+    if name not in REPORTS:
+        raise ValueError(f"Unknown report '{name}' (choose from {', '.join(REPORTS)})")
+    started = time.perf_counter()
+    result = REPORTS[name](**{k: v for k, v in params.items() if v is not None})
+    return Report(name=name, elapsed=time.perf_counter() - started, **result)
+
+
+# ---------------------- ieșire (CSV / JSON / HTML) ----------------------
+def _scalar(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def to_json(report):
+    return json.dumps({
+        "report": report.name,
+        "title": report.title,
+        "params": report.params,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "elapsed": round(report.elapsed, 4),
+        "metrics": {k: _scalar(v) for k, v in report.metrics.items()},
+        "tables": {name: _records(df) for name, df in report.tables.items()},
+    }, ensure_ascii=False, indent=2)
+
+
+def to_csv(report):
+    # CSV are loc doar pentru un tabel: se scrie tabelul principal
+    return report.table.to_csv(index=False)
+
+
+def to_html(report):
+    title = html.escape(report.title)
+    metrics = "".join(
+        f"<tr><th>{html.escape(k)}</th><td>{_scalar(v):,.2f}</td></tr>" if isinstance(v, float)
+        else f"<tr><th>{html.escape(k)}</th><td>{_scalar(v):,}</td></tr>"
+        for k, v in report.metrics.items()
+    )
+    tables = "".join(
+        f"<h2>{html.escape(name)}</h2>" + (df.to_html(index=False) if not df.empty else "<p>No data</p>")
+        for name, df in report.tables.items()
+    )
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title></head><body>"
+        f"<h1>{title}</h1>"
+        f"<p>Generated {datetime.now():%Y-%m-%d %H:%M} in {report.elapsed * 1000:.0f} ms</p>"
+        f"<table>{metrics}</table>{tables}</body></html>\n"
+    )
+
+
+def render(report, fmt):
+    renderers = {"csv": to_csv, "json": to_json, "html": to_html}
+    if fmt not in renderers:
+        raise ValueError(f"Unknown report format '{fmt}' (choose from {', '.join(RENDER_FORMATS)})")
+    return renderers[fmt](report)
@@ -0,0 +1,225 @@
+"""
+Procesarea vânzărilor (SQLite): verificare stoc + scădere + înregistrare
+într-o singură tranzacție, pe o singură conexiune. sale_body / checkout_body
+conțin logica fără commit, ca să poată rula direct (process_sale, checkout)
+sau grupate în coada de scriere (submit_sale, submit_checkout).
+"""
+
+from db_sqlite import connection, notify_write
+from write_queue import write_queue
+
+
+class SaleError(Exception):
+    pass
+
+
+SALE_TABLES = {"medicines_info", "sales"}
+CHECKOUT_TABLES = {"medicines_info", "sales", "receipts"}
+
+
+def _in_transaction(body, *args, tables, codes):
+    # apel direct (fără coada de scriere): o tranzacție și un commit per apel
+    with connection() as conn:
+        try:
+            # IMMEDIATE: luăm lock-ul de scriere de la început, ca două case
+            # să nu treacă simultan de verificarea stocului
+            conn.execute("BEGIN IMMEDIATE")
+            result = body(conn, *args)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    notify_write(tables, codes)
+    return result
+
+
+def sale_body(conn, med_code, quantity, discount=0.0, cashier_id=None):
+    # rulează într-o tranzacție deschisă de apelant (direct sau coada de scriere)
+    quantity = int(quantity)
+    if quantity <= 0:
+        raise SaleError("Quantity must be greater than 0!")
+
+    # scădere condiționată: reușește doar dacă stocul ajunge
+    rows = conn.execute("""
+        UPDATE medicines_info SET Qty = Qty - ?
+        WHERE Med_code = ? AND Qty >= ?
+        RETURNING Med_name, MRP, Qty
+    """, [quantity, med_code, quantity]).fetchall()
+
+    if not rows:
+        stock = conn.execute(
+            "SELECT Qty FROM medicines_info WHERE Med_code = ?", [med_code]
+        ).fetchone()
+        if stock is None:
+            raise SaleError("Medicine not found!")
+        raise SaleError(f"Not enough stock. Available: {int(stock['Qty'])}")
+
+    row = rows[0]
+    price = float(row["MRP"])
+    subtotal = quantity * price
+    total = max(0.0, subtotal - float(discount))
+
+    cur = conn.execute("""
+        INSERT INTO sales (medicine_code, quantity, sale_price, total, cashier_id)
+        VALUES (?, ?, ?, ?, ?)
+    """, [med_code, quantity, price, total, cashier_id])
+
+    return {
+        "sale_id": cur.lastrowid,
+        "med_code": med_code,
+        "med_name": row["Med_name"],
+        "quantity": quantity,
+        "price": price,
+        "subtotal": subtotal,
+        "discount": float(discount),
+        "total": total,
+        "stock_left": int(row["Qty"]),
+    }
+
+
+def process_sale(med_code, quantity, discount=0.0, cashier_id=None):
+    return _in_transaction(sale_body, med_code, quantity, discount, cashier_id,
+                           tables=SALE_TABLES, codes={med_code})
+
+
+def _basket(items):
+    basket = {}
+    for med_code, quantity in items:
+        basket[med_code] = basket.get(med_code, 0) + int(quantity)
+    if not basket:
+        raise SaleError("Basket is empty!")
+    if any(q <= 0 for q in basket.values()):
+        raise SaleError("Quantity must be greater than 0!")
+    return basket
+
+
+def checkout_body(conn, items, discount=0.0, cashier_id=None, customer_name=None, payment_method=None):
+    # items: [(Med_code, cantitate), ...]; același cod de mai multe ori se cumulează
+    basket = _basket(items)
+    codes = list(basket)
+    marks = ",".join("?" * len(codes))
+
+    stock = {
+        r["Med_code"]: r
+        for r in conn.execute(
+            f"SELECT Med_code, Med_name, MRP, Qty FROM medicines_info WHERE Med_code IN ({marks})",
+            codes
+        )
+    }
+    missing = [c for c in codes if c not in stock]
+    if missing:
+        raise SaleError(f"Medicine not found: {', '.join(missing)}")
+    short = [
+        f"{stock[c]['Med_name']} (available: {int(stock[c]['Qty'])})"
+        for c in codes if int(stock[c]["Qty"]) < basket[c]
+    ]
+    if short:
+        raise SaleError(f"Not enough stock: {', '.join(short)}")
+
+    cur = conn.executemany(
+        "UPDATE medicines_info SET Qty = Qty - ? WHERE Med_code = ? AND Qty >= ?",
+        [(basket[c], c, basket[c]) for c in codes]
+    )
+    if cur.rowcount != len(codes):
+        raise SaleError("Stock changed during checkout, please retry.")
+
+    lines = []
+    for c in codes:
+        price = float(stock[c]["MRP"])
+        lines.append({
+            "med_code": c,
+            "med_name": stock[c]["Med_name"],
+            "quantity": basket[c],
+            "price": price,
+            "amount": basket[c] * price,
+        })
+    subtotal = sum(line["amount"] for line in lines)
+    total = max(0.0, subtotal - float(discount))
+
+    # reducerea se împarte proporțional pe linii, ca SUM(sales.total) = total bon
+    ratio = total / subtotal if subtotal else 0.0
+    allocated = 0.0
+    for line in lines[:-1]:
+        line["total"] = round(line["amount"] * ratio, 2)
+        allocated += line["total"]
+    lines[-1]["total"] = round(total - allocated, 2)
+
+    header = conn.execute("""
+        INSERT INTO receipts (cashier_id, customer_name, payment_method, subtotal, discount, total)
+        VALUES (?, ?, ?, ?, ?, ?)
+        RETURNING receipt_id, receipt_date
+    """, [cashier_id, customer_name, payment_method, subtotal, float(discount), total]).fetchall()[0]
+
+    conn.executemany("""
+        INSERT INTO sales (medicine_code, quantity, sale_price, total, sale_date, cashier_id, receipt_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (line["med_code"], line["quantity"], line["price"], line["total"],
+         header["receipt_date"], cashier_id, header["receipt_id"])
+        for line in lines
+    ])
+
+    return {
+        "receipt_id": header["receipt_id"],
+        "receipt_date": header["receipt_date"],
+        "lines": lines,
+        "subtotal": subtotal,
+        "discount": float(discount),
+        "total": total,
+        "customer_name": customer_name,
+        "payment_method": payment_method,
+    }
+
+
+def checkout(items, discount=0.0, cashier_id=None, customer_name=None, payment_method=None):
+    items = list(items)
+    return _in_transaction(checkout_body, items, discount, cashier_id, customer_name, payment_method,
+                           tables=CHECKOUT_TABLES, codes=set(_basket(items)))
+
+
+# Prin coada de scriere (group commit): aceleași operații, un commit per lot
+# de vânzări în loc de unul per vânzare; întorc un Future.
+def submit_sale(med_code, quantity, discount=0.0, cashier_id=None, queue=None):
+    return (queue or write_queue).submit(sale_body, med_code, quantity, discount, cashier_id,
+                                         tables=SALE_TABLES, codes={med_code})
+
+
+def submit_checkout(items, discount=0.0, cashier_id=None, customer_name=None, payment_method=None, queue=None):
+    items = list(items)
+    codes = set(_basket(items))
+    return (queue or write_queue).submit(checkout_body, items, discount, cashier_id, customer_name, payment_method,
+                                         tables=CHECKOUT_TABLES, codes=codes)
+
+
+def render_receipt(receipt, cashier_name=""):
+    width = 42
+
+    def row(left, right=""):
+        left = str(left)
+        room = width - 2 - len(right)
+        return f"║ {left[:room - 1]:<{room}}{right} ║"
+
+    sep = "╠" + "═" * width + "╣"
+    out = [
+        "╔" + "═" * width + "╗",
+        f"║{'PHARMACY RECEIPT':^{width}}║",
+        sep,
+        row("Receipt #:", str(receipt["receipt_id"])),
+        row("Date:", str(receipt["receipt_date"])),
+        sep,
+    ]
+    for line in receipt["lines"]:
+        out.append(row(line["med_name"]))
+        out.append(row(f"  {line['quantity']} x ${line['price']:.2f}", f"${line['amount']:.2f}"))
+    out += [
+        sep,
+        row("Subtotal:", f"${receipt['subtotal']:.2f}"),
+        row("Discount:", f"${receipt['discount']:.2f}"),
+        row("Final Total:", f"${receipt['total']:.2f}"),
+        sep,
+        row("Customer:", str(receipt.get("customer_name") or "")),
+        row("Payment:", str(receipt.get("payment_method") or "")),
+        row("Cashier:", str(cashier_name)),
+        "╚" + "═" * width + "╝",
+    ]
+    return "\n".join(out)
@@ -0,0 +1,187 @@
+"""
+Dashboard-ul precalculat: indicatorii, seriile pentru grafice și listele
+recente se construiesc o singură dată per proces (un thread de fundal, la
+fiecare REFRESH_INTERVAL secunde și după scrieri) și se servesc tuturor
+sesiunilor din memorie, fără SQL la afișare. Conținutul e același pentru
+toate rolurile, deci un singur snapshot le servește pe toate.
+"""
+
+import threading
+import time
+from datetime import date
+from typing import NamedTuple
+
+import pandas as pd
+
+import perf
+from alerts import alert_engine, alert_counts, AlertCounts, LOW_STOCK_THRESHOLD
+from db_sqlite import on_write
+from kpi import get_kpis, Kpis
+from query_cache import cached_df
+
+REFRESH_INTERVAL = 60   # secunde; "Today's Sales" și expirările se schimbă și fără scrieri
+DEBOUNCE = 0.5          # secunde; scrierile apropiate (o casă ocupată) -> o singură reconstruire
+MAX_AGE = 600           # secunde; mai vechi de atât (thread oprit) -> reconstruire la citire
+
+# scrierile care schimbă ceva pe dashboard
+TABLES = {"medicines_info", "lots", "sales", "sales_daily", "alerts"}
+
+STOCK_SQL = """
+    SELECT
+        CASE
+            WHEN Purpose IS NULL OR Purpose='' THEN 'Unspecified'
+            ELSE Purpose
+        END AS GroupKey,
+        COUNT(*) AS count
+    FROM medicines_info
+    GROUP BY GroupKey
+    ORDER BY count DESC
+    LIMIT 10
+"""
+
+TREND_SQL = """
+    SELECT date, SUM(revenue) AS sales
+    FROM sales_daily
+    WHERE date >= date('now','-7 day')
+    GROUP BY date
+    ORDER BY date
+"""
+
+RECENT_SALES_SQL = """
+    SELECT s.sale_date, m.Med_name, s.quantity, s.total
+    FROM sales s
+    JOIN medicines_info m ON s.medicine_code = m.Med_code
+    ORDER BY s.sale_date DESC
+    LIMIT 10
+"""
+
+# medicines_info nu are Created_at: cele mai noi după ROWID (aprox. ordinea inserării)
+RECENT_MEDICINES_SQL = """
+    SELECT Med_name, Qty, MRP, Exp
+    FROM medicines_info
+    ORDER BY rowid DESC
+    LIMIT 10
+"""
+
+
+class Snapshot(NamedTuple):
+    # DataFrame-urile sunt partajate între sesiuni: doar citire
+    kpis: Kpis = Kpis()
+    counts: AlertCounts = AlertCounts()
+    stock: pd.DataFrame = pd.DataFrame()
+    trend: pd.DataFrame = pd.DataFrame()
+    recent_sales: pd.DataFrame = pd.DataFrame()
+    recent_medicines: pd.DataFrame = pd.DataFrame()
+    built_at: float = 0.0       # time.time()
+    build_ms: float = 0.0
+
+
+def build(low_stock=LOW_STOCK_THRESHOLD):
+    # totul direct din baza de date (ttl=0): snapshot-ul e el însuși cache-ul
+    started = time.perf_counter()
+    kpis = get_kpis(low_stock, ttl=0)
+    counts = alert_counts(ttl=0)
+    frames = [cached_df(sql, ttl=0) for sql in (STOCK_SQL, TREND_SQL, RECENT_SALES_SQL, RECENT_MEDICINES_SQL)]
+    return Snapshot(kpis, counts, *frames, built_at=time.time(),
+                    build_ms=round((time.perf_counter() - started) * 1000, 3))
+
+
+class DashboardSnapshots:
+    # Scrierile pe TABLES marchează snapshot-ul ca vechi și trezesc thread-ul;
+    # sesiunile primesc mereu ultimul snapshot construit (cu ora lui), iar
+    # get() construiește pe loc doar dacă nu există încă unul, dacă e mai
+    # vechi de MAX_AGE sau dacă e vechi și thread-ul nu rulează (CLI, bench).
+
+    def __init__(self, low_stock=LOW_STOCK_THRESHOLD, interval=REFRESH_INTERVAL, max_age=MAX_AGE):
+        self.low_stock = low_stock
+        self.interval = interval
+        self.max_age = max_age
+        self._snapshot = None
+        self._stale = True
+        self._built_on = None           # today_sales / trend se schimbă la miezul nopții
+        self._lock = threading.Lock()   # protejează _stale
+        self._build_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stats = {"builds": 0, "served": 0, "on_demand": 0, "last_ms": 0.0, "errors": 0}
+        self.last_error = None
+
+    def invalidate(self, tables=None, codes=None):
+        if tables is not None and not tables & TABLES:
+            return
+        with self._lock:
+            self._stale = True
+        self._wake.set()
+
+    def refresh(self):
+        # o scriere în timpul construirii lasă _stale pe True -> încă o rundă
+        with self._build_lock:
+            # alertele întâi: refacerea lor scrie în alerts și ar marca din nou snapshot-ul ca vechi
+            alert_engine.sync()
+            with self._lock:
+                self._stale = False
+            try:
+                snapshot = perf.call("snapshot", "dashboard", build, self.low_stock)
+            except Exception:
+                with self._lock:
+                    self._stale = True
+                self._stats["errors"] += 1
+                raise
+            self._snapshot = snapshot
+            self._built_on = date.today()
+            self._stats["builds"] += 1
+            self._stats["last_ms"] = snapshot.build_ms
+            return snapshot
+
+    def get(self):
+        snapshot = self._snapshot
+        running = self._thread is not None and self._thread.is_alive()
+        if (snapshot is None or time.time() - snapshot.built_at > self.max_age
+                or self._built_on != date.today() or (self._stale and not running)):
+            self._stats["on_demand"] += 1
+            snapshot = self.refresh()
+        self._stats["served"] += 1
+        return snapshot
+
+    def _run(self):
+        while True:
+            if self._wake.wait(self.interval):
+                time.sleep(DEBOUNCE)
+            self._wake.clear()
+            with self._lock:
+                stale = self._stale
+            snapshot = self._snapshot
+            if not stale and snapshot is not None and time.time() - snapshot.built_at < self.interval:
+                continue
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+
+    def start(self):
+        # idempotent: un singur thread per proces (Streamlit rulează main la fiecare rerun)
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name="dashboard-snapshot", daemon=True)
+            self._thread.start()
+        self._wake.set()
+        return True
+
+    def stats(self):
+        snapshot = self._snapshot
+        with self._lock:
+            s = dict(self._stats)
+            s["stale"] = self._stale
+            s["running"] = self._thread is not None and self._thread.is_alive()
+        s["age_s"] = round(time.time() - snapshot.built_at, 1) if snapshot else None
+        return s
+
+
+dashboard_snapshots = DashboardSnapshots()
+on_write(dashboard_snapshots.invalidate)
+
+
+def get_dashboard():
+    return dashboard_snapshots.get()
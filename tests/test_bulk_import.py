@@ -0,0 +1,68 @@
+"""
+Validarea rândurilor din import: orice valoare greșită devine un rând respins,
+nu o excepție care oprește importul.
+"""
+
+import pytest
+
+from bulk_import import MAX_QTY, import_medicines, validate_row
+
+ROW = {"Med_code": "MED-1", "Med_name": "Paracetamol", "Qty": "10", "MRP": "2,50",
+       "Exp": "31.12.2027", "Mfg": "2025/01/15", "Purpose": " Pain "}
+
+
+def row(**values):
+    return {**ROW, **values}
+
+
+def test_valid_row():
+    assert validate_row(ROW) == ("MED-1", "Paracetamol", 10, 2.5, "2025-01-15", "2027-12-31", "Pain")
+
+
+@pytest.mark.parametrize("qty, expected", [("5.0", 5), ("1e3", 1000), (" 7 ", 7), (str(MAX_QTY), MAX_QTY)])
+def test_integral_qty(qty, expected):
+    assert validate_row(row(Qty=qty))[2] == expected
+
+
+@pytest.mark.parametrize("qty", ["nan", "inf", "-inf", "1e400", "2.7", "abc", "", "-1",
+                                 "1e19", "99999999999999999999", str(MAX_QTY + 1)])
+def test_invalid_qty(qty):
+    with pytest.raises(ValueError, match="Qty"):
+        validate_row(row(Qty=qty))
+
+
+@pytest.mark.parametrize("mrp", ["nan", "inf", "1e400", "0", "-3", "x"])
+def test_invalid_mrp(mrp):
+    with pytest.raises(ValueError, match="MRP"):
+        validate_row(row(MRP=mrp))
+
+
+@pytest.mark.parametrize("exp", ["2027-02-30", "31/13/2027", "2027-12", "soon"])
+def test_bad_dates(exp):
+    with pytest.raises(ValueError, match="invalid date"):
+        validate_row(row(Exp=exp))
+
+
+def test_missing_exp():
+    with pytest.raises(ValueError, match="missing Exp"):
+        validate_row(row(Exp=""))
+
+
+def test_mfg_after_exp():
+    with pytest.raises(ValueError, match="Mfg is after Exp"):
+        validate_row(row(Mfg="2028-01-01"))
+
+
+def test_overflowing_qty_is_rejected_not_fatal(db, tmp_path):
+    path = tmp_path / "delivery.csv"
+    path.write_text("Med_code,Med_name,Qty,MRP,Exp\n"
+                    "MED-1,Paracetamol,10,2.5,2027-12-31\n"
+                    "MED-2,Ibuprofen,1e19,3.1,2027-12-31\n"
+                    "MED-3,Aspirin,99999999999999999999,1.2,2027-12-31\n"
+                    "MED-4,Vitamin C,4,0.9,2027-12-31\n", encoding="utf-8")
+
+    result = import_medicines(path, chunk_size=2)
+
+    assert (result["imported"], result["rejected"]) == (2, 2)
+    assert [r["Med_code"] for r in result["rejects"]] == ["MED-2", "MED-3"]
+    assert db.query_scalar("SELECT SUM(Qty) FROM medicines_info") == 14
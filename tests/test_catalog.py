@@ -0,0 +1,93 @@
+"""
+Indexul de prefixe din memorie (catalog.MedicineIndex) rămâne la zi cu
+stocul: notificările doar marchează codurile, citirea le reîncarcă, iar o
+vânzare făcută în timpul unei reîncărcări complete nu se pierde.
+"""
+
+import pytest
+
+import catalog
+import db_sqlite
+from lots import add_medicine
+from sales import process_sale
+
+
+@pytest.fixture
+def index(db, monkeypatch):
+    for n, name in enumerate(["Paracetamol", "Parasinus", "Ibuprofen"]):
+        add_medicine(f"MED-{n}", name, 10, 2.0 + n)
+    index = catalog.MedicineIndex()
+    monkeypatch.setattr(db_sqlite, "_write_listeners", db_sqlite._write_listeners + [index.invalidate])
+    return index
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    sql = []
+    real = catalog.query_rows
+
+    def spy(query, params=None):
+        sql.append(query)
+        return real(query, params)
+
+    monkeypatch.setattr(catalog, "query_rows", spy)
+    return sql
+
+
+def test_search_by_name_and_code_prefix(index):
+    assert [e.code for e in index.search("para")] == ["MED-0", "MED-1"]
+    assert [e.code for e in index.search("med-2")] == ["MED-2"]
+    assert index.get("med-1").name == "Parasinus"
+
+
+def test_sale_notification_runs_no_sql(index, queries):
+    index.search("para")
+    queries.clear()
+
+    index.invalidate({"medicines_info"}, {"MED-0"})
+    assert queries == []
+    assert index.stats()["dirty"] == 1
+
+    assert index.get("MED-0").qty == 10
+    assert len(queries) == 1 and "IN (?)" in queries[0]
+    assert index.stats()["dirty"] == 0
+
+
+def test_sale_shows_up_on_next_read(index):
+    index.search("para")
+    process_sale("MED-0", 4)
+    assert index.get("MED-0").qty == 6
+
+
+def test_sale_during_full_reload_is_not_lost(index, monkeypatch):
+    real = catalog.query_rows
+    sold = []
+
+    def slow_load(query, params=None):
+        rows = real(query, params)
+        if not sold:
+            # vânzarea se salvează după ce reîncărcarea și-a citit rândurile
+            sold.append(process_sale("MED-1", 3))
+        return rows
+
+    monkeypatch.setattr(catalog, "query_rows", slow_load)
+    index.search("para")
+    assert sold
+    assert index.get("MED-1").qty == 7
+
+
+def test_full_invalidation_during_reload_reloads_again(index, monkeypatch):
+    real = catalog.query_rows
+    loads = []
+
+    def load(query, params=None):
+        loads.append(query)
+        if len(loads) == 1:
+            index.invalidate(None)
+        return real(query, params)
+
+    monkeypatch.setattr(catalog, "query_rows", load)
+    index.search("para")
+    index.search("para")
+    assert len(loads) == 2
+    assert index.stats()["loaded"]
@@ -0,0 +1,85 @@
+"""
+Contoarele top_sellers față de top_sql, pentru fiecare fereastră: vânzări
+prin coada de scriere (delta pe sale_id) și o schimbare de zi între ele
+(ferestrele alunecă fără reîncărcare).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import leaderboard
+from lots import add_medicine
+from sales import submit_sale
+from write_queue import WriteQueue
+
+# câte o zi care iese din fiecare fereastră la schimbarea zilei (ferestrele de ieri încep cu o zi mai devreme)
+HISTORY_DAYS = [0, 2, 6, 7, 8, 20, 30, 31, 60, 90, 91, 200]
+DAYS = [None, 7, 14, 30, 90]     # 14 nu e ținută gata adunată: se adună din zile
+MEDICINES = 12
+LIMIT = 20
+
+
+def _utc_day(days_ago):
+    return datetime.now(timezone.utc).date() - timedelta(days=days_ago)
+
+
+@pytest.fixture
+def top(db, monkeypatch):
+    for n in range(MEDICINES):
+        add_medicine(f"MED-{n:02d}", f"Medicine {n:02d}", 1000, 1.25 + 0.37 * n)
+    with db.connection() as conn:
+        conn.executemany("""
+            INSERT INTO sales (medicine_code, quantity, sale_price, total, sale_date)
+            SELECT Med_code, ?, MRP, ? * MRP, ? FROM medicines_info WHERE Med_code = ?
+        """, [(1 + (n * d) % 7, 1 + (n * d) % 7, f"{_utc_day(d)} 12:00:00", f"MED-{n:02d}")
+              for n in range(MEDICINES) for d in HISTORY_DAYS if (n + d) % 3])
+        conn.commit()
+
+    sellers = leaderboard.TopSellers()
+    monkeypatch.setattr(leaderboard, "top_sellers", sellers)
+    return sellers
+
+
+def _ranked(df, by):
+    # la scor egal ordinea nu e definită nici în SQL
+    column = "total_revenue" if by == "revenue" else "total_quantity"
+    return df.sort_values([column, "Med_name"], ascending=[False, True], ignore_index=True)
+
+
+def assert_matches_sql():
+    # limita acoperă toate medicamentele: fără tăieturi între scoruri egale
+    for days in DAYS:
+        for by in leaderboard.RANKINGS:
+            want = pd.DataFrame([r[1:] for r in leaderboard.top_sql(LIMIT, days, by)],
+                                columns=leaderboard.COLUMNS)
+            got = leaderboard.top_products(LIMIT, days, by)
+            pd.testing.assert_frame_equal(_ranked(got, by), _ranked(want, by),
+                                          check_exact=False, obj=f"days={days}, by={by}")
+
+
+def test_top_products_match_sql_across_rollover(top, monkeypatch):
+    queue = WriteQueue()
+
+    # contoarele încărcate "ieri": ferestrele pornesc cu o zi mai devreme
+    window_start = leaderboard.window_start
+    monkeypatch.setattr(leaderboard, "window_start", lambda days: window_start(int(days) + 1))
+    top.sync()
+    assert top.active
+
+    for future in [submit_sale(f"MED-{n % MEDICINES:02d}", 1 + n % 4, queue=queue) for n in range(40)]:
+        future.result(timeout=10)
+
+    # miezul nopții: aceleași contoare, ferestrele alunecă la următorul sync
+    monkeypatch.setattr(leaderboard, "window_start", window_start)
+    assert_matches_sql()
+    assert top.stats()["slides"] == len(leaderboard.WINDOWS)
+
+    for future in [submit_sale(f"MED-{n % 5:02d}", 3, queue=queue) for n in range(25)]:
+        future.result(timeout=10)
+    assert_matches_sql()
+
+    stats = top.stats()
+    assert stats["loads"] == 1
+    assert stats["sales"] == 65
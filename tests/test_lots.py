@@ -0,0 +1,64 @@
+"""
+Triggerele de loturi (db_sqlite._add_lots): vânzările consumă loturile FEFO,
+loturile fără expirare ies ultimele, medicines_info.Exp urmează loturile cu stoc.
+"""
+
+from lots import add_medicine, receive
+from sales import process_sale
+
+
+def lots_left(db, code):
+    return [(r["batch"], r["Qty"]) for r in db.query_rows(
+        "SELECT batch, Qty FROM lots WHERE Med_code = ? ORDER BY lot_id", [code])]
+
+
+def exp(db, code):
+    return db.query_scalar("SELECT Exp FROM medicines_info WHERE Med_code = ?", [code])
+
+
+def test_sale_consumes_earliest_expiry_first(db):
+    add_medicine("MED-1", "Paracetamol", 5, 2.5, exp="2027-06-01", batch="A")
+    receive("MED-1", 5, "2027-01-01", batch="B")
+    receive("MED-1", 5, "2027-03-01", batch="C")
+
+    process_sale("MED-1", 7)
+
+    assert lots_left(db, "MED-1") == [("A", 5), ("B", 0), ("C", 3)]
+    assert exp(db, "MED-1") == "2027-03-01"
+
+
+def test_lots_without_expiry_go_last(db):
+    add_medicine("MED-1", "Paracetamol", 4, 2.5, batch="none")
+    receive("MED-1", 3, "2027-06-01", batch="A")
+    receive("MED-1", 3, "2027-01-01", batch="B")
+
+    process_sale("MED-1", 5)
+    assert lots_left(db, "MED-1") == [("none", 4), ("A", 1), ("B", 0)]
+
+    process_sale("MED-1", 3)
+    assert lots_left(db, "MED-1") == [("none", 2), ("A", 0), ("B", 0)]
+
+
+def test_exp_follows_remaining_lots_after_depletion(db):
+    add_medicine("MED-1", "Paracetamol", 2, 2.5, exp="2027-01-01", batch="dated")
+    receive("MED-1", 5, None, batch="undated")
+    assert exp(db, "MED-1") == "2027-01-01"
+
+    # stocul rămas e doar în lotul fără expirare: nu mai păstrăm data lotului golit
+    process_sale("MED-1", 2)
+    assert lots_left(db, "MED-1") == [("dated", 0), ("undated", 5)]
+    assert exp(db, "MED-1") is None
+
+    receive("MED-1", 1, "2026-12-01", batch="new")
+    assert exp(db, "MED-1") == "2026-12-01"
+
+
+def test_sale_spanning_several_lots_keeps_totals(db):
+    add_medicine("MED-1", "Paracetamol", 3, 2.5, exp="2027-01-01", batch="A")
+    receive("MED-1", 3, "2027-02-01", batch="B")
+    receive("MED-1", 3, "2027-03-01", batch="C")
+
+    process_sale("MED-1", 9)
+
+    assert lots_left(db, "MED-1") == [("A", 0), ("B", 0), ("C", 0)]
+    assert db.query_scalar("SELECT Qty FROM medicines_info WHERE Med_code = 'MED-1'") == 0
@@ -0,0 +1,96 @@
+"""
+QueryCache: TTL, invalidare pe tabel și generația (o scriere în timpul
+citirii nu lasă în cache un rezultat vechi).
+"""
+
+import pytest
+
+import query_cache
+from lots import add_medicine
+from query_cache import QueryCache, cached_df
+from sales import process_sale
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def counting_loader(calls):
+    def load(sql, params):
+        calls.append((sql, tuple(params)))
+        return len(calls)
+    return load
+
+
+def test_hit_miss_and_ttl(clock):
+    cache, calls = QueryCache(default_ttl=10), []
+    load = counting_loader(calls)
+
+    assert cache.get("SELECT 1 FROM sales", [], load) == 1
+    assert cache.get("SELECT 1 FROM sales", [], load) == 1
+    assert cache.get("SELECT 1 FROM sales", [2], load) == 2      # alți parametri, altă cheie
+    clock[0] += 11
+    assert cache.get("SELECT 1 FROM sales", [], load) == 3
+    assert cache.get("SELECT 1 FROM sales", [], load, ttl=0) == 4
+    assert cache.stats()["expired"] == 1
+
+
+def test_invalidate_drops_only_entries_reading_the_table(clock):
+    cache, calls = QueryCache(), []
+    load = counting_loader(calls)
+    cache.get("SELECT * FROM sales s JOIN medicines_info m ON 1", [], load)
+    cache.get("SELECT * FROM users", [], load)
+
+    assert cache.invalidate({"medicines_info"}) == 1
+    cache.get("SELECT * FROM users", [], load)
+    assert len(calls) == 2
+    assert cache.invalidate(None) == 1
+
+
+def test_write_during_load_is_not_cached(clock):
+    cache, calls = QueryCache(), []
+
+    def load(sql, params):
+        calls.append(sql)
+        if len(calls) == 1:
+            cache.invalidate({"sales"})     # scriere între citire și salvarea în cache
+        return len(calls)
+
+    assert cache.get("SELECT * FROM sales", [], load) == 1
+    assert cache.get("SELECT * FROM sales", [], load) == 2
+    assert cache.get("SELECT * FROM sales", [], load) == 2
+
+
+def test_lru_eviction(clock):
+    cache, calls = QueryCache(max_entries=2), []
+    load = counting_loader(calls)
+    for sql in ("SELECT a FROM t", "SELECT b FROM t", "SELECT a FROM t", "SELECT c FROM t"):
+        cache.get(sql, [], load)
+    cache.get("SELECT a FROM t", [], load)
+    assert len(calls) == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_writes_invalidate_cached_frames(db):
+    add_medicine("MED-1", "Paracetamol", 10, 2.5)
+    stock_sql = "SELECT Qty FROM medicines_info WHERE Med_code = ?"
+    daily_sql = "SELECT COALESCE(SUM(qty), 0) AS qty FROM sales_daily"
+    assert cached_df(stock_sql, ["MED-1"], ttl=300)["Qty"].iloc[0] == 10
+    assert cached_df(daily_sql, ttl=300)["qty"].iloc[0] == 0
+
+    process_sale("MED-1", 4)
+
+    assert cached_df(stock_sql, ["MED-1"], ttl=300)["Qty"].iloc[0] == 6
+    # sales_daily e ținută de triggere: invalidată prin TABLE_DEPENDENTS
+    assert cached_df(daily_sql, ttl=300)["qty"].iloc[0] == 4
+
+
+def test_cached_frames_are_copies(db):
+    add_medicine("MED-1", "Paracetamol", 10, 2.5)
+    sql = "SELECT Med_code, Qty FROM medicines_info"
+    df = cached_df(sql, ttl=300)
+    df.loc[0, "Qty"] = -1
+    assert cached_df(sql, ttl=300)["Qty"].iloc[0] == 10
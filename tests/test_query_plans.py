@@ -0,0 +1,114 @@
+"""
+EXPLAIN QUERY PLAN pentru interogările fierbinți: fiecare trebuie să caute
+printr-un index (SEARCH/SCAN ... USING INDEX), fără scanarea tabelului și
+fără sortare temporară acolo unde ordinea vine din index.
+"""
+
+import pytest
+
+import catalog
+import lots
+import pagination
+import reports
+from views.common import Config
+
+
+@pytest.fixture
+def captured(db, monkeypatch):
+    # SQL-ul exact trimis de funcțiile reale (rulează și pe baza goală)
+    queries = []
+
+    def spy(sql, params=None, ttl=None):
+        queries.append((sql, list(params or [])))
+        return real(sql, params, 0)
+
+    real = pagination.cached_df
+    for module in (catalog, lots, pagination, reports):
+        monkeypatch.setattr(module, "cached_df", spy)
+    return queries
+
+
+def plan(db, query):
+    sql, params = query
+    return db.query_plan(sql, params)
+
+
+def assert_indexed(details, table, index, ordered=False):
+    rows = [d for d in details if d.split()[1:2] == [table]]
+    assert rows, details
+    assert all(("USING INDEX " + index) in d or ("USING COVERING INDEX " + index) in d
+               for d in rows), details
+    if ordered:
+        assert not any("TEMP B-TREE" in d for d in details), details
+
+
+def test_sales_by_date(db, captured):
+    reports.daily_report("2024-05-01")
+    details = plan(db, captured[-1])
+    assert_indexed(details, "s", "idx_sales_date")
+    assert any(d.startswith("SEARCH s") for d in details), details
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("after", [None, ["2024-05-01 10:00:00", 42]])
+def test_sales_keyset_page(db, captured, descending, after):
+    pagination.keyset_page(
+        "s.sale_id, s.sale_date, m.Med_name, s.total",
+        "sales s LEFT JOIN medicines_info m ON s.medicine_code = m.Med_code",
+        Config.SALES_SORTS["Date"], "s.sale_id",
+        where="s.sale_date >= date('now','start of month')",
+        descending=descending, after=after,
+    )
+    assert_indexed(plan(db, captured[-1]), "s", "idx_sales_date", ordered=True)
+
+
+@pytest.mark.parametrize("sort, index", [
+    ("Name", "idx_medicines_name"),
+    ("Code", "sqlite_autoindex_medicines_info_1"),
+    ("Quantity", "idx_medicines_qty_key"),
+    ("Price", "idx_medicines_price"),
+    ("Expiry", "idx_medicines_exp_key"),
+])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("after", [None, ["x", "MED-1"]])
+def test_medicines_keyset_page(db, captured, sort, index, descending, after):
+    pagination.keyset_page(
+        "Med_code, Med_name, Qty, MRP, Exp", "medicines_info",
+        Config.MEDICINE_SORTS[sort], "Med_code",
+        descending=descending, after=after,
+    )
+    assert_indexed(plan(db, captured[-1]), "medicines_info", index, ordered=True)
+
+
+def test_medicine_lots_fefo(db, captured):
+    lots.medicine_lots("MED-1")
+    details = plan(db, captured[-1])
+    assert_indexed(details, "l", "idx_lots_fefo")
+    assert any(d.startswith("SEARCH l") and "(Med_code=?)" in d for d in details), details
+
+
+def test_fefo_trigger_lookup(db):
+    # aceeași selecție ca în trg_lots_fefo, la fiecare vânzare
+    details = db.query_plan("""
+        SELECT lot_id, Qty,
+               SUM(Qty) OVER (ORDER BY COALESCE(Exp, '') = '', Exp, lot_id) AS running
+        FROM lots
+        WHERE Med_code = ? AND Qty > 0
+    """, ["MED-1"])
+    assert_indexed(details, "lots", "idx_lots_fefo")
+
+
+def test_expiry_queue(db, captured):
+    lots.expiry_queue(30)
+    assert_indexed(plan(db, captured[-1]), "l", "idx_lots_exp")
+
+
+def test_fts_lookup(db, captured):
+    with db.connection() as conn:
+        if not db.has_search_index(conn):
+            pytest.skip("SQLite fără FTS5")
+    catalog.search_medicines("parac")
+    details = plan(db, captured[-1])
+    assert any("medicines_fts VIRTUAL TABLE INDEX" in d and ":M" in d for d in details), details
+    assert any(d.startswith("SEARCH m USING INTEGER PRIMARY KEY") for d in details), details
+    assert not any(d.startswith("SCAN m ") for d in details), details
@@ -0,0 +1,69 @@
+"""
+checkout: reducerea se împarte pe linii (SUM(sales.total) = totalul bonului),
+coșul se cumulează pe cod, iar un coș invalid nu scrie nimic.
+"""
+
+import pytest
+
+from lots import add_medicine
+from sales import SaleError, checkout, process_sale
+
+
+@pytest.fixture
+def stock(db):
+    add_medicine("MED-1", "Paracetamol", 10, 3.33)
+    add_medicine("MED-2", "Ibuprofen", 10, 1.11)
+    add_medicine("MED-3", "Aspirin", 10, 0.99)
+    return db
+
+
+def lines(db, receipt_id):
+    return db.query_rows(
+        "SELECT medicine_code, quantity, sale_price, total FROM sales WHERE receipt_id = ? ORDER BY sale_id",
+        [receipt_id])
+
+
+def test_discount_split_matches_receipt_total(stock):
+    receipt = checkout([("MED-1", 1), ("MED-2", 1), ("MED-3", 1)], discount=1.0)
+
+    assert receipt["subtotal"] == pytest.approx(5.43)
+    assert receipt["total"] == pytest.approx(4.43)
+    rows = lines(stock, receipt["receipt_id"])
+    # fiecare linie rotunjită la bani; ultima preia diferența de rotunjire
+    assert [r["total"] for r in rows] == [2.72, 0.91, 0.80]
+    assert sum(r["total"] for r in rows) == pytest.approx(receipt["total"], abs=1e-9)
+    assert stock.query_scalar("SELECT total FROM receipts WHERE receipt_id = ?",
+                              [receipt["receipt_id"]]) == pytest.approx(4.43)
+
+
+def test_discount_larger_than_subtotal(stock):
+    receipt = checkout([("MED-1", 1), ("MED-2", 2)], discount=100)
+    assert receipt["total"] == 0
+    assert [r["total"] for r in lines(stock, receipt["receipt_id"])] == [0, 0]
+
+
+def test_same_code_is_cumulated(stock):
+    receipt = checkout([("MED-2", 2), ("MED-1", 1), ("MED-2", 3)])
+    assert [(r["medicine_code"], r["quantity"]) for r in lines(stock, receipt["receipt_id"])] == [
+        ("MED-2", 5), ("MED-1", 1)]
+    assert stock.query_scalar("SELECT Qty FROM medicines_info WHERE Med_code = 'MED-2'") == 5
+
+
+@pytest.mark.parametrize("items, message", [
+    ([("MED-1", 4), ("MED-2", 11)], "Not enough stock"),
+    ([("MED-1", 1), ("NOPE", 1)], "Medicine not found"),
+    ([("MED-1", 0)], "greater than 0"),
+    ([], "Basket is empty"),
+])
+def test_invalid_basket_writes_nothing(stock, items, message):
+    with pytest.raises(SaleError, match=message):
+        checkout(items)
+    assert stock.query_scalar("SELECT COUNT(*) FROM sales") == 0
+    assert stock.query_scalar("SELECT COUNT(*) FROM receipts") == 0
+    assert stock.query_scalar("SELECT SUM(Qty) FROM medicines_info") == 30
+
+
+def test_single_sale_discount(stock):
+    sale = process_sale("MED-1", 3, discount=0.5)
+    assert sale["total"] == pytest.approx(3 * 3.33 - 0.5)
+    assert sale["stock_left"] == 7
@@ -0,0 +1,23 @@
+"""
+views.common se importă pe fiecare pagină: nu trage după el serviciile
+unei singure pagini, iar pragul din Config rămâne cel al motorului de alerte.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import alerts
+from views.common import Config
+
+
+def test_low_stock_threshold_matches_alerts():
+    assert Config.LOW_STOCK_THRESHOLD == alerts.LOW_STOCK_THRESHOLD
+
+
+def test_common_does_not_import_page_services():
+    code = ("import sys, views.common; "
+            "print(sorted(m for m in ('alerts', 'reports', 'snapshot', 'catalog') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1])
+    assert out.stdout.strip() == "[]"
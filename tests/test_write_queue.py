@@ -0,0 +1,86 @@
+"""
+Coada de scriere: fiecare operație din lot are propriul SAVEPOINT, iar
+rezultatul unei operații salvate nu depinde de ce fac listenerii
+notify_write după commit.
+"""
+
+import pytest
+
+import db_sqlite
+from lots import add_medicine
+from sales import SaleError, checkout, submit_checkout, submit_sale
+from write_queue import WriteQueue
+
+
+@pytest.fixture
+def failing_listener(monkeypatch):
+    calls = []
+
+    def listener(tables, codes):
+        calls.append((tables, codes))
+        raise RuntimeError("listener failed")
+
+    monkeypatch.setattr(db_sqlite, "_write_listeners", db_sqlite._write_listeners + [listener])
+    return calls
+
+
+def _stock(db, code):
+    return db.query_scalar("SELECT Qty FROM medicines_info WHERE Med_code = ?", [code])
+
+
+def test_queued_checkout_survives_failing_listener(db, failing_listener):
+    add_medicine("MED-1", "Paracetamol", 10, 2.5)
+    receipt = submit_checkout([("MED-1", 2)], queue=WriteQueue()).result(timeout=10)
+
+    assert receipt["total"] == pytest.approx(5.0)
+    assert failing_listener
+    assert _stock(db, "MED-1") == 8
+    assert db.query_scalar("SELECT COUNT(*) FROM sales") == 1
+
+
+def test_direct_checkout_survives_failing_listener(db, failing_listener):
+    add_medicine("MED-1", "Paracetamol", 10, 2.5)
+    receipt = checkout([("MED-1", 3)])
+
+    assert receipt["total"] == pytest.approx(7.5)
+    assert _stock(db, "MED-1") == 7
+
+
+def _wipe_stock(conn, code):
+    # scrie, apoi eșuează: scrierea trebuie anulată doar pentru operația asta
+    conn.execute("UPDATE medicines_info SET Qty = 0 WHERE Med_code = ?", [code])
+    raise SaleError("boom")
+
+
+def test_failed_job_rolls_back_only_its_savepoint(db):
+    add_medicine("MED-1", "Paracetamol", 10, 2.5)
+    add_medicine("MED-2", "Ibuprofen", 10, 1.5)
+    queue = WriteQueue(max_wait=0.5)     # cele trei operații ajung în același lot
+
+    first = submit_sale("MED-1", 2, queue=queue)
+    failing = queue.submit(_wipe_stock, "MED-1", tables={"medicines_info"}, codes={"MED-1"})
+    last = submit_sale("MED-2", 3, queue=queue)
+
+    assert first.result(timeout=10)["stock_left"] == 8
+    with pytest.raises(SaleError, match="boom"):
+        failing.result(timeout=10)
+    assert last.result(timeout=10)["stock_left"] == 7
+
+    assert _stock(db, "MED-1") == 8
+    assert _stock(db, "MED-2") == 7
+    assert db.query_scalar("SELECT COUNT(*) FROM sales") == 2
+    stats = queue.stats()
+    assert (stats["batches"], stats["completed"], stats["failed"]) == (1, 2, 1)
+
+
+def test_business_error_does_not_fail_the_batch(db):
+    add_medicine("MED-1", "Paracetamol", 1, 2.5)
+    queue = WriteQueue(max_wait=0.5)
+
+    futures = [submit_sale("MED-1", 1, queue=queue) for _ in range(3)]
+
+    assert futures[0].result(timeout=10)["stock_left"] == 0
+    for future in futures[1:]:
+        with pytest.raises(SaleError, match="Not enough stock"):
+            future.result(timeout=10)
+    assert db.query_scalar("SELECT COUNT(*) FROM sales") == 1
@@ -0,0 +1,51 @@
+"""
+Paginile aplicației web. Fiecare secțiune display_* stă în modulul ei și se
+importă abia la prima deschidere a paginii (o singură dată per proces), deci
+un rol care nu vede Reports nu încarcă nici modulul, nici plotly.
+"""
+
+import importlib
+from typing import NamedTuple
+
+
+class Page(NamedTuple):
+    module: str
+    function: str
+    kwargs: dict = {}
+    roles: tuple = ()       # gol = orice rol care are pagina în meniu
+
+
+PAGES = {
+    "📊 Dashboard": Page("views.dashboard", "display_dashboard"),
+    "📦 Medicines": Page("views.medicines", "display_medicines"),
+    "💰 Sales": Page("views.sales", "display_sales"),
+    "📈 Reports": Page("views.reports", "display_reports"),
+    "💰 Finance": Page("views.reports", "display_reports", {"finance": True}),
+    "🚨 Alerts": Page("views.alerts", "display_alerts"),
+    "👥 Users": Page("views.users", "display_users", roles=("admin", "manager")),
+    "🔍 Search": Page("views.search", "display_search_only"),
+    "⚡ Performance": Page("views.performance", "display_performance", roles=("admin",)),
+}
+
+# meniu per rol (rolurile necunoscute primesc meniul de manager)
+MENUS = {
+    "admin": ["📊 Dashboard", "📦 Medicines", "💰 Sales", "📈 Reports", "🚨 Alerts", "👥 Users", "⚡ Performance"],
+    "pharmacist": ["📊 Dashboard", "📦 Medicines", "🔍 Search", "🚨 Alerts"],
+    "cashier": ["📊 Dashboard", "💰 Sales", "🔍 Search"],
+    "manager": ["📊 Dashboard", "📈 Reports", "💰 Finance", "🚨 Alerts"],
+}
+
+
+def menu(role):
+    return MENUS.get(role, MENUS["manager"])
+
+
+def allowed(label, role):
+    roles = PAGES[label].roles
+    return not roles or role in roles
+
+
+def load(label):
+    # funcția display_* a paginii; importul modulului se face o singură dată
+    page = PAGES[label]
+    return getattr(importlib.import_module(page.module), page.function)
@@ -0,0 +1,102 @@
+"""
+Alerts: stoc redus, expirări, toate notificările și pragurile per medicament.
+"""
+
+import streamlit as st
+import pandas as pd
+
+import perf
+from alerts import get_alerts, set_threshold, ALERT_TYPES, EXPIRY_DAYS
+from views.common import Config, DatabaseHelper
+
+
+@perf.instrumented("render")
+def display_alerts():
+    st.subheader("🚨 System Alerts & Notifications")
+
+    # toate tab-urile citesc aceeași tabelă alerts (o singură interogare)
+    df_all = DatabaseHelper.call("get_alerts: all", get_alerts, default=pd.DataFrame(), error="Alerts")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["⚠️ Low Stock", "📅 Expiry Alerts", "🔔 All Notifications", "⚙️ Thresholds"])
+
+    with tab1:
+        df = df_all[df_all["type"] == "low_stock"] if not df_all.empty else df_all
+
+        if not df.empty:
+            st.markdown(f"### ⚠️ Low Stock Alerts ({len(df)} items)")
+            st.dataframe(df[["Med_code", "Med_name", "Qty", "threshold", "reorder_qty", "MRP", "Exp"]],
+                         use_container_width=True)
+
+            need_to_order = df["reorder_qty"].clip(lower=0)
+            total_to_order = int(need_to_order.sum())
+            est_cost = float((need_to_order * df["MRP"]).sum())
+
+            st.markdown("---")
+            c1, c2 = st.columns(2)
+            c1.metric("Total Units to Order", total_to_order)
+            c2.metric("Estimated Cost (MRP-based)", f"${est_cost:.2f}")
+        else:
+            st.success("🎉 No low stock alerts!")
+
+    with tab2:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            df_expired = df_all[df_all["type"] == "expired"] if not df_all.empty else df_all
+            if not df_expired.empty:
+                st.markdown(f"### ❌ Expired ({len(df_expired)})")
+                for row in df_expired.itertuples(index=False):
+                    st.error(f"**{row.Med_name}** - Expired: {row.Exp} | Stock: {row.Qty}")
+            else:
+                st.success("✅ No expired medicines!")
+
+        with col2:
+            df_expiring = df_all[df_all["type"] == "expiring"] if not df_all.empty else df_all
+            if not df_expiring.empty:
+                st.markdown(f"### ⏰ Expiring Soon ({len(df_expiring)})")
+                for row in df_expiring.sort_values("days_left").itertuples(index=False):
+                    st.warning(f"**{row.Med_name}** - {int(row.days_left)} days left | Expires: {row.Exp} | Stock: {row.Qty}")
+            else:
+                st.success("✅ No medicines expiring soon!")
+
+    with tab3:
+        if not df_all.empty:
+            st.markdown(f"### 🔔 All Notifications ({len(df_all)})")
+            show = {"critical": st.error, "high": st.warning}
+            for a in df_all.itertuples(index=False):
+                show.get(a.priority, st.info)(
+                    f"{ALERT_TYPES.get(a.type, '🔔')} **{a.priority.upper()}**: {a.Med_name} - {a.message}"
+                )
+        else:
+            st.success("🎉 No notifications! All systems are normal.")
+
+    with tab4:
+        st.markdown(
+            f"Defaults: low stock at **≤ {Config.LOW_STOCK_THRESHOLD}** units, "
+            f"expiry warning **{EXPIRY_DAYS}** days ahead. Leave a field at 0 to use the default."
+        )
+        with st.form("alert_threshold_form"):
+            code = st.text_input("Medicine Code")
+            c1, c2 = st.columns(2)
+            low_stock = c1.number_input("Low stock at (units)", min_value=0, value=0)
+            expiry_days = c2.number_input("Warn days before expiry", min_value=0, value=0)
+            if st.form_submit_button("💾 Save Threshold", use_container_width=True):
+                code = code.strip()
+                if not code or DatabaseHelper.get_scalar(
+                        "SELECT 1 FROM medicines_info WHERE Med_code = ?", [code]) is None:
+                    st.error("Medicine not found!")
+                else:
+                    try:
+                        set_threshold(code, int(low_stock) or None, int(expiry_days) or None)
+                        st.success(f"✅ Thresholds saved for {code}")
+                    except Exception as e:
+                        st.error(f"❌ Error: {e}")
+
+        df = DatabaseHelper.get_dataframe("""
+            SELECT t.Med_code, m.Med_name, m.Qty, t.low_stock, t.expiry_days
+            FROM alert_thresholds t
+            LEFT JOIN medicines_info m ON m.Med_code = t.Med_code
+            ORDER BY t.Med_code
+        """)
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
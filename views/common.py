@@ -0,0 +1,180 @@
+"""
+Partea comună a paginilor: configurarea, DatabaseHelper (apelurile la baza de
+date cu erorile afișate în pagină) și componentele folosite pe mai multe
+pagini (paginare, export). Serviciile unei singure pagini (rapoarte, snapshot,
+catalog, alerte) se importă în modulul paginii, la prima ei deschidere.
+"""
+
+import streamlit as st
+from db_sqlite import exec_sql, query_one, query_scalar
+from query_cache import cached_df
+from pagination import keyset_page, Page
+import perf
+import pandas as pd
+from datetime import datetime
+import io
+import tempfile
+
+
+# ====================== CONFIGURARE ======================
+class Config:
+    ROLES = ["admin", "pharmacist", "manager", "cashier"]
+
+    # IMPORTANT: deoarece nu vrem să stricăm medicines_info,
+    # folosim un prag fix pentru low-stock (pragurile per medicament
+    # stau în alert_thresholds). Aceeași valoare ca alerts.LOW_STOCK_THRESHOLD,
+    # scrisă aici ca să nu importăm motorul de alerte pe fiecare pagină
+    LOW_STOCK_THRESHOLD = 20
+
+    # coloane după care se poate sorta (expresii SQL, paginare keyset)
+    MEDICINE_SORTS = {
+        "Name": "Med_name",
+        "Code": "Med_code",
+        "Quantity": "Qty",
+        "Price": "MRP",
+        "Expiry": "COALESCE(Exp, '')",
+    }
+    SALES_SORTS = {
+        "Date": "s.sale_date",
+        "Total": "s.total",
+        "Quantity": "s.quantity",
+    }
+
+    # câte rezultate arată selecția de medicamente din New Sale
+    PICKER_RESULTS = 20
+
+    # secunde cât așteaptă casa rezultatul vânzării din coada de scriere
+    SALE_TIMEOUT = 30
+
+    # panoul Performance (admin): câte evenimente lente arată, fișierul de log implicit
+    PERF_SLOWEST = 25
+    PERF_LOG = "perf_events.jsonl"
+
+
+# ====================== FUNCȚII UTILITARE (SQLite) ======================
+class DatabaseHelper:
+    @staticmethod
+    def get_dataframe(query, params=None, ttl=None):
+        # ttl=None -> TTL implicit din cache; ttl=0 -> fără cache
+        try:
+            return perf.call("helper", perf.sql_name(query), cached_df, query, params or [], ttl=ttl)
+        except Exception as e:
+            st.error(f"❌ DataFrame error: {e}")
+            return pd.DataFrame()
+
+    @staticmethod
+    def get_one(query, params=None):
+        try:
+            return perf.call("helper", perf.sql_name(query), query_one, query, params or [])
+        except Exception as e:
+            st.error(f"❌ Query error: {e}")
+            return None
+
+    @staticmethod
+    def get_scalar(query, params=None, default=None):
+        try:
+            return perf.call("helper", perf.sql_name(query), query_scalar, query, params or [], default)
+        except Exception as e:
+            st.error(f"❌ Query error: {e}")
+            return default
+
+    @staticmethod
+    def execute(query, params=None, codes=None):
+        try:
+            return perf.call("helper", perf.sql_name(query), exec_sql, query, params or [], codes)
+        except Exception as e:
+            st.error(f"❌ Query error: {e}")
+            return 0
+
+    @staticmethod
+    def call(name, fn, *args, default=None, error="Query", **kwargs):
+        # apelurile specifice unei pagini: funcția vine din modulul paginii
+        try:
+            return perf.call("helper", name, fn, *args, **kwargs)
+        except Exception as e:
+            st.error(f"❌ {error} error: {e}")
+            return default
+
+    @staticmethod
+    def get_page(*args, **kwargs):
+        try:
+            return perf.call("helper", "keyset_page", keyset_page, *args, **kwargs)
+        except Exception as e:
+            st.error(f"❌ DataFrame error: {e}")
+            return Page(pd.DataFrame(), None)
+
+
+# st.fragment (Streamlit >= 1.37) rerulează doar secțiunea decorată la
+# interacțiuni din ea; pe versiuni mai vechi secțiunea rulează cu toată pagina
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+# download_button cu data callable (Streamlit >= 1.52): conținutul se produce
+# abia la click, nu la fiecare rerun, și nu trece prin scriptul paginii
+LAZY_DOWNLOADS = tuple(int(p) for p in st.__version__.split(".")[:2]) >= (1, 52)
+
+
+# Paginare: stiva de cursoare din session_state (ultimul = pagina curentă);
+# se resetează când se schimbă sortarea / filtrele / mărimea paginii.
+def page_cursor(state_key, signature):
+    if st.session_state.get(f"{state_key}_sig") != signature:
+        st.session_state[f"{state_key}_sig"] = signature
+        st.session_state[state_key] = [None]
+    return st.session_state[state_key][-1]
+
+
+def render_pager(state_key, page, total_rows, page_size):
+    stack = st.session_state[state_key]
+    pages = max(1, -(-int(total_rows) // int(page_size)))
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        if st.button("◀ Prev", key=f"{state_key}_prev", disabled=len(stack) <= 1, use_container_width=True):
+            stack.pop()
+            st.rerun()
+    with c2:
+        st.caption(f"Page {len(stack)} of {pages} · {int(total_rows):,} rows")
+    with c3:
+        if st.button("Next ▶", key=f"{state_key}_next", disabled=page.next_cursor is None, use_container_width=True):
+            stack.append(page.next_cursor)
+            st.rerun()
+
+
+# Export: fișierul se scrie pe bucăți într-un fișier temporar (fără DataFrame)
+# și se dă download_button ca fișier, la click; doar pe Streamlit vechi
+# exportul rulează la "Export" și se citește în memorie
+def render_export(dataset, key, start=None, end=None, label="📥 Export Data"):
+    # export.py se încarcă doar pe paginile cu export (Medicines, Sales)
+    from export import export, available_formats, FORMATS
+
+    fmt = st.selectbox("Export as", available_formats(), key=f"{key}_format")
+    ext, mime = FORMATS[fmt]
+    file_name = f"{dataset}_{datetime.now():%Y%m%d}{ext}"
+
+    if LAZY_DOWNLOADS:
+        def build():
+            # rulează în handler-ul de download (fără st.*); BufferedReader e tipul
+            # de fișier acceptat de download_button și ține fișierul temporar deschis
+            tmp = tempfile.TemporaryFile()
+            export(dataset, tmp, fmt=fmt, start=start, end=end)
+            tmp.flush()
+            return io.BufferedReader(tmp)
+
+        st.download_button(label, data=build, file_name=file_name, mime=mime,
+                           key=f"{key}_download", use_container_width=True)
+        return
+
+    if st.button(label, key=f"{key}_run", use_container_width=True):
+        with tempfile.TemporaryFile() as tmp:
+            try:
+                with st.spinner("Exporting..."):
+                    result = export(dataset, tmp, fmt=fmt, start=start, end=end)
+            except Exception as e:
+                st.error(f"Export error: {e}")
+                return
+            tmp.seek(0)
+            st.download_button(
+                label=f"Download {fmt.upper()} ({result['rows']:,} rows)",
+                data=tmp.read(),
+                file_name=file_name,
+                mime=mime,
+                key=f"{key}_download"
+            )
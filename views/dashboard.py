@@ -0,0 +1,97 @@
+"""
+Dashboard: indicatori, grafice (stoc pe categorii, vânzări 7 zile) și activitatea recentă.
+"""
+
+import streamlit as st
+import plotly.express as px
+from datetime import datetime
+
+import perf
+from snapshot import get_dashboard, Snapshot
+from views.common import DatabaseHelper
+
+
+@perf.instrumented("render")
+def display_dashboard():
+    # totul din snapshot-ul partajat (snapshot.py): fără SQL în cazul obișnuit
+    snap = DatabaseHelper.call("get_dashboard", get_dashboard, default=Snapshot(), error="Dashboard")
+    kpis, counts = snap.kpis, snap.counts
+    if snap.built_at:
+        st.caption(f"🕐 Last updated {datetime.fromtimestamp(snap.built_at):%H:%M:%S}")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+        <h3>📦</h3>
+        <h2>{kpis.total_medicines}</h2>
+        <p>Total Medicines</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+        <h3>⚠️</h3>
+        <h2>{counts.low_stock}</h2>
+        <p>Below Reorder Point</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+        <h3>💰</h3>
+        <h2>${kpis.today_sales:.2f}</h2>
+        <p>Today's Sales</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card">
+        <h3>📅</h3>
+        <h2>{counts.expiring}</h2>
+        <p>Expiring Soon (30 days)</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("📊 Stock Overview")
+        df = snap.stock
+        if not df.empty:
+            fig = px.pie(df, values="count", names="GroupKey")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No data available")
+
+    with col2:
+        st.subheader("📈 Sales Trend (Last 7 Days)")
+        df = snap.trend
+        if not df.empty:
+            fig = px.line(df, x="date", y="sales", markers=True, title="Daily Sales")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No sales data for the last 7 days")
+
+    st.subheader("🕐 Recent Activities")
+    tab1, tab2 = st.tabs(["Recent Sales", "Recent Medicines"])
+
+    with tab1:
+        df = snap.recent_sales
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.info("No recent sales")
+
+    with tab2:
+        # cele mai noi după ROWID (medicines_info nu are Created_at)
+        df = snap.recent_medicines
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.info("No medicines in database")
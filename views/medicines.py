@@ -0,0 +1,226 @@
+"""
+Medicines: listă paginată, adăugare, căutare, stoc redus, import și loturi.
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+
+import perf
+from bulk_import import import_medicines, rejects_csv, CHUNK_SIZE
+from alerts import low_stock_alerts
+from catalog import search_medicines, SEARCH_FIELDS, SEARCH_LIMIT
+from lots import add_medicine, receive, medicine_lots
+from pagination import PAGE_SIZES
+from reorder import compute_reorder_points, WINDOW_DAYS
+from views.common import Config, DatabaseHelper, page_cursor, render_pager, render_export
+
+
+@perf.instrumented("render")
+def display_medicines():
+    st.subheader("📦 Medicine Management")
+
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
+        ["📋 View All", "➕ Add New", "🔍 Search", "⚠️ Low Stock", "📥 Import", "🏷️ Lots"]
+    )
+
+    # View All
+    with tab1:
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            if st.button("🔄 Refresh Data", use_container_width=True):
+                st.rerun()
+
+            render_export("medicines", "meds_export")
+
+        with col1:
+            c1, c2, c3 = st.columns(3)
+            sort_by = c1.selectbox("Sort by", list(Config.MEDICINE_SORTS), key="meds_sort")
+            descending = c2.selectbox("Order", ["Ascending", "Descending"], key="meds_order") == "Descending"
+            page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=1, key="meds_page_size")
+
+        summary = DatabaseHelper.get_one("""
+            SELECT COUNT(*) AS n,
+                   COALESCE(SUM(Qty * MRP), 0) AS total_value,
+                   COALESCE(AVG(MRP), 0) AS avg_price
+            FROM medicines_info
+        """)
+        total_rows = int(summary["n"]) if summary else 0
+
+        if total_rows:
+            cursor = page_cursor("meds_pages", (sort_by, descending, page_size))
+            page = DatabaseHelper.get_page(
+                "Med_code, Med_name, Qty, MRP, Mfg, Exp, Purpose",
+                "medicines_info",
+                Config.MEDICINE_SORTS[sort_by],
+                "Med_code",
+                descending=descending,
+                after=cursor,
+                page_size=page_size
+            )
+            st.dataframe(page.rows, use_container_width=True, height=420)
+            render_pager("meds_pages", page, total_rows, page_size)
+
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Total Medicines", total_rows)
+            c2.metric("Total Inventory Value", f"${float(summary['total_value']):,.2f}")
+            c3.metric("Average Price", f"${float(summary['avg_price']):.2f}")
+        else:
+            st.info("No medicines found in database")
+
+    # Add New
+    with tab2:
+        with st.form("add_medicine_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                med_code = st.text_input("Medicine Code *", help="Unique code for the medicine")
+                med_name = st.text_input("Medicine Name *")
+                quantity = st.number_input("Quantity *", min_value=0, value=10)
+                mrp = st.number_input("MRP (Price) *", min_value=0.0, value=0.0, format="%.2f")
+
+            with col2:
+                mfg_date = st.date_input("Manufacturing Date", value=datetime.now().date())
+                exp_date = st.date_input("Expiry Date *", value=(datetime.now() + timedelta(days=365)).date())
+                batch = st.text_input("Batch / Lot No.")
+                purpose = st.text_area("Purpose")
+
+            submitted = st.form_submit_button("💾 Save Medicine", use_container_width=True)
+
+            if submitted:
+                if not med_code or not med_name or mrp <= 0:
+                    st.error("Please fill all required fields (*) and MRP > 0")
+                else:
+                    try:
+                        add_medicine(
+                            med_code.strip(),
+                            med_name.strip(),
+                            int(quantity),
+                            float(mrp),
+                            str(mfg_date),
+                            str(exp_date),
+                            (purpose or "").strip(),
+                            batch=batch.strip() or None
+                        )
+                        st.success(f"✅ Medicine '{med_name}' added successfully!")
+                        st.balloons()
+                    except Exception as e:
+                        st.error(f"❌ Failed to add medicine: {e}")
+
+    # Search
+    with tab3:
+        col1, col2 = st.columns([1, 3])
+
+        with col1:
+            search_by = st.selectbox("Search by", list(SEARCH_FIELDS))
+            search_term = st.text_input("Search term")
+            limit = st.number_input("Max results", min_value=10, max_value=500, value=SEARCH_LIMIT, step=10)
+
+        with col2:
+            if search_term:
+                df = DatabaseHelper.call(f"search_medicines: {search_by}", search_medicines, search_term, search_by,
+                                         limit, default=pd.DataFrame(), error="Search")
+                if not df.empty:
+                    st.dataframe(df, use_container_width=True)
+                    st.info(f"Found {len(df)} results")
+                else:
+                    st.warning("No results found")
+            else:
+                st.info("Enter a search term to find medicines")
+
+    # Low Stock: pragul per medicament vine din reorder_points (viteza vânzărilor)
+    with tab4:
+        df = DatabaseHelper.call("low_stock_alerts", low_stock_alerts, default=pd.DataFrame(), error="Alerts")
+
+        if not df.empty:
+            st.markdown(f"### ⚠️ Low Stock Alert ({len(df)} items)")
+            st.dataframe(df, use_container_width=True)
+
+            total_order_qty = int(df["reorder_qty"].clip(lower=0).sum())
+            est_value = float((df["reorder_qty"].clip(lower=0) * df["MRP"]).sum())
+
+            c1, c2 = st.columns(2)
+            c1.metric("Suggested Total to Order", f"{total_order_qty} units")
+            c2.metric("Estimated Cost (MRP-based)", f"${est_value:.2f}")
+        else:
+            st.success("🎉 No low stock items!")
+
+        computed = DatabaseHelper.get_one("SELECT COUNT(*) AS n, MAX(computed_at) AS at FROM reorder_points")
+        if computed and computed["n"]:
+            st.caption(f"Reorder points for {computed['n']:,} medicines from the last {WINDOW_DAYS} days "
+                       f"of sales (computed {computed['at']}); the rest use ≤ {Config.LOW_STOCK_THRESHOLD} units.")
+        if st.button("🔄 Recompute Reorder Points", use_container_width=True):
+            try:
+                with st.spinner("Computing..."):
+                    result = compute_reorder_points()
+                st.success(f"✅ {result['medicines']:,} medicines in {result['elapsed']:.1f}s")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
+    # Import (livrări: CSV/Excel, upsert pe Med_code, cantitățile se adună la stoc)
+    with tab5:
+        st.markdown(
+            "Required columns: **Med_code, Med_name, Qty, MRP, Exp** (optional: Mfg, Purpose, Batch). "
+            "Existing codes get the quantity added to stock as a new batch."
+        )
+        uploaded = st.file_uploader("Delivery file", type=["csv", "xlsx"])
+        chunk_size = st.number_input("Rows per batch", min_value=500, max_value=50000, value=CHUNK_SIZE, step=500)
+
+        if uploaded is not None and st.button("📥 Import", use_container_width=True):
+            bar = st.progress(0.0, text="Importing...")
+
+            def progress(rows, fraction):
+                bar.progress(fraction or 0.0, text=f"{rows:,} rows read")
+
+            try:
+                result = import_medicines(uploaded, chunk_size=int(chunk_size), filename=uploaded.name, progress=progress)
+            except Exception as e:
+                st.error(f"❌ Import failed: {e}")
+            else:
+                bar.progress(1.0, text=f"{result['rows_read']:,} rows read")
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Imported", f"{result['imported']:,}")
+                c2.metric("Rejected", f"{result['rejected']:,}")
+                c3.metric("Time", f"{result['elapsed']:.1f}s")
+
+                if result["rejected"]:
+                    st.warning(f"⚠️ {result['rejected']:,} rows were rejected")
+                    st.dataframe(pd.DataFrame(result["rejects"]).head(100), use_container_width=True)
+                    st.download_button(
+                        label="📥 Download Rejected Rows",
+                        data=rejects_csv(result["rejects"]),
+                        file_name="rejected_rows.csv",
+                        mime="text/csv"
+                    )
+                else:
+                    st.success("✅ All rows imported successfully!")
+
+    # Loturi: livrări noi pe un cod existent (cu expirarea lor) + stocul pe loturi
+    with tab6:
+        lot_code = st.text_input("Medicine Code", key="lots_code").strip()
+        med = DatabaseHelper.get_one(
+            "SELECT Med_code, Med_name, Qty, Exp FROM medicines_info WHERE Med_code = ?", [lot_code]
+        ) if lot_code else None
+
+        if lot_code and med is None:
+            st.warning("Medicine not found")
+        elif med is not None:
+            st.markdown(f"**{med['Med_name']}** — {int(med['Qty'])} units, next expiry {med['Exp'] or '-'}")
+            df = medicine_lots(med["Med_code"])
+            if not df.empty:
+                st.caption("Sold first-expiry-first-out, top to bottom")
+                st.dataframe(df, use_container_width=True)
+
+            with st.form("receive_lot_form"):
+                c1, c2, c3 = st.columns(3)
+                lot_qty = c1.number_input("Quantity received", min_value=1, value=10)
+                lot_exp = c2.date_input("Expiry Date", value=(datetime.now() + timedelta(days=365)).date())
+                lot_batch = c3.text_input("Batch / Lot No.")
+                if st.form_submit_button("📦 Receive Batch", use_container_width=True):
+                    try:
+                        receive(med["Med_code"], int(lot_qty), str(lot_exp), batch=lot_batch.strip() or None)
+                        st.success(f"✅ {int(lot_qty)} units received")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"❌ Error: {e}")
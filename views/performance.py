@@ -0,0 +1,86 @@
+"""
+Performance (admin): latențe din perf, cele mai lente evenimente, statistici interne.
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+import perf
+from alerts import alert_engine
+from db_sqlite import pool_stats
+from query_cache import cache_stats
+from snapshot import dashboard_snapshots
+from leaderboard import top_sellers
+from write_queue import write_queue
+from views.common import Config
+
+
+@perf.instrumented("render")
+def display_performance():
+    st.subheader("⚡ Performance")
+    st.caption(f"Last {len(perf.recorder.events())} events (ring buffer of {perf.BUFFER_SIZE}, all sessions).")
+
+    kinds = {"Reruns": "rerun", "Sections": "render", "Helpers": "helper", "Queries": "query", "Writes": "write",
+             "Snapshots": "snapshot"}
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Latency", "🐢 Slowest", "🔧 Internals", "📝 Log"])
+
+    with tab1:
+        kind = kinds[st.radio("Show", list(kinds), horizontal=True, key="perf_kind")]
+        df = pd.DataFrame(perf.summary(kind))
+        if not df.empty:
+            st.dataframe(df.drop(columns="kind"), use_container_width=True)
+        else:
+            st.info("No events recorded yet.")
+
+    with tab2:
+        events = perf.slowest(Config.PERF_SLOWEST, kinds[st.selectbox("Kind", list(kinds), index=3)])
+        if events:
+            df = pd.DataFrame(events)
+            df["ts"] = [perf.event_time(e) for e in events]
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.info("No events recorded yet.")
+
+    with tab3:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Connection pool**")
+            st.json(pool_stats())
+            st.markdown("**Query cache**")
+            st.json(cache_stats())
+        with col2:
+            st.markdown("**Write queue**")
+            st.json(write_queue.stats())
+            st.markdown("**Alert engine**")
+            st.json(alert_engine.stats())
+            st.markdown("**Dashboard snapshot**")
+            st.json(dashboard_snapshots.stats())
+            st.markdown("**Top sellers**")
+            st.json(top_sellers.stats())
+
+    with tab4:
+        st.download_button(
+            "📥 Download events (JSON lines)",
+            data=perf.to_jsonl(),
+            file_name=f"perf_{datetime.now():%Y%m%d_%H%M%S}.jsonl",
+            mime="application/x-ndjson",
+        )
+        if perf.recorder.log_path:
+            st.success(f"Logging to {perf.recorder.log_path}")
+            if st.button("⏹️ Stop logging"):
+                perf.recorder.stop_log()
+                st.rerun()
+        else:
+            # cale fixă din Config: panoul nu scrie unde cere utilizatorul
+            st.caption(f"Log file: {Config.PERF_LOG}")
+            if st.button("▶️ Start logging"):
+                try:
+                    perf.recorder.start_log(Config.PERF_LOG)
+                    st.rerun()
+                except OSError as e:
+                    st.error(f"❌ Error: {e}")
+
+        if st.button("🗑️ Clear events"):
+            perf.recorder.clear()
+            st.rerun()
@@ -0,0 +1,184 @@
+"""
+Reports / Finance: rapoartele din reports.py afișate cu grafice și descărcări.
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+from functools import partial
+
+import perf
+from reports import run_report, render, RENDER_FORMATS, TOP_PERIODS
+from views.common import LAZY_DOWNLOADS, Config, DatabaseHelper
+
+
+def get_report(name, **params):
+    return DatabaseHelper.call(f"report: {name}", run_report, name, error="Report", **params)
+
+
+def _rendered(report, fmt):
+    # Streamlit < 1.52: rapoartele se refac la fiecare rerun (din cache-ul de
+    # interogări), deci cheia e conținutul lor, nu obiectul
+    key = (report.name, repr(report.params), repr(report.metrics),
+           tuple(len(t) for t in report.tables.values()), fmt)
+    cache = st.session_state.setdefault("report_downloads", {})
+    if key not in cache:
+        if len(cache) >= 3 * len(RENDER_FORMATS):
+            cache.clear()
+        cache[key] = render(report, fmt)
+    return cache[key]
+
+
+# Rapoarte: valorile vin din reports.py (aceleași ca în CLI), aici doar afișare
+def render_metrics(report):
+    cols = st.columns(len(report.metrics))
+    for col, (label, value) in zip(cols, report.metrics.items()):
+        if isinstance(value, float):
+            col.metric(label, f"${value:,.2f}")
+        else:
+            col.metric(label, f"{int(value):,}")
+
+
+def render_report_download(report):
+    # butoane directe (nu selectbox): rapoartele zilnic/lunar apar doar după
+    # "Generate", iar orice widget nou ar reporni scriptul și le-ar ascunde.
+    # Fișierul se generează la click (LAZY_DOWNLOADS); altfel o singură dată
+    # per raport și format, păstrat în session_state
+    mimes = {"csv": "text/csv", "json": "application/json", "html": "text/html"}
+    for col, fmt in zip(st.columns(len(RENDER_FORMATS)), RENDER_FORMATS):
+        col.download_button(
+            label=f"📥 {fmt.upper()}",
+            data=partial(render, report, fmt) if LAZY_DOWNLOADS else _rendered(report, fmt),
+            file_name=f"{report.name}_report_{datetime.now():%Y%m%d}.{fmt}",
+            mime=mimes[fmt],
+            key=f"report_{report.name}_{fmt}",
+            use_container_width=True
+        )
+
+
+@perf.instrumented("render")
+def display_reports(finance=False):
+    st.subheader("📈 Reports & Analytics")
+
+    report_types = ["Daily Sales Report", "Monthly Summary", "Inventory Report", "Top Selling Products",
+                    "Expiry Report", "Financial Summary"]
+    # pagina Finance (manager) pornește direct pe Financial Summary
+    report_type = st.selectbox(
+        "Select Report Type",
+        report_types,
+        index=report_types.index("Financial Summary") if finance else 0
+    )
+
+    if report_type == "Daily Sales Report":
+        date = st.date_input("Select Date", value=datetime.now().date())
+
+        if st.button("Generate Report", use_container_width=True):
+            report = get_report("daily", day=date)
+
+            if report and not report.empty:
+                render_metrics(report)
+
+                st.subheader("📋 Detailed Sales")
+                st.dataframe(report.tables["sales"], use_container_width=True)
+
+                st.subheader("🏆 Top Products of the Day")
+                top_products = report.tables["top_products"]
+                fig = px.bar(top_products, x="Med_name", y="quantity",
+                             title="Top 5 Products by Quantity",
+                             labels={'Med_name': 'Product', 'quantity': 'Quantity Sold'})
+                st.plotly_chart(fig, use_container_width=True)
+                render_report_download(report)
+            else:
+                st.info(f"No sales recorded on {date}")
+
+    elif report_type == "Monthly Summary":
+        months = pd.date_range(end=datetime.now(), periods=12, freq="ME").strftime("%Y-%m").tolist()
+        month = st.selectbox("Select Month", months)
+
+        if st.button("Generate Monthly Report", use_container_width=True):
+            report = get_report("monthly", month=month)
+
+            if report and not report.empty:
+                st.subheader(f"📅 {report.title}")
+                render_metrics(report)
+
+                df = report.tables["days"]
+                fig = px.line(df, x="date", y="daily_total", title="Daily Revenue Trend", markers=True)
+                st.plotly_chart(fig, use_container_width=True)
+
+                st.dataframe(df, use_container_width=True)
+                render_report_download(report)
+            else:
+                st.info(f"No data available for {month}")
+
+    elif report_type == "Inventory Report":
+        report = get_report("inventory")
+        if report and not report.empty:
+            st.subheader(f"📦 {report.title}")
+            df = report.tables["purposes"]
+
+            fig1 = px.pie(df, values="total_value", names="GroupKey", title="Inventory Value by Purpose")
+            st.plotly_chart(fig1, use_container_width=True)
+
+            fig2 = px.bar(df, x="GroupKey", y="total_qty", title="Stock Quantity by Purpose")
+            st.plotly_chart(fig2, use_container_width=True)
+
+            st.dataframe(df, use_container_width=True)
+            render_metrics(report)
+            render_report_download(report)
+        else:
+            st.info("No inventory data available")
+
+    elif report_type == "Top Selling Products":
+        col1, col2 = st.columns(2)
+        period = col1.selectbox("Time Period", list(TOP_PERIODS))
+        by = col2.selectbox("Rank by", ["Revenue", "Quantity"])
+        report = get_report("top", days=TOP_PERIODS[period], by=by.lower())
+
+        if report and not report.empty:
+            st.subheader(f"🏆 {report.title}")
+            df = report.tables["products"]
+
+            fig1 = px.bar(df, x="Med_name", y="total_revenue", title="Top Products by Revenue")
+            st.plotly_chart(fig1, use_container_width=True)
+
+            fig2 = px.bar(df, x="Med_name", y="total_quantity", title="Top Products by Quantity Sold")
+            st.plotly_chart(fig2, use_container_width=True)
+
+            st.dataframe(df, use_container_width=True)
+            render_report_download(report)
+        else:
+            st.info("No sales data for selected period")
+
+    elif report_type == "Expiry Report":
+        days = st.selectbox("Horizon", [30, 60, 90, 180, 365], index=2, format_func=lambda d: f"Next {d} days")
+        report = get_report("expiry", days=days)
+
+        if report and not report.empty:
+            st.subheader(f"📅 {report.title}")
+            render_metrics(report)
+
+            df = report.tables["lots"]
+            by_month = df.assign(month=df["Exp"].str[:7]).groupby("month", as_index=False)["value"].sum()
+            fig = px.bar(by_month, x="month", y="value", title="Stock Value by Expiry Month")
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.dataframe(df, use_container_width=True)
+            render_report_download(report)
+        else:
+            st.info("No batches expiring in this period")
+
+    elif report_type == "Financial Summary":
+        report = get_report("financial", low_stock_threshold=Config.LOW_STOCK_THRESHOLD)
+        if report is None:
+            return
+
+        st.subheader("💰 Financial Summary")
+        render_metrics(report)
+
+        df = report.tables["months"]
+        if not df.empty:
+            fig = px.line(df, x="month", y="monthly_sales",
+                          title="Monthly Sales Trend (Last 6 Months)", markers=True)
+            st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,264 @@
+"""
+Sales: casa (New Sale, coș + scanare) și istoricul vânzărilor cu trend.
+"""
+
+import streamlit as st
+import plotly.express as px
+from datetime import datetime, timedelta
+
+import perf
+from catalog import medicine_index
+from pagination import PAGE_SIZES
+from sales import submit_checkout, render_receipt, SaleError
+from write_queue import WriteQueueFull
+from views.common import Config, DatabaseHelper, fragment, page_cursor, render_pager, render_export
+
+
+# Tab-ul New Sale (coș cu mai multe produse, un singur commit la final).
+# Ca fragment, scanările / căutările rerulează doar această secțiune.
+@fragment
+@perf.instrumented("render")
+def display_new_sale():
+    cart = st.session_state.setdefault("cart", [])
+
+    mode = st.radio("Mode", ["🔍 Search", "📷 Scan"], horizontal=True, key="sale_mode")
+
+    if mode == "📷 Scan":
+        st.text_input("Scan barcode (Med_code)", key="scan_code", on_change=on_scan)
+        msg = st.session_state.pop("scan_msg", None)
+        if msg:
+            (st.success if msg[0] == "success" else st.error)(msg[1])
+    else:
+        # căutarea e în afara formularului, ca lista să se actualizeze la tastare
+        picker_text = st.text_input("🔍 Find medicine (name or code)", key="sale_picker")
+        matches = DatabaseHelper.call("medicine_index.search", medicine_index.search, picker_text,
+                                      Config.PICKER_RESULTS, default=[], error="Search")
+
+        with st.form("add_to_cart_form", clear_on_submit=True):
+            col1, col2 = st.columns([3, 1])
+
+            selected_med = None
+            with col1:
+                if matches:
+                    options = {f"{e.name} [{e.code}] (Stock: {e.qty}) - ${e.price:.2f}": e for e in matches}
+                    selected_display = st.selectbox("Select Medicine", options=list(options.keys()))
+                    selected_med = options[selected_display]
+                elif picker_text:
+                    st.warning("⚠️ No medicines in stock match your search!")
+                else:
+                    st.info("Type a medicine name or code to search.")
+
+            with col2:
+                quantity = st.number_input("Quantity", min_value=1, value=1)
+
+            if st.form_submit_button("➕ Add to Basket", use_container_width=True):
+                if selected_med is None:
+                    st.error("No medicine selected!")
+                else:
+                    error = add_to_cart(cart, selected_med, quantity)
+                    if error:
+                        st.error(error)
+
+    if cart:
+        st.markdown("### 🛒 Basket")
+        for idx, item in enumerate(cart):
+            c1, c2, c3 = st.columns([4, 2, 1])
+            c1.write(f"**{item['med_name']}** × {item['quantity']}")
+            c2.write(f"${item['quantity'] * item['price']:.2f}")
+            if c3.button("🗑️", key=f"cart_remove_{idx}"):
+                cart.pop(idx)
+                st.rerun()
+
+        total = sum(i["quantity"] * i["price"] for i in cart)
+
+        with st.form("checkout_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Total Amount", f"${total:.2f}")
+                customer_name = st.text_input("Customer Name", value="Walk-in Customer")
+            with col2:
+                payment_method = st.selectbox("Payment Method", ["Cash", "Card", "Insurance"])
+                discount = st.number_input("Discount ($)", min_value=0.0, value=0.0, format="%.2f")
+
+            submitted = st.form_submit_button("💳 Process Sale", use_container_width=True)
+
+        if submitted:
+            try:
+                # prin coada de scriere: vânzările simultane de la mai multe case
+                # intră în același commit, fără "database is locked"
+                receipt = submit_checkout(
+                    [(i["med_code"], i["quantity"]) for i in cart],
+                    discount=float(discount),
+                    cashier_id=int(st.session_state.user_id),
+                    customer_name=customer_name,
+                    payment_method=payment_method
+                ).result(timeout=Config.SALE_TIMEOUT)
+            except SaleError as e:
+                st.error(str(e))
+            except WriteQueueFull:
+                st.warning("⏳ The system is busy, please try again in a moment.")
+            except Exception as e:
+                st.error(f"❌ Sale failed: {e}")
+            else:
+                st.session_state.cart = []
+                st.session_state.last_receipt = render_receipt(receipt, st.session_state.user_name)
+                st.session_state.last_receipt_id = receipt["receipt_id"]
+                st.rerun()
+    else:
+        st.info("Basket is empty. Add medicines above.")
+
+    if st.session_state.get("last_receipt"):
+        st.success(f"✅ Sale #{st.session_state.last_receipt_id} processed successfully!")
+        st.code(st.session_state.last_receipt, language=None)
+
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button("🖨️ Print Receipt"):
+                st.info("Receipt sent to printer (demo)")
+        with c2:
+            st.download_button(
+                label="📥 Download Receipt",
+                data=st.session_state.last_receipt,
+                file_name=f"receipt_{st.session_state.last_receipt_id}.txt",
+                mime="text/plain"
+            )
+
+
+def add_to_cart(cart, med, quantity):
+    # med: MedicineEntry din indexul în memorie; aceeași linie se cumulează
+    line = next((i for i in cart if i["med_code"] == med.code), None)
+    in_cart = line["quantity"] if line else 0
+    if in_cart + int(quantity) > med.qty:
+        return f"Not enough stock for {med.name}. Available: {med.qty - in_cart}"
+    if line:
+        line["quantity"] += int(quantity)
+    else:
+        cart.append({
+            "med_code": med.code,
+            "med_name": med.name,
+            "quantity": int(quantity),
+            "price": med.price,
+        })
+    return None
+
+
+def on_scan():
+    # callback pentru cititorul de coduri (tastatură + Enter): doar lookup în
+    # memorie, fără interogări; câmpul se golește pentru următoarea scanare
+    code = st.session_state.get("scan_code", "").strip()
+    st.session_state.scan_code = ""
+    if not code:
+        return
+    try:
+        med = medicine_index.get(code)
+    except Exception as e:
+        st.session_state.scan_msg = ("error", f"❌ Lookup error: {e}")
+        return
+    if med is None:
+        st.session_state.scan_msg = ("error", f"Unknown code: {code}")
+        return
+    error = add_to_cart(st.session_state.setdefault("cart", []), med, 1)
+    if error:
+        st.session_state.scan_msg = ("error", error)
+    else:
+        st.session_state.scan_msg = ("success", f"Added {med.name} (${med.price:.2f})")
+
+
+@perf.instrumented("render")
+def display_sales():
+    st.subheader("💰 Sales Management")
+
+    tab1, tab2 = st.tabs(["🛒 New Sale", "📋 Sales History"])
+
+    # New Sale
+    with tab1:
+        display_new_sale()
+
+    # Sales History
+    with tab2:
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            date_filter = st.date_input("Filter by Date", value=datetime.now().date())
+        with col2:
+            period = st.selectbox("Period", ["Today", "This Week", "This Month", "All Time"])
+        with col3:
+            if st.button("🔄 Refresh", use_container_width=True):
+                st.rerun()
+
+        c1, c2, c3 = st.columns(3)
+        sort_by = c1.selectbox("Sort by", list(Config.SALES_SORTS), key="sales_sort")
+        descending = c2.selectbox("Order", ["Descending", "Ascending"], key="sales_order") == "Descending"
+        page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=1, key="sales_page_size")
+
+        # limitele perioadei (expresii SQL), aplicate atât pe sales cât și pe sales_daily
+        if period == "Today":
+            start, end = "?", "date(?, '+1 day')"
+            params = [str(date_filter), str(date_filter)]
+        elif period == "This Week":
+            start, end, params = "date('now','-7 day')", None, []
+        elif period == "This Month":
+            start, end, params = "date('now','start of month')", None, []
+        else:
+            start, end, params = None, None, []
+
+        def period_where(col):
+            conds = []
+            if start:
+                conds.append(f"{col} >= {start}")
+            if end:
+                conds.append(f"{col} < {end}")
+            return " AND ".join(conds)
+
+        where = period_where("s.sale_date")
+        summary = DatabaseHelper.get_one(f"""
+            SELECT COUNT(*) AS n,
+                   COALESCE(SUM(s.total), 0) AS total_sales,
+                   COALESCE(AVG(s.total), 0) AS avg_sale,
+                   COALESCE(SUM(s.quantity), 0) AS total_items
+            FROM sales s
+            {"WHERE " + where if where else ""}
+        """, params)
+        total_rows = int(summary["n"]) if summary else 0
+
+        if total_rows:
+            cursor = page_cursor("sales_pages", (str(date_filter), period, sort_by, descending, page_size))
+            page = DatabaseHelper.get_page(
+                "s.sale_id, s.sale_date, m.Med_name, s.quantity, s.sale_price, s.total",
+                "sales s LEFT JOIN medicines_info m ON s.medicine_code = m.Med_code",
+                Config.SALES_SORTS[sort_by],
+                "s.sale_id",
+                where=where,
+                params=params,
+                descending=descending,
+                after=cursor,
+                page_size=page_size
+            )
+            st.dataframe(page.rows, use_container_width=True, height=400)
+            render_pager("sales_pages", page, total_rows, page_size)
+
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Total Sales", f"${float(summary['total_sales']):.2f}")
+            c2.metric("Average Sale", f"${float(summary['avg_sale']):.2f}")
+            c3.metric("Items Sold", int(summary["total_items"]))
+
+            st.subheader("📈 Sales Trend")
+            where = period_where("date")
+            daily_sales = DatabaseHelper.get_dataframe(f"""
+                SELECT date, SUM(revenue) AS total
+                FROM sales_daily
+                {"WHERE " + where if where else ""}
+                GROUP BY date
+                ORDER BY date
+            """, params)
+            if not daily_sales.empty:
+                fig = px.line(daily_sales, x="date", y="total", title="Daily Sales Trend", markers=True)
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No sales records found for the selected period")
+
+        with st.expander("📥 Export Sales"):
+            c1, c2 = st.columns(2)
+            export_from = c1.date_input("From", value=datetime.now().date() - timedelta(days=30), key="sales_export_from")
+            export_to = c2.date_input("To", value=datetime.now().date(), key="sales_export_to")
+            render_export("sales", "sales_export", start=export_from, end=export_to, label="📥 Export Sales")
@@ -0,0 +1,26 @@
+"""
+Search: căutare rapidă în catalog (FTS5).
+"""
+
+import streamlit as st
+import pandas as pd
+
+import perf
+from catalog import search_medicines, SEARCH_FIELDS, SEARCH_LIMIT
+from views.common import DatabaseHelper
+
+
+@perf.instrumented("render")
+def display_search_only():
+    st.subheader("🔍 Quick Search")
+    search_by = st.selectbox("Search by", list(SEARCH_FIELDS))
+    term = st.text_input("Search term")
+    if term:
+        df = DatabaseHelper.call(f"search_medicines: {search_by}", search_medicines, term, search_by, SEARCH_LIMIT,
+                                 default=pd.DataFrame(), error="Search")
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.warning("No results found")
+    else:
+        st.info("Enter a search term.")
@@ -0,0 +1,65 @@
+"""
+Users: lista utilizatorilor și adăugarea unui cont nou.
+"""
+
+import streamlit as st
+
+import perf
+from views.common import Config, DatabaseHelper
+
+
+@perf.instrumented("render")
+def display_users():
+    st.subheader("👥 User Management")
+
+    tab1, tab2 = st.tabs(["View Users", "Add New User"])
+
+    with tab1:
+        df = DatabaseHelper.get_dataframe("""
+            SELECT id, username, full_name, role, email, created_at
+            FROM users
+            ORDER BY role, username
+        """, ttl=600)
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
+            role_counts = df["role"].value_counts()
+
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Total Users", len(df))
+            c2.metric("Admins", int(role_counts.get("admin", 0)))
+            c3.metric("Pharmacists", int(role_counts.get("pharmacist", 0)))
+            c4.metric("Cashiers", int(role_counts.get("cashier", 0)))
+        else:
+            st.info("No users found")
+
+    with tab2:
+        with st.form("add_user_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                username = st.text_input("Username *")
+                password = st.text_input("Password *", type="password")
+                confirm_password = st.text_input("Confirm Password *", type="password")
+
+            with col2:
+                full_name = st.text_input("Full Name *")
+                email = st.text_input("Email")
+                role = st.selectbox("Role *", Config.ROLES)
+
+            submitted = st.form_submit_button("💾 Add User", use_container_width=True)
+
+            if submitted:
+                if not username or not password or not full_name or not role:
+                    st.error("Please fill all required fields (*)")
+                elif password != confirm_password:
+                    st.error("Passwords do not match!")
+                else:
+                    existing = DatabaseHelper.get_scalar("SELECT id FROM users WHERE username = ? LIMIT 1", [username])
+                    if existing is not None:
+                        st.error("Username already exists!")
+                    else:
+                        DatabaseHelper.execute("""
+                            INSERT INTO users (username, password, full_name, email, role)
+                            VALUES (?, ?, ?, ?, ?)
+                        """, [username, password, full_name, email, role])
+                        st.success(f"✅ User '{username}' added successfully!")
@@ -0,0 +1,191 @@
+"""
+Coadă de scriere cu un singur writer (group commit): sesiunile trimit
+operații (vânzări, coșuri, corecții de stoc) și primesc un Future; thread-ul
+writer le grupează într-o singură tranzacție per lot, fiecare operație în
+propriul SAVEPOINT (o eroare anulează doar operația respectivă). Coada are
+adâncime limitată: când e plină, submit așteaptă cel mult `timeout` și apoi
+ridică WriteQueueFull.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from db_sqlite import connection, notify_write
+
+MAX_DEPTH = 1000        # operații în așteptare (backpressure peste această limită)
+MAX_BATCH = 64          # operații per commit
+MAX_WAIT = 0.0          # secunde de așteptat după alte operații (0 = doar ce e deja în coadă)
+SUBMIT_TIMEOUT = 5.0    # secunde; cât blochează submit când coada e plină
+LATENCY_SAMPLES = 2000
+
+
+class WriteQueueFull(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("body", "args", "kwargs", "tables", "codes", "future", "submitted")
+
+    def __init__(self, body, args, kwargs, tables, codes):
+        self.body = body
+        self.args = args
+        self.kwargs = kwargs
+        self.tables = tables
+        self.codes = codes
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class WriteQueue:
+    # body(conn, *args, **kwargs) rulează în tranzacția writer-ului și NU
+    # face commit/rollback; tables / codes se trimit la notify_write după commit
+
+    def __init__(self, max_depth=MAX_DEPTH, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue(maxsize=max_depth)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)     # submit -> rezultat, ms
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+                       "batches": 0, "batched": 0, "commit_time": 0.0, "max_depth": 0, "max_batch": 0}
+
+    def submit(self, body, *args, tables=None, codes=None, timeout=SUBMIT_TIMEOUT, **kwargs):
+        self.start()
+        job = _Job(body, args, kwargs, tables, codes)
+        try:
+            self._queue.put(job, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise WriteQueueFull(f"Write queue is full ({self._queue.maxsize} pending), please retry.")
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+        return job.future
+
+    def call(self, body, *args, tables=None, codes=None, timeout=SUBMIT_TIMEOUT, **kwargs):
+        # submit + așteptarea rezultatului (excepția operației se ridică aici)
+        return self.submit(body, *args, tables=tables, codes=codes, timeout=timeout, **kwargs).result()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit_batch(self, batch):
+        done = []       # (job, rezultat) pentru operațiile reușite
+        with connection() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for job in batch:
+                    if not job.future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute("SAVEPOINT job")
+                    try:
+                        result = job.body(conn, *job.args, **job.kwargs)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO job")
+                        conn.execute("RELEASE job")
+                        job.future.set_exception(e)
+                        continue
+                    conn.execute("RELEASE job")
+                    done.append((job, result))
+                started = time.perf_counter()
+                conn.commit()
+                commit_time = time.perf_counter() - started
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                # lotul nu s-a salvat: toate operațiile încă nerezolvate primesc eroarea
+                failed = [job for job in batch if not job.future.done()]
+                for job in failed:
+                    job.future.set_exception(e)
+                with self._lock:
+                    self._stats["failed"] += len(failed)
+                return
+
+        # operațiile sunt salvate: rezultatele pleacă înainte de notificări
+        now = time.perf_counter()
+        for job, result in done:
+            job.future.set_result(result)
+
+        tables, codes = set(), set()
+        for job, _ in done:
+            if job.tables is None:
+                tables = None
+            elif tables is not None:
+                tables |= set(job.tables)
+            if codes is not None:
+                codes = codes | set(job.codes) if job.codes else None
+        if done:
+            notify_write(tables, codes)
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["batched"] += len(batch)
+            self._stats["completed"] += len(done)
+            self._stats["failed"] += len(batch) - len(done)
+            self._stats["commit_time"] += commit_time
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            self._latencies.extend((now - job.submitted) * 1000 for job in batch)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                # eroare neprevăzută în afara tranzacției; writer-ul rămâne pornit
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def start(self):
+        # idempotent: un singur writer per proces
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+            self._thread.start()
+        return True
+
+    def drain(self):
+        # așteaptă până se procesează tot ce e în coadă (teste / oprire)
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            latencies = list(self._latencies)
+        s["depth"] = self._queue.qsize()
+        s["capacity"] = self._queue.maxsize
+        s["avg_batch"] = s.pop("batched") / s["batches"] if s["batches"] else 0.0
+        s["commit_ms"] = s.pop("commit_time") * 1000 / s["batches"] if s["batches"] else 0.0
+        s["latency_p50_ms"] = _percentile(latencies, 0.50)
+        s["latency_p95_ms"] = _percentile(latencies, 0.95)
+        s["latency_max_ms"] = max(latencies, default=0.0)
+        return s
+
+
+write_queue = WriteQueue()